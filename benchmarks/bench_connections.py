@@ -0,0 +1,104 @@
+"""Count SQLite connections and statements issued per CLI command.
+
+Usage
+-----
+    python benchmarks/bench_connections.py [--rows N]
+
+Every ``sqlite3.connect`` call made while a command runs is counted and a
+trace callback is attached to each connection so that every statement the
+command sends to SQLite (including PRAGMAs) is counted as well. Commands
+share one process, so the per-process schema and path memos are cleared
+before each one to count what a fresh ``todo`` invocation does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from cli_todo_jd.cli.cli_entry import app
+from cli_todo_jd.storage import schema, store
+
+
+@contextmanager
+def _counting_connect(counts: dict[str, int]):
+    real_connect = sqlite3.connect
+
+    def _connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        counts["connects"] += 1
+
+        def _trace(_statement: str) -> None:
+            counts["statements"] += 1
+
+        conn.set_trace_callback(_trace)
+        return conn
+
+    sqlite3.connect = _connect
+    try:
+        yield
+    finally:
+        sqlite3.connect = real_connect
+
+
+def _forget_process_state() -> None:
+    # What a new process starts without (see `schema.ensure_schema` and
+    # `store._prepare_db_path`).
+    schema._CURRENT_SCHEMAS.clear()
+    store._PREPARED_PATHS.clear()
+
+
+def _seed(db_path: Path, rows: int) -> None:
+    runner = CliRunner()
+    runner.invoke(app, ["add", "seed", "-f", str(db_path)])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO todos(item, done) VALUES (?, 0);",
+            [(f"todo {i}",) for i in range(rows - 1)],
+        )
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    commands = [
+        ["add", "benchmark item"],
+        ["list"],
+        ["list", "--all"],
+        ["done", "1"],
+        ["not-done", "1"],
+        ["done", "--index", "2"],
+        ["edit", "3", "edited item"],
+        ["remove", "4"],
+        ["remove", "--index", "4"],
+        ["done", "10-500"],
+        ["remove", "--all-done"],
+    ]
+
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / ".todo_list.db"
+        _seed(db_path, args.rows)
+
+        print(f"{'command':<24} {'connects':>9} {'statements':>11}")
+        for command in commands:
+            counts = {"connects": 0, "statements": 0}
+            _forget_process_state()
+            with _counting_connect(counts):
+                result = runner.invoke(app, [*command, "-f", str(db_path)])
+            if result.exit_code != 0:
+                raise SystemExit(f"{command} failed:\n{result.output}")
+            label = "todo " + " ".join(command)
+            print(f"{label:<24} {counts['connects']:>9} {counts['statements']:>11}")
+
+
+if __name__ == "__main__":
+    main()
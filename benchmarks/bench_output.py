@@ -0,0 +1,68 @@
+"""Compare rows/sec of the rich table output and the plain `--format` writers.
+
+Usage
+-----
+    python benchmarks/bench_output.py [--rows N] [--table-rows N]
+
+Output is written to os.devnull so only rendering/serialisation is timed.
+The rich table path is much slower, so it is measured on a smaller prefix of
+the list (`--table-rows`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from cli_todo_jd.main import TodoApp
+from cli_todo_jd.output import PLAIN_FORMATS
+
+
+def _seed(app: TodoApp, rows: int) -> None:
+    conn = app._store.conn
+    with conn:
+        conn.executemany(
+            "INSERT INTO todos(item, done) VALUES (?, ?);",
+            ((f"benchmark todo number {i}", i % 2) for i in range(rows)),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--table-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        app = TodoApp(Path(tmp) / ".todo_list.db", verbose=False)
+        _seed(app, args.rows)
+
+        from rich.console import Console
+
+        app._console = Console(file=devnull, width=100)
+
+        results: list[tuple[str, int, float]] = []
+        for label, stream in (("table", False), ("table --stream", True)):
+            start = time.perf_counter()
+            app.list_todos(show="all", limit=args.table_rows, stream=stream)
+            results.append((label, args.table_rows, time.perf_counter() - start))
+
+        for fmt in PLAIN_FORMATS:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                app.list_todos(show="all", output_format=fmt)
+            results.append((fmt, args.rows, time.perf_counter() - start))
+
+        app.close()
+
+    print(f"{'format':<16} {'rows':>9} {'seconds':>9} {'rows/sec':>12}")
+    for label, rows, seconds in results:
+        print(f"{label:<16} {rows:>9} {seconds:>9.3f} {rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Load-test `todo web` over real HTTP: development server vs `--production`.
+
+Usage
+-----
+    python benchmarks/bench_serve.py [--rows N] [--seconds S] [--clients N]
+                                     [--workers N] [--threads N]
+
+Each mode is started as a subprocess on a free port against a seeded
+database. `--clients` threads then send requests over keep-alive
+connections for `--seconds`: mostly `GET /` and `GET /api/todos`, with one
+in ten a `PATCH /api/todos/<id>` (so writes keep invalidating the cache
+without growing the table). Requests/sec and latency percentiles are
+reported per mode. `--production` needs waitress (`pip install
+"cli-todo-jd[serve]"`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from cli_todo_jd.storage.store import TodoStore
+
+
+def _seed(db_path: Path, rows: int) -> None:
+    with TodoStore(db_path) as store, store.conn:
+        store.conn.executemany(
+            "INSERT INTO todos(item, done) VALUES (?, ?);",
+            ((f"benchmark todo number {i}", i % 2) for i in range(rows)),
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(port: int, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def _client(
+    port: int, rows: int, stop_at: float, latencies: list[float], errors: list
+) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    i = 0
+    while time.monotonic() < stop_at:
+        i += 1
+        start = time.perf_counter()
+        try:
+            if i % 10 == 0:
+                conn.request(
+                    "PATCH",
+                    f"/api/todos/{i % rows + 1}",
+                    json.dumps({"done": i % 20 == 0}),
+                    {"Content-Type": "application/json"},
+                )
+            elif i % 2:
+                conn.request("GET", "/?show=all")
+            else:
+                conn.request("GET", "/api/todos?limit=50")
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(e)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def _run(mode: str, command: list[str], port: int, args) -> None:
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_until_up(port, process)
+        latencies: list[float] = []
+        errors: list = []
+        stop_at = time.monotonic() + args.seconds
+        clients = [
+            threading.Thread(
+                target=_client, args=(port, args.rows, stop_at, latencies, errors)
+            )
+            for _ in range(args.clients)
+        ]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait(timeout=15)
+
+    latencies.sort()
+    count = len(latencies)
+    p50 = latencies[count // 2] * 1000 if count else 0.0
+    p99 = latencies[int(count * 0.99)] * 1000 if count else 0.0
+    print(
+        f"{mode:<12} {count / args.seconds:>8,.0f} {p50:>8.1f} {p99:>8.1f}"
+        f" {len(errors):>7}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / ".todo_list.db"
+        _seed(db_path, args.rows)
+        base = [sys.executable, "-m", "cli_todo_jd.cli.cli_entry", "web"]
+        base += ["-f", str(db_path)]
+        modes = {
+            "dev": [],
+            "production": [
+                "--production",
+                "--workers",
+                str(args.workers),
+                "--threads",
+                str(args.threads),
+            ],
+        }
+        print(f"{'mode':<12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for mode, extra in modes.items():
+            port = _free_port()
+            _run(mode, base + ["--port", str(port)] + extra, port, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare memory of the in-memory todo snapshot against three parallel lists.
+
+Usage
+-----
+    python benchmarks/bench_snapshot.py [--rows N]
+
+"lists" reproduces the previous loader (fetch every row, then build
+`todo_ids`, `todos` and `status` lists); "snapshot" is `TodoSnapshot` built
+from the cursor. Peak is the tracemalloc high-water mark during the load,
+retained is what the loaded structure keeps alive afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from cli_todo_jd.snapshot import TodoSnapshot
+from cli_todo_jd.storage.store import TodoStore
+
+
+def _load_lists(store: TodoStore):
+    rows = store.fetch_all()
+    todo_ids = [int(row[0]) for row in rows]
+    todos = [row[1] for row in rows]
+    status = [row[2] for row in rows]
+    return todo_ids, todos, status
+
+
+def _load_snapshot(store: TodoStore):
+    return TodoSnapshot.from_rows(store.iter_todos())
+
+
+def _measure(load, store: TodoStore) -> tuple[float, float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load(store)
+    seconds = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, peak / 2**20, retained / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TodoStore(Path(tmp) / ".todo_list.db")
+        with store.conn:
+            store.conn.executemany(
+                "INSERT INTO todos(item, done) VALUES (?, ?);",
+                ((f"benchmark todo number {i}", i % 3 == 0) for i in range(args.rows)),
+            )
+
+        print(f"{'loader':<10} {'seconds':>8} {'peak MiB':>9} {'retained MiB':>13}")
+        for label, load in (("lists", _load_lists), ("snapshot", _load_snapshot)):
+            seconds, peak, retained = _measure(load, store)
+            print(f"{label:<10} {seconds:>8.2f} {peak:>9.1f} {retained:>13.1f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
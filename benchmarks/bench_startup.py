@@ -0,0 +1,180 @@
+"""Check cold-start cost of `todo add` and `todo list` with `python -X importtime`.
+
+Usage
+-----
+    python benchmarks/bench_startup.py [--repeat N] [--budget-ms MS] [--no-daemon]
+
+Each command is run in a fresh interpreter through the `todo` entry point
+(`cli_todo_jd.cli.launcher:main`), first with no daemon running and then
+with a `todo daemon` serving the database. The script fails (exit code 1) if
+
+- any heavy dependency that only `todo web`/`todo menu` need is imported,
+  or, for commands forwarded to the daemon, anything beyond the launcher
+  (typer, rich, sqlite3) is, or
+- the median cumulative import time of the launcher and `cli_entry`
+  exceeds the budget, or
+- the median wall time of the whole command exceeds the wall-time budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cli_todo_jd.daemon.client import socket_path
+
+# Modules that must not be loaded by the plain CLI commands.
+FORBIDDEN_PREFIXES = (
+    "flask",
+    "werkzeug",
+    "jinja2",
+    "questionary",
+    "prompt_toolkit",
+)
+# ...and, in addition, by commands the launcher forwards to a daemon.
+FORWARDED_FORBIDDEN_PREFIXES = FORBIDDEN_PREFIXES + (
+    "typer",
+    "click",
+    "rich",
+    "sqlite3",
+)
+
+# Same as the installed `todo` script.
+_RUN_COMMAND = (
+    "import sys\n"
+    "sys.argv[0] = 'todo'\n"
+    "from cli_todo_jd.cli.launcher import main\n"
+    "main()\n"
+)
+# Top-level modules whose cumulative import time is reported.
+_ENTRY_MODULES = ("cli_todo_jd.cli.launcher", "cli_todo_jd.cli.cli_entry")
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Map module name to cumulative import time in microseconds."""
+    cumulative: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+    return cumulative
+
+
+def _run_once(args: list[str]) -> tuple[float, dict[str, int]]:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUN_COMMAND, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise SystemExit(f"todo {' '.join(args)} failed:\n{proc.stderr}")
+    return wall, _parse_importtime(proc.stderr)
+
+
+def _start_daemon(db_path: str) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "cli_todo_jd.cli.launcher", "daemon", "-f", db_path],
+        stdout=subprocess.DEVNULL,
+    )
+    path = socket_path(db_path)
+    deadline = time.monotonic() + 10
+    while not Path(path).exists():
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise SystemExit("todo daemon did not start")
+        time.sleep(0.05)
+    return proc
+
+
+def _measure(
+    label: str, command: list[str], args, forbidden: tuple[str, ...]
+) -> list[str]:
+    failures: list[str] = []
+    walls: list[float] = []
+    imports: list[float] = []
+    for _ in range(args.repeat):
+        wall, cumulative = _run_once(command)
+        walls.append(wall * 1000)
+        imports.append(sum(cumulative.get(name, 0) for name in _ENTRY_MODULES) / 1000)
+
+        loaded = sorted(name for name in cumulative if name.split(".")[0] in forbidden)
+        if loaded:
+            failures.append(f"{label} imported {', '.join(loaded[:5])}")
+
+    import_ms = statistics.median(imports)
+    wall_ms = statistics.median(walls)
+    print(f"{label:<20} {import_ms:>10.1f} {wall_ms:>9.1f}")
+
+    if import_ms > args.budget_ms:
+        failures.append(f"{label}: import time {import_ms:.1f}ms > {args.budget_ms}ms")
+    if wall_ms > args.wall_budget_ms:
+        failures.append(f"{label}: wall time {wall_ms:.1f}ms > {args.wall_budget_ms}ms")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=150.0,
+        help="Maximum median import time of the launcher plus cli_entry.",
+    )
+    parser.add_argument(
+        "--wall-budget-ms",
+        type=float,
+        default=400.0,
+        help="Maximum median wall time per command (interpreter start included).",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Only measure commands run without a todo daemon.",
+    )
+    args = parser.parse_args()
+
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / ".todo_list.db")
+        commands = {
+            "todo add": ["add", "startup", "benchmark", "-f", db_path],
+            "todo list": ["list", "-f", db_path],
+        }
+
+        print(f"{'command':<20} {'import ms':>10} {'wall ms':>9}")
+        for label, command in commands.items():
+            failures += _measure(label, command, args, FORBIDDEN_PREFIXES)
+
+        if not args.no_daemon:
+            daemon = _start_daemon(db_path)
+            try:
+                for label, command in commands.items():
+                    failures += _measure(
+                        f"{label} (daemon)",
+                        command,
+                        args,
+                        FORWARDED_FORBIDDEN_PREFIXES,
+                    )
+            finally:
+                daemon.terminate()
+                daemon.wait(timeout=10)
+
+    for failure in dict.fromkeys(failures):
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
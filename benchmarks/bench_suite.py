@@ -0,0 +1,311 @@
+"""Time the CLI, library and web hot paths at several database sizes.
+
+Usage
+-----
+    python benchmarks/bench_suite.py [--sizes 1k,100k,1M] [--output FILE]
+                                     [--repeat N] [--budget S]
+                                     [--compare OLD.json] [--threshold 1.2]
+
+For each size a database of that many todos (every third one done) is
+generated once and copied before each group of cases, so mutations never
+leak between cases. Each case runs up to `--repeat` times or until `--budget`
+seconds have passed (at least once), and its median, minimum and run count
+are recorded:
+
+- ``cli.*``: cold-start `todo add`, `todo list` and `todo done` in a fresh
+  interpreter. With the default table output `add` and `done` re-list the
+  open todos; the ``*_plain`` variants use `--format jsonl` to time only
+  start-up and the write.
+- ``lib.*``: `TodoApp` methods in-process: `list_todos(show=...)`, a paged
+  list, search, index-based vs id-based `mark_as_done`, 1,000 adds in one
+  `TodoApp.session()`, and `migrate_from_json` on a legacy JSON file of
+  the same size.
+- ``web.*``: Flask routes through the test client, with the response cache
+  disabled except for ``web.index_cached``.
+
+Results are written as JSON (default `bench-results.json`) together with
+the package version, git commit, Python and SQLite versions. With
+`--compare`, cases whose fastest run grew by more than `--threshold` times
+against an earlier results file are reported and the exit code is 1. The
+minimum is compared rather than the median because it is the least noisy
+with few runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Callable
+
+from cli_todo_jd.main import TodoApp
+from cli_todo_jd.storage.migrate import migrate_from_json
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.app import create_app
+
+_RUN_COMMAND = (
+    "import sys\n"
+    "from cli_todo_jd.cli.cli_entry import app\n"
+    "app(sys.argv[1:], standalone_mode=False)\n"
+)
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def _parse_size(text: str) -> int:
+    text = text.strip().lower()
+    if text and text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def _seed(db_path: Path, rows: int) -> None:
+    with TodoStore(db_path) as store, store.conn:
+        store.conn.executemany(
+            "INSERT INTO todos(item, done) VALUES (?, ?);",
+            ((f"benchmark todo number {i}", i % 3 == 0) for i in range(rows)),
+        )
+
+
+def _measure(fn: Callable[[int], object], repeat: int, budget: float) -> dict:
+    """Run `fn(run_number)` until `repeat` runs or `budget` seconds are used."""
+    times: list[float] = []
+    started = time.perf_counter()
+    while len(times) < repeat:
+        start = time.perf_counter()
+        fn(len(times))
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    median = statistics.median(times)
+    return {
+        "median_s": median,
+        "min_s": min(times),
+        "runs": len(times),
+        "per_s": 1 / median if median else None,
+    }
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _cli_cases(db_path: Path, rows: int) -> dict[str, Callable[[int], object]]:
+    def run(*args: str) -> None:
+        subprocess.run(
+            [sys.executable, "-c", _RUN_COMMAND, *args, "-f", str(db_path)],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+    return {
+        "cli.add": lambda i: run("add", f"cli todo {i}"),
+        "cli.add_plain": lambda i: run("add", f"cli todo {i}", "--format", "jsonl"),
+        "cli.list": lambda i: run("list"),
+        "cli.done": lambda i: run("done", str(rows // 2 + i)),
+        "cli.done_plain": lambda i: run(
+            "done", str(rows // 3 + i), "--format", "jsonl"
+        ),
+    }
+
+
+def _lib_cases(
+    app: TodoApp, rows: int, json_path: Path, tmp: Path
+) -> dict[str, Callable[[int], object]]:
+    def list_todos(**kwargs) -> Callable[[int], object]:
+        def run(i: int) -> None:
+            with _quiet():
+                app.list_todos(**kwargs)
+
+        return run
+
+    def search(i: int) -> None:
+        with _quiet():
+            app.search_todos(f"number {rows // 2 + i}")
+
+    def session_add(i: int) -> None:
+        with app.session() as session:
+            for n in range(1000):
+                session.add(f"session todo {i}-{n}")
+
+    def migrate(i: int) -> None:
+        inserted = migrate_from_json(
+            json_path=json_path, db_path=tmp / f"migrated-{i}.db", backup=False
+        )
+        assert inserted == rows
+        for path in tmp.glob(f"migrated-{i}.db*"):
+            path.unlink()
+
+    return {
+        "lib.list_open": list_todos(show="open"),
+        "lib.list_done": list_todos(show="done"),
+        "lib.list_all": list_todos(show="all"),
+        "lib.list_page": list_todos(show="all", limit=50, after_id=rows // 2),
+        "lib.search": search,
+        # 1-based positions in the whole list, as `todo done --index` takes.
+        "lib.mark_done_by_index": lambda i: app.mark_as_done(rows // 2 + i),
+        "lib.mark_done_by_id": lambda i: app.mark_done_by_id(rows // 4 + i),
+        "lib.session_add_1k": session_add,
+        "lib.migrate_from_json": migrate,
+    }
+
+
+def _web_cases(db_path: Path, rows: int) -> dict[str, Callable[[int], object]]:
+    uncached = create_app(db_path, cache_size=0).test_client()
+    cached = create_app(db_path).test_client()
+
+    def request(
+        client, method: str, url: str, item: str | None = None
+    ) -> Callable[[int], object]:
+        def run(i: int) -> None:
+            data = None if item is None else {"item": item.format(i=i)}
+            response = client.open(
+                url.format(i=i, mid=rows // 2 + i), method=method, data=data
+            )
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {url}: HTTP {response.status_code}")
+
+        return run
+
+    return {
+        "web.index": request(uncached, "GET", "/?show=open"),
+        "web.index_cached": request(cached, "GET", "/?show=open"),
+        "web.search": request(uncached, "GET", "/?show=all&q=number+{mid}"),
+        "web.api_list": request(uncached, "GET", "/api/todos?limit=100&after={mid}"),
+        "web.api_get": request(uncached, "GET", "/api/todos/{mid}"),
+        "web.add": request(uncached, "POST", "/add", item="web todo {i}"),
+        "web.toggle": request(uncached, "POST", "/toggle/{mid}"),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _metadata() -> dict:
+    try:
+        version = metadata.version("cli-todo-jd")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "version": version,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def _run_size(rows: int, tmp: Path, args) -> dict[str, dict]:
+    base = tmp / f"base-{rows}.db"
+    _seed(base, rows)
+    json_path = tmp / f"legacy-{rows}.json"
+    json_path.write_text(json.dumps([f"legacy todo {i}" for i in range(rows)]))
+
+    def fresh_copy() -> Path:
+        work = tmp / "work.db"
+        for path in tmp.glob("work.db*"):
+            path.unlink()
+        shutil.copyfile(base, work)
+        return work
+
+    results: dict[str, dict] = {}
+
+    def run_group(cases: dict[str, Callable[[int], object]]) -> None:
+        for name, fn in cases.items():
+            results[name] = _measure(fn, args.repeat, args.budget)
+            stats = results[name]
+            print(
+                f"{rows:>9,} {name:<24} {stats['median_s'] * 1000:>10.2f}"
+                f" {stats['runs']:>5}",
+                flush=True,
+            )
+
+    run_group(_cli_cases(fresh_copy(), rows))
+
+    app = TodoApp(fresh_copy(), verbose=False)
+    try:
+        run_group(_lib_cases(app, rows, json_path, tmp))
+    finally:
+        app.close()
+
+    web_db = fresh_copy()
+    run_group(_web_cases(web_db, rows))
+    return results
+
+
+def _compare(old_path: Path, new: dict, threshold: float) -> int:
+    """Print cases that got slower than `threshold`; return how many."""
+    old = json.loads(old_path.read_text())
+    regressions = 0
+    print(f"\nCompared with {old_path} ({old['meta'].get('commit')}):")
+    for size, cases in new["results"].items():
+        for name, stats in cases.items():
+            before = old["results"].get(size, {}).get(name)
+            if before is None or not before["min_s"]:
+                continue
+            ratio = stats["min_s"] / before["min_s"]
+            if ratio > threshold:
+                regressions += 1
+                print(f"  SLOWER {size:>9} {name:<24} x{ratio:.2f}")
+            elif ratio < 1 / threshold:
+                print(f"  faster {size:>9} {name:<24} x{ratio:.2f}")
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1k,100k,1M")
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget", type=float, default=10.0, help="Seconds per case and size."
+    )
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    sizes = [_parse_size(size) for size in args.sizes.split(",")]
+    report = {"meta": _metadata(), "results": {}}
+    print(f"{'rows':>9} {'case':<24} {'median ms':>10} {'runs':>5}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            report["results"][str(rows)] = _run_size(rows, Path(tmp), args)
+
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {args.output}")
+
+    if args.compare is not None and _compare(args.compare, report, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Load-test the web UI routes with concurrent Flask test clients.
+
+Usage
+-----
+    python benchmarks/bench_web.py [--rows N] [--requests N] [--threads N]
+                                   [--pool-sizes 1,4] [--cache-size N]
+
+For each pool size a fresh app is created on a seeded database and
+`--threads` workers each send their share of `--requests` requests to
+`GET /`, `POST /add` and `POST /toggle/<id>`. Requests/sec is reported per
+route. Pool size 1 behaves like a single shared connection; `--cache-size 0`
+disables the response cache so every `GET /` queries and renders.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.app import create_app
+
+
+def _seed(db_path: Path, rows: int) -> None:
+    with TodoStore(db_path) as store, store.conn:
+        store.conn.executemany(
+            "INSERT INTO todos(item, done) VALUES (?, ?);",
+            ((f"benchmark todo number {i}", i % 2) for i in range(rows)),
+        )
+
+
+def _route_requests(route: str, rows: int):
+    if route == "GET /":
+        return lambda client, i: client.get("/?show=all")
+    if route == "POST /add":
+        return lambda client, i: client.post("/add", data={"item": f"load {i}"})
+    return lambda client, i: client.post(f"/toggle/{i % rows + 1}")
+
+
+def _run(app, send, requests: int, threads: int) -> float:
+    per_thread = max(requests // threads, 1)
+
+    def worker(offset: int) -> None:
+        client = app.test_client()
+        for i in range(offset, offset + per_thread):
+            response = send(client, i)
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(worker, range(0, per_thread * threads, per_thread)))
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-sizes", default="1,4")
+    parser.add_argument("--cache-size", type=int, default=256)
+    args = parser.parse_args()
+
+    routes = ("GET /", "POST /add", "POST /toggle")
+    print(f"{'pool':>4} " + " ".join(f"{route + ' req/s':>18}" for route in routes))
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / ".todo_list.db"
+            _seed(db_path, args.rows)
+            app = create_app(db_path, pool_size=pool_size, cache_size=args.cache_size)
+            rates = [
+                _run(
+                    app,
+                    _route_requests(route, args.rows),
+                    args.requests,
+                    args.threads,
+                )
+                for route in routes
+            ]
+            app.extensions["todo_pool"].close()
+        print(f"{pool_size:>4} " + " ".join(f"{rate:>18,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
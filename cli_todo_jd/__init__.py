@@ -0,0 +1,4 @@
+from time import perf_counter as _perf_counter
+
+# Reference point for the "import" phase of `todo --profile`.
+_IMPORT_STARTED = _perf_counter()
@@ -1,26 +1,146 @@
 from __future__ import annotations
 
-from argparse import ArgumentParser
+# Keep module-level imports light: this module is loaded for every `todo`
+# invocation, so Flask (web), questionary (menu) and rich (tables) are only
+# imported by the code paths that need them.
+from argparse import ArgumentParser, ArgumentTypeError
 from cli_todo_jd.helpers import (
+    create_list,
     add_item_to_list,
     remove_item_from_list,
     remove_item_from_list_by_id,
     list_items_on_list,
+    search_items_on_list,
     clear_list_of_items,
     mark_item_as_done,
     mark_item_as_not_done,
     mark_item_as_done_by_id,
     mark_item_as_not_done_by_id,
     edit_item_in_list_by_id,
+    write_result,
+    mark_items_as_done_by_ranges,
+    mark_items_as_not_done_by_ranges,
+    remove_items_from_list_by_ranges,
+    mark_all_open_items_as_done,
+    mark_all_done_items_as_not_done,
+    remove_done_items_from_list,
+    import_items_to_list,
+    export_items_from_list,
 )
-from cli_todo_jd.cli.cli_menu import cli_menu
-from cli_todo_jd.web.app import run_web
+from cli_todo_jd import _IMPORT_STARTED, profiling
+from cli_todo_jd.output import EXPORT_FORMATS, FORMATS, open_output
+from cli_todo_jd.storage.bulk import DEFAULT_BATCH_SIZE, IMPORT_FORMATS
+from cli_todo_jd.storage.store import merge_id_ranges
 from pathlib import Path
+import os
+import sys
+import time
 import typer
 
 app = typer.Typer(help="A tiny todo CLI built with Typer.")
 
 
+@app.callback()
+def _main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print a per-phase timing breakdown and SQL trace to stderr "
+        f"(or set {profiling.TRACE_ENV}=1).",
+    ),
+    profile_json: Path | None = typer.Option(
+        None,
+        "--profile-json",
+        help="Append the timings to this file as one JSON line "
+        f"(or set {profiling.TRACE_JSON_ENV}=FILE).",
+    ),
+) -> None:
+    profile = profile or os.environ.get(profiling.TRACE_ENV, "") not in {"", "0"}
+    json_path = profile_json or os.environ.get(profiling.TRACE_JSON_ENV)
+    if not profile and not json_path:
+        return
+
+    profiler = profiling.enable(start=_IMPORT_STARTED)
+    profiler.record_phase(("import",), time.perf_counter() - _IMPORT_STARTED)
+
+    def report() -> None:
+        profiling.disable()
+        if profile:
+            profiler.write_text(sys.stderr)
+        if json_path:
+            profiler.append_json(Path(json_path))
+
+    # Close callbacks run last-in first-out: the command phase ends first.
+    ctx.call_on_close(report)
+    ctx.with_resource(profiler.phase(ctx.invoked_subcommand or "command"))
+
+
+def _check_format(output_format: str) -> None:
+    if output_format not in FORMATS:
+        raise typer.BadParameter(f"--format must be one of: {', '.join(FORMATS)}")
+
+
+# SQLite's largest integer; no todo ID can be above it.
+MAX_TODO_ID = 2**63 - 1
+
+
+def _parse_id_specs(specs: list[str]) -> list[tuple[int, int]]:
+    """Parse ID arguments such as `12`, `3,5,8` and `10-250`.
+
+    Returns sorted, non-overlapping inclusive `(first, last)` ranges; the
+    IDs inside a range are never expanded, so `1-1000000000` costs no more
+    than `1-10`.
+    """
+    ranges: list[tuple[int, int]] = []
+    for spec in specs:
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, sep, end = part.partition("-")
+            try:
+                first = int(start)
+                last = int(end) if sep else first
+            except ValueError:
+                raise typer.BadParameter(f"Invalid todo ID or range: {part!r}")
+            if first < 1 or last < first or last > MAX_TODO_ID:
+                raise typer.BadParameter(f"Invalid todo ID or range: {part!r}")
+            ranges.append((first, last))
+    return merge_id_ranges(ranges)
+
+
+def _single_id(ranges: list[tuple[int, int]]) -> int | None:
+    """Return the ID if `ranges` names exactly one todo, else None."""
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        return ranges[0][0]
+    return None
+
+
+def _resolve_targets(
+    todo_ids: list[str] | None,
+    index: int | None,
+    use_filter: bool,
+    filter_flag: str,
+    output_format: str,
+) -> list[tuple[int, int]]:
+    """Validate that exactly one of IDs, --index or a filter flag was given."""
+    ids = _parse_id_specs(todo_ids or [])
+    given = sum([bool(ids), index is not None, use_filter])
+    if given == 0:
+        raise typer.BadParameter(f"Provide TODO_ID(s), --index/-i or {filter_flag}")
+    if given > 1:
+        raise typer.BadParameter(
+            f"Provide only one of: TODO_ID(s), --index/-i, {filter_flag}"
+        )
+    _check_format(output_format)
+    if output_format != "table" and (use_filter or (ids and _single_id(ids) is None)):
+        raise typer.BadParameter(
+            "--format is only supported when changing a single todo"
+        )
+    return ids
+
+
 @app.command()
 def add(
     text: list[str] = typer.Argument(..., help="Todo item text (no quotes needed)."),
@@ -30,13 +150,20 @@ def add(
         "-f",
         help="Path to the JSON file used for storage.",
     ),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
 ) -> None:
     full_text = " ".join(text).strip()
     if not full_text:
         raise typer.BadParameter("Todo item text cannot be empty.")
+    _check_format(output_format)
 
-    add_item_to_list(full_text, filepath)
-    typer.echo(f"Added: {full_text}")
+    row = add_item_to_list(full_text, filepath, output_format=output_format)
+    if output_format == "table":
+        typer.echo(f"Added: {full_text}")
+    elif row is None:
+        raise typer.Exit(code=1)
 
 
 @app.command(name="list")
@@ -51,6 +178,24 @@ def list_(
     show_open: bool = typer.Option(
         False, "--open", "-o", help="Show only open todos (default)."
     ),
+    limit: int | None = typer.Option(
+        None, "--limit", "-n", min=1, help="Show at most this many todos."
+    ),
+    after_id: int | None = typer.Option(
+        None, "--after-id", help="Show todos after this ID (next page)."
+    ),
+    before_id: int | None = typer.Option(
+        None, "--before-id", help="Show todos before this ID (previous page)."
+    ),
+    stream: bool | None = typer.Option(
+        None,
+        "--stream/--no-stream",
+        help="Render rows in chunks as they are read (default: only for long lists).",
+    ),
+    pager: bool = typer.Option(False, "--pager", help="Page output through $PAGER."),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
 ) -> None:
     """List todos.
 
@@ -60,7 +205,12 @@ def list_(
     - todo list --done
     - todo list --all
     - todo list -a
+    - todo list --limit 50
+    - todo list --limit 50 --after-id 120
+    - todo list --all --pager
+    - todo list --all --format jsonl
     """
+    _check_format(output_format)
 
     # Choose filter. If nothing specified, default to open.
     # If the user specifies multiple flags, error out.
@@ -78,29 +228,220 @@ def list_(
         # default is open (or explicit --open)
         show = "open"
 
-    list_items_on_list(filepath, show=show)
+    list_items_on_list(
+        filepath,
+        show=show,
+        limit=limit,
+        after_id=after_id,
+        before_id=before_id,
+        stream=stream,
+        pager=pager,
+        output_format=output_format,
+    )
+
+
+@app.command()
+def search(
+    query: list[str] = typer.Argument(..., help="Words to search for."),
+    filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+    show_done: bool = typer.Option(
+        False, "--done", "-d", help="Only search completed todos."
+    ),
+    show_open: bool = typer.Option(
+        False, "--open", "-o", help="Only search open todos."
+    ),
+    limit: int = typer.Option(
+        20, "--limit", "-n", min=1, help="Show at most this many matches."
+    ),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
+) -> None:
+    """Search todos by text, best matches first.
+
+    Every word must match, and words match as prefixes.
+
+    Examples
+    --------
+    - todo search invoice
+    - todo search dep prod --open
+    - todo search report --format jsonl
+    """
+    _check_format(output_format)
+    if show_done and show_open:
+        raise typer.BadParameter("Use only one of: --done / -d, --open / -o")
+    show = "done" if show_done else "open" if show_open else "all"
+
+    search_items_on_list(
+        " ".join(query),
+        filepath,
+        show=show,
+        limit=limit,
+        output_format=output_format,
+    )
 
 
 @app.command()
 def remove(
-    todo_id: int | None = typer.Argument(None, help="Todo ID to remove (preferred)."),
+    todo_ids: list[str] | None = typer.Argument(
+        None, help="Todo IDs to remove: `12`, `3 5 8`, `3,5,8` or ranges like `10-250`."
+    ),
     index: int | None = typer.Option(
         None,
         "--index",
         "-i",
         help="1-based display index (legacy; use ID instead).",
     ),
+    all_done: bool = typer.Option(
+        False, "--all-done", help="Remove every completed todo."
+    ),
     filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
 ) -> None:
-    if todo_id is None and index is None:
-        raise typer.BadParameter("Provide either TODO_ID argument or --index/-i")
-    if todo_id is not None and index is not None:
-        raise typer.BadParameter("Provide either TODO_ID or --index/-i, not both")
+    """Remove todos.
 
-    if todo_id is not None:
-        remove_item_from_list_by_id(todo_id, filepath)
+    Examples
+    --------
+    - todo remove 12
+    - todo remove 3 5 8
+    - todo remove 10-250
+    - todo remove --all-done
+    """
+    ids = _resolve_targets(todo_ids, index, all_done, "--all-done", output_format)
+
+    if all_done:
+        remove_done_items_from_list(filepath)
+        return
+    if ids and _single_id(ids) is None:
+        remove_items_from_list_by_ranges(ids, filepath)
+        return
+
+    if ids:
+        row = remove_item_from_list_by_id(
+            _single_id(ids), filepath, output_format=output_format
+        )
     else:
-        remove_item_from_list(index, filepath)
+        row = remove_item_from_list(index, filepath, output_format=output_format)
+
+    if output_format != "table" and row is None:
+        raise typer.Exit(code=1)
+
+
+@app.command(name="import")
+def import_(
+    source: str = typer.Argument("-", help="File to import, or - for stdin."),
+    input_format: str | None = typer.Option(
+        None,
+        "--format",
+        help="text, csv or jsonl (default: from the file extension, else text).",
+    ),
+    batch_size: int = typer.Option(
+        DEFAULT_BATCH_SIZE, "--batch-size", min=1, help="Rows per transaction."
+    ),
+    filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+) -> None:
+    """Import todos from a file or stdin.
+
+    Text input is one todo per line. CSV needs a header with an `item` (or
+    `text`) column and may have `done`, `created_at` and `done_at` columns.
+    JSONL has one object (same keys) or string per line.
+
+    Examples
+    --------
+    - todo import tasks.txt
+    - todo import tasks.csv
+    - generate_tasks | todo import - --format jsonl
+    """
+    if input_format is None:
+        suffix = Path(source).suffix.lower()
+        input_format = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(
+            suffix, "text"
+        )
+    if input_format not in IMPORT_FORMATS:
+        raise typer.BadParameter(
+            f"--format must be one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+    if source == "-":
+        result = import_items_to_list(
+            sys.stdin, filepath, input_format, batch_size=batch_size
+        )
+    else:
+        try:
+            # newline="" lets the csv module handle quoted line breaks.
+            handle = open(source, encoding="utf-8", newline="")
+        except OSError as e:
+            raise typer.BadParameter(f"Cannot read {source}: {e.strerror}")
+        with handle:
+            result = import_items_to_list(
+                handle, filepath, input_format, batch_size=batch_size
+            )
+
+    if result is None:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def export(
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write to this file instead of stdout (a .gz suffix implies --gzip).",
+    ),
+    output_format: str = typer.Option(
+        "jsonl", "--format", help="Output format: jsonl, json, csv, tsv or sql."
+    ),
+    since_id: int | None = typer.Option(
+        None, "--since-id", help="Only export todos with an ID greater than this."
+    ),
+    only_done: bool = typer.Option(
+        False, "--done", help="Only export completed todos."
+    ),
+    only_open: bool = typer.Option(False, "--open", help="Only export open todos."),
+    compress: bool = typer.Option(False, "--gzip", "-z", help="Gzip the output."),
+    filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+) -> None:
+    """Export todos from a consistent snapshot, streaming in constant memory.
+
+    Examples
+    --------
+    - todo export > todos.jsonl
+    - todo export --format csv --done -o done.csv
+    - todo export --format sql -o backup.sql.gz
+    - todo export --since-id 5000 --gzip > new.jsonl.gz
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise typer.BadParameter(
+            f"--format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if only_done and only_open:
+        raise typer.BadParameter("Use only one of: --done, --open")
+    show = "done" if only_done else "open" if only_open else "all"
+    compress = compress or (output is not None and output.suffix == ".gz")
+
+    # Status messages would corrupt data written to stdout.
+    todo_app = create_list(file_path_to_db=filepath, verbose=output is not None)
+    try:
+        with open_output(output, compress=compress) as stream:
+            count = export_items_from_list(
+                stream,
+                filepath,
+                output_format,
+                app=todo_app,
+                show=show,
+                since_id=since_id,
+            )
+    except BrokenPipeError:
+        # The reader (e.g. `head`) stopped early; that is not an error here.
+        sys.stdout = open(os.devnull, "w")
+        return
+    except OSError as e:
+        raise typer.BadParameter(f"Cannot write {output}: {e.strerror}")
+    if count is None:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -138,14 +479,17 @@ def menu_(
         help="Path to the JSON file used for storage.",
     ),
 ) -> None:
+    from cli_todo_jd.cli.cli_menu import cli_menu
+
     cli_menu(filepath)
     typer.echo("Exited menu.")
 
 
 @app.command()
 def done(
-    todo_id: int | None = typer.Argument(
-        None, help="Todo ID to mark as done (preferred)."
+    todo_ids: list[str] | None = typer.Argument(
+        None,
+        help="Todo IDs to mark as done: `12`, `3 5 8`, `3,5,8` or ranges like `10-250`.",
     ),
     index: int | None = typer.Option(
         None,
@@ -153,25 +497,54 @@ def done(
         "-i",
         help="1-based display index (legacy; use ID instead).",
     ),
+    all_open: bool = typer.Option(
+        False, "--all-open", help="Mark every open todo as done."
+    ),
     filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
 ) -> None:
-    if todo_id is None and index is None:
-        raise typer.BadParameter("Provide either TODO_ID argument or --index/-i")
-    if todo_id is not None and index is not None:
-        raise typer.BadParameter("Provide either TODO_ID or --index/-i, not both")
+    """Mark todos as done.
 
-    if todo_id is not None:
-        mark_item_as_done_by_id(todo_id, filepath)
+    Examples
+    --------
+    - todo done 12
+    - todo done 3 5 8
+    - todo done 10-250
+    - todo done --all-open
+    """
+    ids = _resolve_targets(todo_ids, index, all_open, "--all-open", output_format)
+
+    if all_open:
+        mark_all_open_items_as_done(filepath)
+        return
+    if ids and _single_id(ids) is None:
+        mark_items_as_done_by_ranges(ids, filepath)
+        return
+
+    todo_app = create_list(file_path_to_db=filepath, verbose=output_format == "table")
+    if ids:
+        row = mark_item_as_done_by_id(_single_id(ids), filepath, app=todo_app)
     else:
-        mark_item_as_done(index, filepath)
+        row = mark_item_as_done(index, filepath, app=todo_app)
 
-    list_items_on_list(filepath=filepath, show="all")
+    if output_format == "table":
+        list_items_on_list(filepath=filepath, show="all", app=todo_app)
+    else:
+        write_result(row, output_format)
+        if row is None:
+            raise typer.Exit(code=1)
 
 
 @app.command(name="not-done")
 def not_done(
-    todo_id: int | None = typer.Argument(
-        None, help="Todo ID to mark as not done (preferred)."
+    todo_ids: list[str] | None = typer.Argument(
+        None,
+        help=(
+            "Todo IDs to mark as not done: `12`, `3 5 8`, `3,5,8` "
+            "or ranges like `10-250`."
+        ),
     ),
     index: int | None = typer.Option(
         None,
@@ -179,19 +552,74 @@ def not_done(
         "-i",
         help="1-based display index (legacy; use ID instead).",
     ),
+    all_done: bool = typer.Option(
+        False, "--all-done", help="Mark every completed todo as not done."
+    ),
     filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+    output_format: str = typer.Option(
+        "table", "--format", help="Output format: table, json, jsonl, tsv or csv."
+    ),
 ) -> None:
-    if todo_id is None and index is None:
-        raise typer.BadParameter("Provide either TODO_ID argument or --index/-i")
-    if todo_id is not None and index is not None:
-        raise typer.BadParameter("Provide either TODO_ID or --index/-i, not both")
+    """Mark todos as not done.
+
+    Examples
+    --------
+    - todo not-done 12
+    - todo not-done 3,5,8
+    - todo not-done --all-done
+    """
+    ids = _resolve_targets(todo_ids, index, all_done, "--all-done", output_format)
+
+    if all_done:
+        mark_all_done_items_as_not_done(filepath)
+        return
+    if ids and _single_id(ids) is None:
+        mark_items_as_not_done_by_ranges(ids, filepath)
+        return
+
+    todo_app = create_list(file_path_to_db=filepath, verbose=output_format == "table")
+    if ids:
+        row = mark_item_as_not_done_by_id(_single_id(ids), filepath, app=todo_app)
+    else:
+        row = mark_item_as_not_done(index, filepath, app=todo_app)
 
-    if todo_id is not None:
-        mark_item_as_not_done_by_id(todo_id, filepath)
+    if output_format == "table":
+        list_items_on_list(filepath=filepath, show="all", app=todo_app)
     else:
-        mark_item_as_not_done(index, filepath)
+        write_result(row, output_format)
+        if row is None:
+            raise typer.Exit(code=1)
+
+
+@app.command()
+def daemon(
+    filepath: Path = typer.Option(Path(".todo_list.db"), "--filepath", "-f"),
+    idle_timeout: float = typer.Option(
+        0,
+        "--idle-timeout",
+        min=0,
+        help="Exit after this many seconds without a command (0: never).",
+    ),
+) -> None:
+    """Keep the todo list open in the background for faster commands.
+
+    While the daemon runs, `todo add`, `list`, `search`, `remove`, `edit`,
+    `done`, `not-done` and `clear --yes` for the same database are handed
+    to it over a Unix socket instead of loading everything from scratch.
+    Without a daemon they run directly as usual.
+
+    Examples
+    --------
+    - todo daemon &
+    - todo daemon -f work.db --idle-timeout 600 &
+    """
+    from cli_todo_jd.daemon.server import serve_daemon
 
-    list_items_on_list(filepath=filepath, show="all")
+    try:
+        serve_daemon(filepath, idle_timeout=idle_timeout or None)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -202,9 +630,111 @@ def web(
     ),
     port: int = typer.Option(8000, help="Port to run the web server on."),
     debug: bool = typer.Option(False, help="Run Flask in debug mode."),
+    pool_size: int = typer.Option(
+        4, "--pool-size", min=1, help="Maximum number of SQLite connections."
+    ),
+    cache_size: int = typer.Option(
+        256, "--cache-size", min=0, help="Cached responses to keep (0 disables)."
+    ),
+    production: bool = typer.Option(
+        False,
+        "--production",
+        help="Serve with waitress instead of the Flask development server.",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", min=1, help="Worker processes (--production)."
+    ),
+    threads: int = typer.Option(
+        8, "--threads", min=1, help="Threads per worker (--production)."
+    ),
+    connection_limit: int = typer.Option(
+        100,
+        "--connection-limit",
+        min=1,
+        help="Open connections per worker before new ones wait (--production).",
+    ),
+    backlog: int = typer.Option(
+        1024, "--backlog", min=1, help="Pending connection queue (--production)."
+    ),
+    keep_alive: int = typer.Option(
+        120,
+        "--keep-alive",
+        min=1,
+        help="Seconds idle connections stay open (--production).",
+    ),
 ) -> None:
     """Run a local web UI for your todo list."""
-    run_web(filepath, host=host, port=port, debug=debug)
+    if production and debug:
+        raise typer.BadParameter("Use only one of: --debug, --production")
+    started = _start_web(
+        filepath,
+        host=host,
+        port=port,
+        debug=debug,
+        pool_size=pool_size,
+        cache_size=cache_size,
+        production=production,
+        workers=workers,
+        threads=threads,
+        connection_limit=connection_limit,
+        backlog=backlog,
+        keep_alive=keep_alive,
+    )
+    if not started:
+        raise typer.Exit(code=1)
+
+
+def _start_web(
+    filepath: Path,
+    *,
+    host: str,
+    port: int,
+    debug: bool,
+    pool_size: int,
+    cache_size: int,
+    production: bool,
+    workers: int,
+    threads: int,
+    connection_limit: int,
+    backlog: int,
+    keep_alive: int,
+) -> bool:
+    """Run the web server until it stops; return False if it could not start."""
+    if not production:
+        from cli_todo_jd.web.app import run_web
+
+        run_web(
+            filepath,
+            host=host,
+            port=port,
+            debug=debug,
+            pool_size=pool_size,
+            cache_size=cache_size,
+        )
+        return True
+
+    from cli_todo_jd.web.serve import serve
+
+    try:
+        serve(
+            Path(filepath),
+            host=host,
+            port=port,
+            workers=workers,
+            threads=threads,
+            connection_limit=connection_limit,
+            backlog=backlog,
+            keep_alive=keep_alive,
+            pool_size=pool_size,
+            cache_size=cache_size,
+        )
+    except ImportError:
+        print('Error: --production needs waitress: pip install "cli-todo-jd[serve]"')
+        return False
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return False
+    return True
 
 
 def parser_optional_args(parser: ArgumentParser):
@@ -216,11 +746,28 @@ def parser_optional_args(parser: ArgumentParser):
     )
 
 
+def _int_at_least(minimum: int):
+    """argparse `type=` matching the `min=` of the Typer `web` options."""
+
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise ArgumentTypeError(f"invalid integer: {value!r}")
+        if number < minimum:
+            raise ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+
+    return parse
+
+
 def todo_menu():
     parser = ArgumentParser(description="Todo List CLI Menu")
     parser_optional_args(parser)
     args = parser.parse_args()
 
+    from cli_todo_jd.cli.cli_menu import cli_menu
+
     cli_menu(filepath=args.filepath)
 
 
@@ -234,9 +781,73 @@ def todo_web():
         "--port", help="Port to run the web server on.", default=8000, type=int
     )
     parser.add_argument("--debug", help="Run Flask in debug mode.", action="store_true")
+    parser.add_argument(
+        "--pool-size",
+        help="Maximum number of SQLite connections.",
+        default=4,
+        type=_int_at_least(1),
+    )
+    parser.add_argument(
+        "--cache-size",
+        help="Cached responses to keep (0 disables).",
+        default=256,
+        type=_int_at_least(0),
+    )
+    parser.add_argument(
+        "--production",
+        help="Serve with waitress instead of the Flask development server.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--workers",
+        help="Worker processes (--production).",
+        default=1,
+        type=_int_at_least(1),
+    )
+    parser.add_argument(
+        "--threads",
+        help="Threads per worker (--production).",
+        default=8,
+        type=_int_at_least(1),
+    )
+    parser.add_argument(
+        "--connection-limit",
+        help="Open connections per worker before new ones wait (--production).",
+        default=100,
+        type=_int_at_least(1),
+    )
+    parser.add_argument(
+        "--backlog",
+        help="Pending connection queue (--production).",
+        default=1024,
+        type=_int_at_least(1),
+    )
+    parser.add_argument(
+        "--keep-alive",
+        help="Seconds idle connections stay open (--production).",
+        default=120,
+        type=_int_at_least(1),
+    )
     args = parser.parse_args()
-
-    run_web(db_path=args.filepath, host=args.host, port=args.port, debug=args.debug)
+    if args.production and args.debug:
+        parser.error("Use only one of: --debug, --production")
+
+    started = _start_web(
+        args.filepath,
+        host=args.host,
+        port=args.port,
+        debug=args.debug,
+        pool_size=args.pool_size,
+        cache_size=args.cache_size,
+        production=args.production,
+        workers=args.workers,
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        backlog=args.backlog,
+        keep_alive=args.keep_alive,
+    )
+    if not started:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
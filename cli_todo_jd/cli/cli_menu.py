@@ -18,6 +18,22 @@ custom_style = Style(
 )
 
 
+def _select_todo(app, message: str):
+    """Ask the user to pick a todo; return its 1-based index and text, or None.
+
+    Choices carry their position, so todos with identical text stay distinct.
+    """
+    snapshot = app.snapshot
+    choices = [questionary.Choice("<Back>", value=0)] + [
+        questionary.Choice(item, value=position)
+        for position, item in enumerate(snapshot.items, start=1)
+    ]
+    position = questionary.select(message, choices=choices, style=custom_style).ask()
+    if not position:
+        return None
+    return position, snapshot.items[position - 1]
+
+
 def cli_menu(filepath="./.todo_list.db"):
     """
     Display the command-line interface menu for the todo list.
@@ -50,19 +66,14 @@ def cli_menu(filepath="./.todo_list.db"):
             app.list_todos(show="all")
         elif action == "Update todo status":
             app.reload_todos()
-            if not app.todos:
+            if not app.snapshot:
                 print("No todos to update.")
                 continue
-            todo_choice = questionary.select(
-                "Select the todo to update:",
-                choices=["<Back>"] + app.todos,
-                style=custom_style,
-            ).ask()
-
-            if todo_choice == "<Back>" or todo_choice is None:
+            selected = _select_todo(app, "Select the todo to update:")
+            if selected is None:
                 continue
 
-            todo_index = app.todos.index(todo_choice) + 1
+            todo_index, _ = selected
             status_choice = questionary.select(
                 "Mark as:",
                 choices=["Done", "Not Done", "<Back>"],
@@ -78,35 +89,25 @@ def cli_menu(filepath="./.todo_list.db"):
             app.list_todos(show="all")
         elif action == "Remove todo":
             app.reload_todos()
-            if not app.todos:
+            if not app.snapshot:
                 print("No todos to remove.")
                 continue
-            todo_choice = questionary.select(
-                "Select the todo to remove:",
-                choices=["<Back>"] + app.todos,
-                style=custom_style,
-            ).ask()
-
-            if todo_choice == "<Back>" or todo_choice is None:
+            selected = _select_todo(app, "Select the todo to remove:")
+            if selected is None:
                 continue
 
-            todo_to_remove = app.todos.index(todo_choice) + 1
+            todo_to_remove, _ = selected
             app.remove_todo(todo_to_remove)
         elif action == "Edit todo":
             app.reload_todos()
-            if not app.todos:
+            if not app.snapshot:
                 print("No todos to edit.")
                 continue
-            todo_choice = questionary.select(
-                "Select the todo to edit:",
-                choices=["<Back>"] + app.todos,
-                style=custom_style,
-            ).ask()
-
-            if todo_choice == "<Back>" or todo_choice is None:
+            selected = _select_todo(app, "Select the todo to edit:")
+            if selected is None:
                 continue
 
-            todo_index = app.todos.index(todo_choice) + 1
+            todo_index, todo_choice = selected
             new_text = questionary.text(
                 "Enter the new text for the todo:",
                 default=todo_choice,
@@ -0,0 +1,27 @@
+"""Entry point of the `todo` command.
+
+Hands the command to a running `todo daemon` when there is one, and
+otherwise imports the Typer app and runs it here. Kept free of heavy
+imports so that a forwarded command costs little more than interpreter
+start-up.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from cli_todo_jd.daemon.client import forward
+
+
+def main() -> None:
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from cli_todo_jd.cli.cli_entry import app
+
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""Headless access to a todo list: typed records in, typed records out.
+
+`TodoClient` is the data path shared by every front end: `TodoApp` (and
+through it the CLI and the menu) and the web routes only add presentation
+on top. It never prints; results come back as `Todo` records and failures
+as `TodoError` subclasses, so it can be driven at high rates from scripts
+and worker processes.
+"""
+
+from __future__ import annotations
+
+import csv
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+from cli_todo_jd.output import todo_to_dict
+from cli_todo_jd.storage.bulk import DEFAULT_BATCH_SIZE, ImportResult, iter_records
+from cli_todo_jd.storage.store import TodoStore, merge_id_ranges
+
+SHOW_CHOICES = ("open", "done", "all")
+
+
+class Todo(NamedTuple):
+    """One todo. A tuple, so it can be unpacked like a database row."""
+
+    id: int
+    item: str
+    done: bool
+    created_at: str | None
+    done_at: str | None
+
+    def __getitem__(self, key):
+        # `todo["item"]` keeps working for code written against sqlite3.Row.
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def to_dict(self) -> dict:
+        return todo_to_dict(self)
+
+
+class TodoError(Exception):
+    """Base class for errors raised by `TodoClient`."""
+
+
+class TodoNotFoundError(TodoError, LookupError):
+    """No todo has the requested id (or display index)."""
+
+    def __init__(self, todo_id: int, message: str | None = None):
+        super().__init__(message or f"todo {todo_id} not found")
+        self.todo_id = todo_id
+
+
+class InvalidTodoError(TodoError, ValueError):
+    """An argument was rejected, e.g. empty todo text or an unknown filter."""
+
+
+class StorageError(TodoError):
+    """The database operation failed; the `sqlite3.Error` is the `__cause__`."""
+
+
+def _todo_row(cursor: sqlite3.Cursor, row: tuple) -> Todo:
+    # Row factory for `id, item, done, created_at, done_at` queries.
+    return Todo(row[0], row[1], bool(row[2]), row[3], row[4])
+
+
+@contextmanager
+def _storage_errors() -> Iterator[None]:
+    try:
+        yield
+    except sqlite3.Error as e:
+        raise StorageError(str(e)) from e
+
+
+def _todos(cursor: sqlite3.Cursor) -> Iterator[Todo]:
+    """Yield a cursor's rows as `Todo`s, raising `StorageError` on failure."""
+    cursor.row_factory = _todo_row
+    with _storage_errors():
+        yield from cursor
+
+
+def _check_item(item: str | None) -> str:
+    item = (item or "").strip()
+    if not item:
+        raise InvalidTodoError("Todo item cannot be empty.")
+    return item
+
+
+def _check_show(show: str | None, default: str) -> str:
+    show = (show or default).lower()
+    if show not in SHOW_CHOICES:
+        raise InvalidTodoError("show must be one of: open, done, all")
+    return show
+
+
+class TodoClient:
+    """Read and change a todo list without any terminal output.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite database file.
+    store:
+        Use this open `TodoStore` (e.g. one lent by a `TodoStorePool`)
+        instead of opening `db_path`; it is not closed by `close()`.
+
+    Raises
+    ------
+    TodoNotFoundError, InvalidTodoError, StorageError
+        From the methods, as documented on each; all are `TodoError`s.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = "./.todo_list.db",
+        *,
+        store: TodoStore | None = None,
+    ):
+        self._owns_store = store is None
+        self.store = TodoStore(Path(db_path)) if store is None else store
+
+    def close(self) -> None:
+        if self._owns_store:
+            self.store.close()
+
+    def __enter__(self) -> TodoClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[TodoClient]:
+        """Commit every write in the block together (see `TodoStore.transaction`)."""
+        with _storage_errors(), self.store.transaction():
+            yield self
+
+    # Reads
+
+    def get(self, todo_id: int) -> Todo:
+        """Return the todo with `todo_id`; raise `TodoNotFoundError` if none."""
+        with _storage_errors():
+            row = self.store.get(todo_id)
+        if row is None:
+            raise TodoNotFoundError(todo_id)
+        return _todo_row(None, row)
+
+    def get_at_index(self, index: int) -> Todo:
+        """Return the todo at a 1-based display index (ordered by id)."""
+        with _storage_errors():
+            row = self.store.get_by_index(index)
+        if row is None:
+            raise TodoNotFoundError(index, f"no todo at index {index}")
+        return _todo_row(None, row)
+
+    def iter_todos(
+        self,
+        *,
+        show: str = "all",
+        limit: int | None = None,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        descending: bool = False,
+    ) -> Iterator[Todo]:
+        """Yield todos as they are read (see `TodoStore.iter_todos`)."""
+        show = _check_show(show, "all")
+        with _storage_errors():
+            cursor = self.store.iter_todos(
+                show=show,
+                limit=limit,
+                after_id=after_id,
+                before_id=before_id,
+                descending=descending,
+            )
+        return _todos(cursor)
+
+    def list_todos(self, **filters) -> list[Todo]:
+        """Return `iter_todos(**filters)` as a list."""
+        return list(self.iter_todos(**filters))
+
+    def iter_snapshot(
+        self, *, show: str = "all", since_id: int | None = None
+    ) -> Iterator[Todo]:
+        """Yield todos from one consistent read snapshot, in batches."""
+        show = _check_show(show, "all")
+        with _storage_errors():
+            for row in self.store.iter_snapshot(show=show, after_id=since_id):
+                yield _todo_row(None, row)
+
+    def search(
+        self, query: str, *, show: str = "all", limit: int | None = 20
+    ) -> list[Todo]:
+        """Return todos matching every word of `query`, best matches first."""
+        show = _check_show(show, "all")
+        with _storage_errors():
+            cursor = self.store.search(query, show=show, limit=limit)
+        return list(_todos(cursor))
+
+    def count(self) -> int:
+        with _storage_errors():
+            return self.store.count()
+
+    def is_empty(self) -> bool:
+        with _storage_errors():
+            return self.store.is_empty()
+
+    def max_id(self) -> int:
+        with _storage_errors():
+            return self.store.max_id()
+
+    def version(self) -> tuple:
+        """Return a token that changes whenever the database is written.
+
+        Cheap enough to call before every read; see `TodoStore.version`.
+        """
+        with _storage_errors():
+            return self.store.version()
+
+    # Writes
+
+    def add(self, item: str) -> Todo:
+        """Add a todo; raise `InvalidTodoError` if `item` is blank."""
+        item = _check_item(item)
+        with _storage_errors():
+            return _todo_row(None, self.store.get(self.store.add(item)))
+
+    def update(
+        self, todo_id: int, *, item: str | None = None, done: bool | None = None
+    ) -> Todo:
+        """Change a todo's text and/or done state; return the updated todo."""
+        if item is not None:
+            item = _check_item(item)
+        with _storage_errors():
+            found = self.store.update(todo_id, item=item, done=done)
+        if not found:
+            raise TodoNotFoundError(todo_id)
+        return self.get(todo_id)
+
+    def edit(self, todo_id: int, item: str) -> Todo:
+        return self.update(todo_id, item=item)
+
+    def set_done(self, todo_id: int, done: bool) -> Todo:
+        return self.update(todo_id, done=done)
+
+    def mark_done(self, todo_id: int) -> Todo:
+        return self.update(todo_id, done=True)
+
+    def mark_not_done(self, todo_id: int) -> Todo:
+        return self.update(todo_id, done=False)
+
+    def toggle(self, todo_id: int) -> Todo:
+        """Flip a todo between done and not done."""
+        with _storage_errors():
+            found = self.store.toggle_done(todo_id)
+        if not found:
+            raise TodoNotFoundError(todo_id)
+        return self.get(todo_id)
+
+    def remove(self, todo_id: int) -> Todo:
+        """Delete a todo and return it as it was."""
+        todo = self.get(todo_id)
+        with _storage_errors():
+            self.store.delete(todo_id)
+        return todo
+
+    def clear(self, *, reset_ids: bool = True) -> None:
+        """Delete every todo (ids restart from 1 unless `reset_ids` is False)."""
+        with _storage_errors():
+            self.store.clear(reset_ids=reset_ids)
+
+    # Bulk writes: one transaction each; they return how many todos changed.
+
+    def set_done_many(self, todo_ids: Iterable[int], done: bool) -> int:
+        with _storage_errors():
+            return self.store.set_done_many(todo_ids, done)
+
+    def remove_many(self, todo_ids: Iterable[int]) -> int:
+        with _storage_errors():
+            return self.store.delete_many(todo_ids)
+
+    def set_done_ranges(self, ranges: Iterable[tuple[int, int]], done: bool) -> int:
+        """Like `set_done_many` for inclusive `(first, last)` ID ranges."""
+        with _storage_errors():
+            return self.store.set_done_ranges(merge_id_ranges(ranges), done)
+
+    def remove_ranges(self, ranges: Iterable[tuple[int, int]]) -> int:
+        """Like `remove_many` for inclusive `(first, last)` ID ranges."""
+        with _storage_errors():
+            return self.store.delete_ranges(merge_id_ranges(ranges))
+
+    def set_done_all(self, done: bool) -> int:
+        with _storage_errors():
+            return self.store.set_done_all(done)
+
+    def remove_done(self) -> int:
+        with _storage_errors():
+            return self.store.delete_done()
+
+    def import_lines(
+        self,
+        lines: Iterable[str],
+        fmt: str = "text",
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> ImportResult:
+        """Stream todos from `lines` in batched transactions.
+
+        Raises `InvalidTodoError` for unreadable input; batches committed
+        before a failure are kept.
+        """
+        try:
+            with _storage_errors():
+                return self.store.import_records(
+                    iter_records(lines, fmt), batch_size=batch_size
+                )
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise InvalidTodoError(str(e)) from e
@@ -0,0 +1,178 @@
+"""Forward `todo` commands to a running `todo daemon` over a Unix socket.
+
+This module is imported by the `todo` launcher on every invocation, so it
+sticks to `os.path` (not pathlib) and a few small standard library
+modules; typer, rich and sqlite3 are not imported when a command is
+forwarded.
+
+Wire format: every message is a frame of one kind byte, a 4-byte
+big-endian length and a payload. The client sends a single `r` frame
+(JSON request); the daemon answers with `o` (stdout bytes) and `e`
+(stderr bytes) frames followed by an `x` frame holding the exit code, or
+with a lone `f` frame when the client should run the command itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+
+PROTOCOL_VERSION = 1
+
+# Commands that are safe to run inside the daemon: they neither prompt nor
+# read stdin. `clear` is forwarded only with --yes.
+FORWARDED_COMMANDS = frozenset(
+    {"add", "list", "search", "remove", "edit", "done", "not-done", "clear"}
+)
+# Options that need the caller's terminal, so the command runs locally.
+LOCAL_OPTIONS = frozenset({"--help", "--pager"})
+
+# Same variables as `profiling.TRACE_ENV`/`TRACE_JSON_ENV`; traced runs
+# stay local so the timings describe a normal start-up.
+_TRACE_ENVS = ("TODO_TRACE", "TODO_TRACE_JSON")
+
+_HEADER = struct.Struct("!cI")
+
+
+def socket_path(db_path: str | os.PathLike) -> str:
+    """Return the socket a daemon for `db_path` listens on.
+
+    One socket per database and user, in `$XDG_RUNTIME_DIR` (or the temp
+    directory), named after a hash of the resolved database path.
+    """
+    resolved = os.path.realpath(db_path)
+    digest = hashlib.sha1(resolved.encode()).hexdigest()[:16]
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, f"todo-{os.getuid()}-{digest}.sock")
+
+
+def send_frame(sock: socket.socket, kind: bytes, payload: bytes) -> None:
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> tuple[bytes, bytes]:
+    """Read one frame; raise ConnectionError if the peer hangs up mid-way."""
+    kind, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return kind, _recv_exact(sock, length)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 16))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _db_path(args: list[str]) -> str:
+    """Pick the `-f/--filepath` value out of a command's arguments."""
+    path = ".todo_list.db"
+    rest = iter(args)
+    for arg in rest:
+        if arg == "--":
+            break
+        if arg in ("-f", "--filepath"):
+            path = next(rest, path)
+        elif arg.startswith("--filepath="):
+            path = arg.partition("=")[2]
+        elif arg.startswith("-f") and not arg.startswith("--"):
+            path = arg[2:]
+    return path
+
+
+def _should_forward(argv: list[str]) -> bool:
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return False
+    if not hasattr(socket, "AF_UNIX") or any(os.environ.get(n) for n in _TRACE_ENVS):
+        return False
+    if LOCAL_OPTIONS.intersection(argv):
+        return False
+    return argv[0] != "clear" or "--yes" in argv or "-y" in argv
+
+
+def _connect(path: str) -> socket.socket | None:
+    try:
+        # Only talk to a daemon started by this user.
+        if os.stat(path).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run `todo <argv>` in the daemon, relaying its output.
+
+    Returns
+    -------
+    int or None
+        The command's exit code, or None if no daemon for the database is
+        running (or it declined the command) and nothing was run.
+    """
+    if not _should_forward(argv):
+        return None
+    db_path = os.path.realpath(_db_path(argv[1:]))
+    sock = _connect(socket_path(db_path))
+    if sock is None:
+        return None
+
+    width = None
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            width = os.get_terminal_size(stream.fileno()).columns
+            break
+        except (OSError, ValueError):
+            pass
+    request = {
+        "version": PROTOCOL_VERSION,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "db": db_path,
+        "width": width,
+        "terminal": sys.stdout.isatty(),
+        "no_color": bool(os.environ.get("NO_COLOR")),
+    }
+    streams = {b"o": sys.stdout.buffer, b"e": sys.stderr.buffer}
+    with sock:
+        try:
+            send_frame(sock, b"r", json.dumps(request).encode())
+            kind, payload = recv_frame(sock)
+            if kind == b"f":
+                return None
+            while kind != b"x":
+                _relay(streams[kind], payload)
+                kind, payload = recv_frame(sock)
+        except _ReaderGone:
+            # Our reader (e.g. `head`) stopped early; that is not an error here.
+            sys.stdout = open(os.devnull, "w")
+            return 0
+        except (OSError, KeyError, struct.error):
+            # The command may already have run, so it is not retried locally.
+            print("Error: lost connection to todo daemon.", file=sys.stderr)
+            return 1
+    return int(payload)
+
+
+class _ReaderGone(Exception):
+    pass
+
+
+def _relay(stream, payload: bytes) -> None:
+    try:
+        stream.write(payload)
+        stream.flush()
+    except BrokenPipeError:
+        raise _ReaderGone from None
@@ -0,0 +1,218 @@
+"""`todo daemon`: run CLI commands in a warm, long-lived process.
+
+The daemon opens the database once, loads the in-memory snapshot and
+imports typer and rich, then serves commands forwarded by the `todo`
+launcher (see `cli_todo_jd.daemon.client`) one at a time. Each command
+runs through the regular Typer app with stdout and stderr sent back over
+the socket, so output and exit codes match a local run. Commands reuse
+the daemon's `TodoApp` through `helpers.warm_app`.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from cli_todo_jd.daemon.client import (
+    PROTOCOL_VERSION,
+    recv_frame,
+    send_frame,
+    socket_path,
+)
+from cli_todo_jd.helpers import warm_app
+from cli_todo_jd.main import TodoApp
+
+# Stdout is sent in frames of up to this many bytes.
+OUTPUT_BUFFER_SIZE = 1 << 16
+# Seconds to wait on a stalled client before dropping it.
+CLIENT_TIMEOUT = 30.0
+
+
+class _FrameSink(io.RawIOBase):
+    """Binary stream that sends each write to the client as one frame."""
+
+    def __init__(self, conn: socket.socket, kind: bytes):
+        self._conn = conn
+        self._kind = kind
+        self._broken = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        # After the client has gone, drop output (e.g. the final flush on
+        # garbage collection) instead of failing again.
+        if not self._broken:
+            try:
+                send_frame(self._conn, self._kind, bytes(data))
+            except OSError:
+                self._broken = True
+                raise
+        return len(data)
+
+
+def _text_stream(
+    conn: socket.socket, kind: bytes, buffer_size: int | None
+) -> io.TextIOWrapper:
+    """Wrap a frame sink; `buffer_size=None` sends every write immediately."""
+    sink = _FrameSink(conn, kind)
+    return io.TextIOWrapper(
+        sink if buffer_size is None else io.BufferedWriter(sink, buffer_size),
+        encoding="utf-8",
+        errors="replace",
+        write_through=buffer_size is None,
+    )
+
+
+def serve_daemon(db_path: Path, *, idle_timeout: float | None = None) -> None:
+    """Serve forwarded commands for `db_path` until SIGINT or SIGTERM.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite database.
+    idle_timeout:
+        Exit after this many seconds without a command; None runs until
+        stopped.
+
+    Raises
+    ------
+    ValueError
+        If Unix sockets are unavailable or a daemon for `db_path` is
+        already running.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("todo daemon needs Unix domain sockets")
+    from typer.main import get_command
+
+    from cli_todo_jd.cli.cli_entry import app as cli_app
+
+    db_path = Path(db_path).resolve()
+    path = Path(socket_path(db_path))
+    listener = _listen(path, db_path)
+    # Built once; `typer.Typer.__call__` would rebuild it for every command.
+    command = get_command(cli_app)
+
+    # SIGTERM while a command runs lets it finish; Typer would otherwise
+    # catch the SystemExit as the command's own exit.
+    state = {"busy": False, "stopping": False}
+
+    def stop(signum, frame):
+        state["stopping"] = True
+        if not state["busy"]:
+            raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        with TodoApp(db_path) as app, warm_app(app):
+            app.snapshot  # load it now rather than on the first command
+            listener.settimeout(idle_timeout)
+            print(f"todo daemon for {db_path} listening on {path}")
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except TimeoutError:
+                    print("Idle timeout reached, exiting.")
+                    return
+                state["busy"] = True
+                with conn:
+                    _handle(conn, command, app)
+                state["busy"] = False
+                if state["stopping"]:
+                    return
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        path.unlink(missing_ok=True)
+
+
+def _listen(path: Path, db_path: Path) -> socket.socket:
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()  # left behind by a daemon that was killed
+        else:
+            raise ValueError(f"a todo daemon for {db_path} is already running")
+        finally:
+            probe.close()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Owner-only socket: whoever can connect can run commands as us.
+    old_umask = os.umask(0o077)
+    try:
+        listener.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    listener.listen(64)
+    return listener
+
+
+def _handle(conn: socket.socket, command, app: TodoApp) -> None:
+    conn.settimeout(CLIENT_TIMEOUT)
+    try:
+        kind, payload = recv_frame(conn)
+        request = json.loads(payload)
+        if (
+            kind != b"r"
+            or request.get("version") != PROTOCOL_VERSION
+            or Path(request["db"]) != app.file_path_to_db
+        ):
+            send_frame(conn, b"f", b"")
+            return
+        os.chdir(request["cwd"])
+    except (OSError, ValueError, KeyError, TypeError):
+        try:
+            send_frame(conn, b"f", b"")
+        except OSError:
+            pass
+        return
+
+    from rich.console import Console
+
+    stdout = _text_stream(conn, b"o", OUTPUT_BUFFER_SIZE)
+    # Unbuffered, like a terminal's stderr: messages arrive whole, in order.
+    stderr = _text_stream(conn, b"e", None)
+    # Tables render for the client's terminal, not the daemon's.
+    app._console = Console(
+        force_terminal=request.get("terminal", False),
+        no_color=request.get("no_color", False),
+        width=request.get("width") or 80,
+    )
+    code = 0
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            stdin, sys.stdin = sys.stdin, io.StringIO()
+            try:
+                command.main(
+                    args=request["argv"], prog_name="todo", standalone_mode=True
+                )
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdin = stdin
+        stdout.flush()
+        stderr.flush()
+        send_frame(conn, b"x", str(code).encode())
+    except OSError:
+        # The client went away; its command has run (or failed) regardless.
+        pass
+    finally:
+        del app._console
+        try:
+            app.reload_todos()
+        except sqlite3.Error:
+            pass
@@ -1,7 +1,20 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
 from cli_todo_jd.main import TodoApp
+from cli_todo_jd.output import write_rows
+from cli_todo_jd.storage.bulk import DEFAULT_BATCH_SIZE
+
+# Apps kept open by `todo daemon`, by resolved database path (see `warm_app`).
+_warm_apps: dict[Path, TodoApp] = {}
 
 
-def create_list(file_path_to_db: str = "./.todo_list.db"):
+def create_list(file_path_to_db: str = "./.todo_list.db", verbose: bool = True):
     """
     Create a new todo list.
 
@@ -9,17 +22,64 @@ def create_list(file_path_to_db: str = "./.todo_list.db"):
     ----------
     file_path_to_db : str, optional
         The file path to the JSON file for storing todos, by default "./.todo_list.db"
+    verbose : bool, optional
+        If False, status messages are suppressed (see `TodoApp`), by default True
 
     Returns
     -------
     TodoApp
-        An instance of the TodoApp class.
+        An instance of the TodoApp class; inside `warm_app` the already open
+        app for the same database.
     """
-    app = TodoApp(file_path_to_db=file_path_to_db)
+    if _warm_apps:
+        app = _warm_apps.get(Path(file_path_to_db).resolve())
+        if app is not None:
+            app.verbose = verbose
+            return app
+    app = TodoApp(file_path_to_db=file_path_to_db, verbose=verbose)
     return app
 
 
-def add_item_to_list(item: str, filepath: str):
+@contextmanager
+def warm_app(app: TodoApp) -> Iterator[TodoApp]:
+    """Make `create_list` hand out `app` for its database inside the block.
+
+    Used by `todo daemon` so forwarded commands reuse its open connection
+    and loaded snapshot instead of opening the database again.
+    """
+    key = app.file_path_to_db.resolve()
+    _warm_apps[key] = app
+    try:
+        yield app
+    finally:
+        _warm_apps.pop(key, None)
+
+
+def _resolve_app(
+    filepath: str, app: TodoApp | None, output_format: str = "table"
+) -> TodoApp:
+    # Reuse the caller's app (and its open connection) when one is provided.
+    if app is not None:
+        return app
+    return create_list(file_path_to_db=filepath, verbose=output_format == "table")
+
+
+def write_result(row: sqlite3.Row | None, output_format: str) -> None:
+    """Write the todo affected by a command to stdout in a plain format.
+
+    Used instead of re-listing the whole table when a command is run with a
+    machine-readable `output_format`. Nothing is written if `row` is None.
+    """
+    write_rows([] if row is None else [row], output_format, sys.stdout)
+
+
+def add_item_to_list(
+    item: str,
+    filepath: str,
+    app: TodoApp | None = None,
+    *,
+    output_format: str = "table",
+):
     """
     Add a new item to the todo list.
 
@@ -29,13 +89,37 @@ def add_item_to_list(item: str, filepath: str):
         The todo item to add.
     filepath : str
         The file path to the JSON file for storing todos.
+    app : TodoApp, optional
+        An existing app to reuse instead of opening the database again.
+    output_format : str, optional
+        "table" re-lists open todos; a plain format writes only the new item.
+
+    Returns
+    -------
+    sqlite3.Row or None
+        The added todo, or None if it could not be added.
     """
-    app = create_list(file_path_to_db=filepath)
-    app.add_todo(item)
-    app.list_todos()
+    app = _resolve_app(filepath, app, output_format)
+    row = app.add_todo(item)
+    if output_format == "table":
+        app.list_todos()
+    else:
+        write_result(row, output_format)
+    return row
 
 
-def list_items_on_list(filepath: str, show: str = "open"):
+def list_items_on_list(
+    filepath: str,
+    show: str = "open",
+    app: TodoApp | None = None,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    before_id: int | None = None,
+    stream: bool | None = None,
+    pager: bool = False,
+    output_format: str = "table",
+):
     """List items in the todo list.
 
     Parameters
@@ -44,12 +128,70 @@ def list_items_on_list(filepath: str, show: str = "open"):
         The SQLite database path.
     show:
         "open" (default), "done", or "all".
+    app:
+        An existing app to reuse instead of opening the database again.
+    limit:
+        Maximum number of items to show (a page).
+    after_id:
+        Only show items with an id greater than this (next page).
+    before_id:
+        Only show items with an id less than this (previous page).
+    stream:
+        Render in chunks as rows are read; None decides based on list length.
+    pager:
+        Page the output through `$PAGER`.
+    output_format:
+        "table" (default), "json", "jsonl", "tsv" or "csv".
+    """
+    app = _resolve_app(filepath, app, output_format)
+    app.list_todos(
+        show=show,
+        limit=limit,
+        after_id=after_id,
+        before_id=before_id,
+        stream=stream,
+        pager=pager,
+        output_format=output_format,
+    )
+
+
+def search_items_on_list(
+    query: str,
+    filepath: str,
+    show: str = "all",
+    app: TodoApp | None = None,
+    *,
+    limit: int | None = 20,
+    output_format: str = "table",
+):
+    """Search todo items by text (ranked, prefix matching).
+
+    Parameters
+    ----------
+    query:
+        Words to search for.
+    filepath:
+        The SQLite database path.
+    show:
+        "all" (default), "open", or "done".
+    app:
+        An existing app to reuse instead of opening the database again.
+    limit:
+        Maximum number of results.
+    output_format:
+        "table" (default), "json", "jsonl", "tsv" or "csv".
     """
-    app = create_list(file_path_to_db=filepath)
-    app.list_todos(show=show)
+    app = _resolve_app(filepath, app, output_format)
+    app.search_todos(query, show=show, limit=limit, output_format=output_format)
 
 
-def remove_item_from_list(index: int, filepath: str):
+def remove_item_from_list(
+    index: int,
+    filepath: str,
+    app: TodoApp | None = None,
+    *,
+    output_format: str = "table",
+):
     """
     remove an item from the todo list using index
 
@@ -59,13 +201,21 @@ def remove_item_from_list(index: int, filepath: str):
         The index of the todo item to remove.
     filepath : str
         The file path to the JSON file for storing todos.
+    app : TodoApp, optional
+        An existing app to reuse instead of opening the database again.
+    output_format : str, optional
+        "table" re-lists open todos; a plain format writes only the removed item.
     """
-    app = create_list(file_path_to_db=filepath)
-    app.remove_todo(index)
-    app.list_todos()
+    app = _resolve_app(filepath, app, output_format)
+    row = app.remove_todo(index)
+    if output_format == "table":
+        app.list_todos()
+    else:
+        write_result(row, output_format)
+    return row
 
 
-def clear_list_of_items(filepath: str):
+def clear_list_of_items(filepath: str, app: TodoApp | None = None):
     """
     Clear all items from the todo list.
 
@@ -73,37 +223,185 @@ def clear_list_of_items(filepath: str):
     ----------
     filepath : str
         The file path to the JSON file for storing todos.
+    app : TodoApp, optional
+        An existing app to reuse instead of opening the database again.
     """
-    app = create_list(file_path_to_db=filepath)
+    app = _resolve_app(filepath, app)
     app.clear_all()
 
 
-def mark_item_as_done(index: int, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.mark_as_done(index)
+def mark_item_as_done(index: int, filepath: str, app: TodoApp | None = None):
+    app = _resolve_app(filepath, app)
+    return app.mark_as_done(index)
+
+
+def mark_item_as_not_done(index: int, filepath: str, app: TodoApp | None = None):
+    app = _resolve_app(filepath, app)
+    return app.mark_as_not_done(index)
+
+
+def remove_item_from_list_by_id(
+    todo_id: int,
+    filepath: str,
+    app: TodoApp | None = None,
+    *,
+    output_format: str = "table",
+):
+    app = _resolve_app(filepath, app, output_format)
+    row = app.remove_by_id(todo_id)
+    if output_format == "table":
+        app.list_todos(show="all")
+    else:
+        write_result(row, output_format)
+    return row
+
+
+def mark_item_as_done_by_id(todo_id: int, filepath: str, app: TodoApp | None = None):
+    app = _resolve_app(filepath, app)
+    return app.mark_done_by_id(todo_id)
+
+
+def mark_item_as_not_done_by_id(
+    todo_id: int, filepath: str, app: TodoApp | None = None
+):
+    app = _resolve_app(filepath, app)
+    return app.mark_not_done_by_id(todo_id)
+
 
+def edit_item_in_list_by_id(
+    todo_id: int, new_text: str, filepath: str, app: TodoApp | None = None
+):
+    app = _resolve_app(filepath, app)
+    return app.edit_by_id(todo_id, new_text)
 
-def mark_item_as_not_done(index: int, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.mark_as_not_done(index)
 
+def mark_items_as_done_by_ids(
+    todo_ids: list[int], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Mark many todos as done in one transaction; returns how many changed."""
+    app = _resolve_app(filepath, app)
+    return app.mark_done_by_ids(todo_ids)
 
-def remove_item_from_list_by_id(todo_id: int, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.remove_by_id(todo_id)
-    app.list_todos(show="all")
 
+def mark_items_as_not_done_by_ids(
+    todo_ids: list[int], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Mark many todos as not done in one transaction; returns how many changed."""
+    app = _resolve_app(filepath, app)
+    return app.mark_not_done_by_ids(todo_ids)
 
-def mark_item_as_done_by_id(todo_id: int, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.mark_done_by_id(todo_id)
 
+def remove_items_from_list_by_ids(
+    todo_ids: list[int], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Remove many todos in one transaction; returns how many were removed."""
+    app = _resolve_app(filepath, app)
+    return app.remove_by_ids(todo_ids)
 
-def mark_item_as_not_done_by_id(todo_id: int, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.mark_not_done_by_id(todo_id)
 
+def mark_items_as_done_by_ranges(
+    ranges: list[tuple[int, int]], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Mark the todos in inclusive `(first, last)` ID ranges as done."""
+    app = _resolve_app(filepath, app)
+    return app.mark_done_by_ranges(ranges)
 
-def edit_item_in_list_by_id(todo_id: int, new_text: str, filepath: str):
-    app = create_list(file_path_to_db=filepath)
-    app.edit_by_id(todo_id, new_text)
+
+def mark_items_as_not_done_by_ranges(
+    ranges: list[tuple[int, int]], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Mark the todos in inclusive `(first, last)` ID ranges as not done."""
+    app = _resolve_app(filepath, app)
+    return app.mark_not_done_by_ranges(ranges)
+
+
+def remove_items_from_list_by_ranges(
+    ranges: list[tuple[int, int]], filepath: str, app: TodoApp | None = None
+) -> int:
+    """Remove the todos in inclusive `(first, last)` ID ranges."""
+    app = _resolve_app(filepath, app)
+    return app.remove_by_ranges(ranges)
+
+
+def mark_all_open_items_as_done(filepath: str, app: TodoApp | None = None) -> int:
+    app = _resolve_app(filepath, app)
+    return app.mark_all_done()
+
+
+def mark_all_done_items_as_not_done(filepath: str, app: TodoApp | None = None) -> int:
+    app = _resolve_app(filepath, app)
+    return app.mark_all_not_done()
+
+
+def remove_done_items_from_list(filepath: str, app: TodoApp | None = None) -> int:
+    app = _resolve_app(filepath, app)
+    return app.remove_done()
+
+
+def import_items_to_list(
+    lines: Iterable[str],
+    filepath: str,
+    fmt: str = "text",
+    app: TodoApp | None = None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """
+    Import todos from an iterable of lines (a file or stdin).
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Input lines; read incrementally so large inputs use constant memory.
+    filepath : str
+        The SQLite database path.
+    fmt : str, optional
+        "text" (one todo per line), "csv" or "jsonl", by default "text"
+    app : TodoApp, optional
+        An existing app to reuse instead of opening the database again.
+    batch_size : int, optional
+        Rows inserted per transaction.
+
+    Returns
+    -------
+    ImportResult or None
+        Counts and timing, or None if the import failed.
+    """
+    app = _resolve_app(filepath, app)
+    return app.import_todos(lines, fmt, batch_size=batch_size)
+
+
+def export_items_from_list(
+    stream: TextIO,
+    filepath: str,
+    fmt: str = "jsonl",
+    app: TodoApp | None = None,
+    *,
+    show: str = "all",
+    since_id: int | None = None,
+):
+    """
+    Export todos to a text stream.
+
+    Parameters
+    ----------
+    stream : TextIO
+        Where to write (stdout, a file or a gzip wrapper).
+    filepath : str
+        The SQLite database path.
+    fmt : str, optional
+        "jsonl" (default), "json", "csv", "tsv" or "sql".
+    app : TodoApp, optional
+        An existing app to reuse instead of opening the database again.
+    show : str, optional
+        "all" (default), "open" or "done".
+    since_id : int, optional
+        Only export todos with an id greater than this.
+
+    Returns
+    -------
+    int or None
+        Number of todos exported, or None on failure.
+    """
+    app = _resolve_app(filepath, app)
+    return app.export_todos(stream, fmt, show=show, since_id=since_id)
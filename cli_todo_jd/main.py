@@ -1,191 +1,560 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, islice
+import os
 from pathlib import Path
-from rich.console import Console
-from rich.table import Table
-from rich.padding import Padding
+import shlex
+import shutil
 import sqlite3
-from cli_todo_jd.storage.schema import ensure_schema
-from cli_todo_jd.storage.migrate import migrate_from_json
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, TextIO
+from cli_todo_jd import profiling
+from cli_todo_jd.client import (
+    InvalidTodoError,
+    StorageError,
+    Todo,
+    TodoClient,
+    TodoError,
+    TodoNotFoundError,
+)
+from cli_todo_jd.output import FORMATS, PLAIN_FORMATS, write_rows
+from cli_todo_jd.snapshot import TodoSnapshot
+from cli_todo_jd.storage.bulk import DEFAULT_BATCH_SIZE, ImportResult
+from cli_todo_jd.storage.store import merge_id_ranges
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Lists longer than this are streamed in chunks rather than built as one table.
+STREAM_THRESHOLD = 500
+STREAM_CHUNK_SIZE = 200
+# `reload_todos` patches the snapshot in place of a full re-read when at most
+# this many todos (or a tenth of the list, if larger) changed.
+RELOAD_DELTA_LIMIT = 5000
 
 
 def main():
     TodoApp()
 
 
-class TodoApp:
-    """A simple command-line todo application."""
+@contextmanager
+def _paged(console: Console) -> Iterator[Console]:
+    """Yield a console whose output is piped into `$PAGER` as it is rendered.
 
-    def __init__(self, file_path_to_db="./.todo_list.db"):
-        self.todo_ids: list[int] = []
-        self.todos: list[str] = []
-        self.status: list[int] = []
-        self.file_path_to_db = Path(file_path_to_db)
-        self._check_and_load_todos(self.file_path_to_db)
-        self._console = Console()
+    Falls back to `console` itself when it isn't a terminal or no pager is
+    available, including when `$PAGER` names a program that can't be run.
+    """
+    command = os.environ.get("PAGER") or ("less -R" if shutil.which("less") else "")
+    if not command or not console.is_terminal:
+        yield console
+        return
 
-    def reload_todos(self) -> None:
-        self._check_and_load_todos(self.file_path_to_db)
+    from rich.console import Console
+
+    try:
+        proc = subprocess.Popen(  # nosec B603 - user-configured pager
+            shlex.split(command), stdin=subprocess.PIPE, text=True, encoding="utf-8"
+        )
+    except (OSError, ValueError):
+        # Not installed, not executable, or unbalanced quotes in $PAGER.
+        yield console
+        return
+    try:
+        yield Console(file=proc.stdin, force_terminal=True, width=console.width)
+    except BrokenPipeError:
+        # The user quit the pager before reaching the end.
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        proc.wait()
+
+
+@dataclass
+class SessionResult:
+    """Outcome of one write made through a `TodoSession`."""
+
+    # "add", "done", "not_done", "edit" or "remove".
+    action: str
+    todo_id: int | None
+    # The todo after the write (as it was before, for "remove"); None on failure.
+    row: Todo | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TodoSession:
+    """Writes grouped into one transaction by `TodoApp.session()`.
+
+    Each method returns the affected `Todo`, or None on failure, like the
+    `TodoApp` method it wraps, and appends a `SessionResult` to `results`.
+    """
+
+    def __init__(self, app: TodoApp):
+        self._app = app
+        self.results: list[SessionResult] = []
+        self._errors: list[str] = []
+
+    @property
+    def failed(self) -> list[SessionResult]:
+        return [result for result in self.results if not result.ok]
+
+    def add(self, item: str) -> Todo | None:
+        return self._run("add", None, self._app.add_todo, item)
+
+    def mark_done(self, todo_id: int) -> Todo | None:
+        return self._run("done", todo_id, self._app.mark_done_by_id, todo_id)
+
+    def mark_not_done(self, todo_id: int) -> Todo | None:
+        return self._run("not_done", todo_id, self._app.mark_not_done_by_id, todo_id)
+
+    def edit(self, todo_id: int, new_text: str) -> Todo | None:
+        return self._run("edit", todo_id, self._app.edit_by_id, todo_id, new_text)
 
-    def add_todo(self, item: str) -> None:
-        item = (item or "").strip()
-        if not item:
-            print("Error: Todo item cannot be empty.")
+    def remove(self, todo_id: int) -> Todo | None:
+        return self._run("remove", todo_id, self._app.remove_by_id, todo_id)
+
+    def note_error(self, message: str) -> None:
+        self._errors.append(message.removeprefix("Error: "))
+
+    def _run(self, action: str, todo_id: int | None, method, *args):
+        self._errors.clear()
+        row = method(*args)
+        if row is None:
+            error = self._errors[-1] if self._errors else f"Failed to {action}."
+            self.results.append(SessionResult(action, todo_id, None, error))
+        else:
+            self.results.append(SessionResult(action, row.id, row))
+        return row
+
+
+class TodoApp:
+    """A simple command-line todo application.
+
+    Reads and writes go through a `TodoClient` (the `client` attribute);
+    this class adds the messages, tables and in-memory snapshot on top.
+
+    Parameters
+    ----------
+    file_path_to_db:
+        Path to the SQLite database file.
+    verbose:
+        If False, status messages are not printed and errors go to stderr,
+        leaving stdout free for machine-readable output.
+    """
+
+    def __init__(self, file_path_to_db="./.todo_list.db", *, verbose: bool = True):
+        self.verbose = verbose
+        self.file_path_to_db = Path(file_path_to_db)
+        self.client = TodoClient(self.file_path_to_db)
+        # The snapshot and reload logic below work on the store directly.
+        self._store = self.client.store
+        # In-memory snapshot used by the interactive menu, loaded on first use.
+        self._snapshot: TodoSnapshot | None = None
+        # Set while a `session()` block runs.
+        self._session: TodoSession | None = None
+        self._render = True
+
+    @property
+    def snapshot(self) -> TodoSnapshot:
+        """Read-only in-memory copy of the todo list (loaded on first use).
+
+        Call `reload_todos()` to refresh it after writes.
+        """
+        if self._snapshot is None:
+            self._check_and_load_todos()
+        return self._snapshot
+
+    # List copies of the snapshot columns, kept for backwards compatibility;
+    # prefer `snapshot`, which does not copy.
+
+    @property
+    def todo_ids(self) -> list[int]:
+        return self.snapshot.ids.tolist()
+
+    @property
+    def todos(self) -> list[str]:
+        return list(self.snapshot.items)
+
+    @property
+    def status(self) -> list[int]:
+        return self.snapshot.done_flags.tolist()
+
+    @cached_property
+    def _console(self) -> Console:
+        # rich is only imported once there is a table to render.
+        from rich.console import Console
+
+        return Console()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.client.close()
+
+    def __enter__(self) -> TodoApp:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _info(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+    def _error(self, message: str) -> None:
+        if self._session is not None:
+            self._session.note_error(message)
+            if not self.verbose:
+                return
+        print(message, file=sys.stdout if self.verbose else sys.stderr)
+
+    @contextmanager
+    def session(
+        self, *, verbose: bool = False, render: bool = False
+    ) -> Iterator[TodoSession]:
+        """Group many writes into one transaction on this app's connection.
+
+        Writes made inside the block, through the yielded `TodoSession` or
+        by calling this app's methods (`add_todo`, `mark_done_by_id`,
+        `edit_by_id`, ...) directly, commit together when it exits and roll
+        back together if it raises. The write lock is held for the whole
+        block. The snapshot is refreshed once, on exit, rather than after
+        each write.
+
+        Parameters
+        ----------
+        verbose:
+            Print status and error messages as usual (default False; errors
+            are always recorded in `TodoSession.results`).
+        render:
+            Let `list_todos`/`search_todos` print inside the block (default
+            False, so helpers that re-list after each write stay quiet).
+
+        A nested `session()` joins the outer one and its options.
+
+        Examples
+        --------
+        ::
+
+            with app.session() as session:
+                for text in texts:
+                    session.add(text)
+            errors = [result.error for result in session.failed]
+        """
+        if self._session is not None:
+            yield self._session
             return
 
+        session = TodoSession(self)
+        saved_verbose = self.verbose
+        self.verbose, self._render, self._session = verbose, render, session
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                with conn:
-                    conn.execute(
-                        "INSERT INTO todos(item, done) VALUES (?, 0);", (item,)
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to add todo. ({e})")
-            return
+            with self._store.transaction():
+                yield session
+        except BaseException:
+            # Rolled back: writes in the block (e.g. `clear_all`) may have
+            # patched the snapshot, and the database version is unchanged,
+            # so `reload_todos` would keep it. Load it afresh on next use.
+            self._snapshot = None
+            raise
+        finally:
+            self.verbose, self._render, self._session = saved_verbose, True, None
+        if self._snapshot is not None:
+            self.reload_todos()
 
-        print(f'Added todo: "{item}"')
+    def reload_todos(self) -> None:
+        """Bring `snapshot` up to date with the database.
+
+        Nothing is read if the database has not been written since the
+        snapshot was taken (`PRAGMA data_version` plus this connection's
+        change count). Otherwise only the todos recorded in the change log
+        since then are fetched and patched in; a full re-read happens only
+        when the log no longer covers the gap or most of the list changed.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version is None or snapshot.rev is None:
+            self._check_and_load_todos()
+            return
 
-    def list_todos(self, *, show: str = "open") -> None:
+        try:
+            version = self._store.version()
+            if version == snapshot.version:
+                return
+            with profiling.phase("reload"), self._store.read_snapshot():
+                rev = self._store.change_rev()
+                changed_ids = self._store.changed_ids_since(
+                    snapshot.rev,
+                    limit=max(RELOAD_DELTA_LIMIT, len(snapshot) // 10),
+                )
+                if changed_ids is not None:
+                    rows = self._store.iter_changed_since(snapshot.rev).fetchall()
+        except sqlite3.Error:
+            changed_ids = None
+
+        if changed_ids is None:
+            self._check_and_load_todos()
+        else:
+            self._snapshot = snapshot.apply_changes(changed_ids, rows, version, rev)
+
+    def add_todo(self, item: str) -> Todo | None:
+        try:
+            todo = self.client.add(item)
+        except InvalidTodoError as e:
+            self._error(f"Error: {e}")
+            return None
+        except StorageError as e:
+            self._error(f"Error: Failed to add todo. ({e})")
+            return None
+
+        self._info(f'Added todo: "{todo.item}"')
+        return todo
+
+    def list_todos(
+        self,
+        *,
+        show: str = "open",
+        limit: int | None = None,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        stream: bool | None = None,
+        pager: bool = False,
+        output_format: str = "table",
+    ) -> None:
         """List todos.
 
+        Filtering and pagination happen in SQL, so only the requested page
+        is read from the database. Long lists are rendered in chunks straight
+        from the cursor so output starts immediately and memory stays flat.
+
         Parameters
         ----------
         show:
             "open" (default), "done", or "all".
+        limit:
+            Maximum number of todos to show. None shows every match.
+        after_id:
+            Only show todos with an id greater than this.
+        before_id:
+            Only show todos with an id less than this.
+        stream:
+            Render in chunks as rows are read. None (default) streams only
+            when there are more than `STREAM_THRESHOLD` rows.
+        pager:
+            Send the output through `$PAGER` (default `less -R`).
+        output_format:
+            "table" (default) or one of `PLAIN_FORMATS` ("json", "jsonl",
+            "tsv", "csv"). Plain formats are written straight from the
+            database to stdout without rich, and print no status messages.
         """
+        if not self._render:
+            return
         show = (show or "open").lower()
         if show not in {"open", "done", "all"}:
-            print("Error: show must be one of: open, done, all")
+            self._error("Error: show must be one of: open, done, all")
+            return
+        if output_format not in FORMATS:
+            self._error(f"Error: format must be one of: {', '.join(FORMATS)}")
             return
 
-        # Always read fresh so output reflects the DB
-        self._check_and_load_todos(self.file_path_to_db)
-        if not self.todos:
-            print("Your todo list is empty! Start adding some with 'todo add <task>'")
+        if output_format in PLAIN_FORMATS:
+            try:
+                todos = self.client.iter_todos(
+                    show=show, limit=limit, after_id=after_id, before_id=before_id
+                )
+                with profiling.phase("render"):
+                    write_rows(todos, output_format, sys.stdout)
+            except StorageError as e:
+                self._error(f"Error: Failed to list todos. ({e})")
             return
 
-        if show == "all":
-            self._table_print(title="Todos")
+        paginated = limit is not None or after_id is not None or before_id is not None
+        title = {"all": "Todos", "open": "Open todos", "done": "Completed todos"}[show]
+        try:
+            todos = self.client.iter_todos(
+                show=show, limit=limit, after_id=after_id, before_id=before_id
+            )
+            # Peek far enough to decide between one table and a stream.
+            head = list(islice(todos, STREAM_THRESHOLD + 1))
+            if not head:
+                if self.client.is_empty():
+                    self._info(
+                        "Your todo list is empty! Start adding some with 'todo add <task>'"
+                    )
+                elif paginated:
+                    self._info("No todos found on this page.")
+                else:
+                    self._info(f"No todos found when filtering on {show}.")
+                return
+
+            if stream is None:
+                stream = len(head) > STREAM_THRESHOLD
+
+            with (
+                profiling.phase("render"),
+                _paged(self._console)
+                if pager
+                else nullcontext(self._console) as console,
+            ):
+                if stream:
+                    count, last_row = self._stream_print(
+                        chain(head, todos),
+                        title=title,
+                        id_width=len(str(self.client.max_id())),
+                        console=console,
+                    )
+                else:
+                    rows = head + list(todos)
+                    self._table_print(title=title, rows=rows, console=console)
+                    count, last_row = len(rows), rows[-1]
+        except StorageError as e:
+            self._error(f"Error: Failed to list todos. ({e})")
             return
 
-        # Filter in-memory to keep this change minimal.
-        filtered_ids: list[int] = []
-        filtered_todos: list[str] = []
-        filtered_status: list[int] = []
-        for todo_id, todo, done in zip(
-            self.todo_ids, self.todos, self.status, strict=False
-        ):
-            if show == "open" and not done:
-                filtered_ids.append(todo_id)
-                filtered_todos.append(todo)
-                filtered_status.append(done)
-            elif show == "done" and done:
-                filtered_ids.append(todo_id)
-                filtered_todos.append(todo)
-                filtered_status.append(done)
-
-        if not filtered_todos:
-            print(f"No todos found when filtering on {show}.")
+        if limit is not None and count == limit:
+            if before_id is not None:
+                # Paging backwards: the page before starts ahead of this one.
+                self._info(f"Previous page: --before-id {head[0].id}")
+            else:
+                self._info(f"Next page: --after-id {last_row.id}")
+
+    def search_todos(
+        self,
+        query: str,
+        *,
+        show: str = "all",
+        limit: int | None = 20,
+        output_format: str = "table",
+    ) -> None:
+        """Show todos matching `query`, best matches first.
+
+        Parameters
+        ----------
+        query:
+            Words to look for; each matches as a prefix and all must match.
+        show:
+            "all" (default), "open", or "done".
+        limit:
+            Maximum number of results (default 20). None shows every match.
+        output_format:
+            "table" (default) or one of `PLAIN_FORMATS`.
+        """
+        if not self._render:
+            return
+        show = (show or "all").lower()
+        if show not in {"open", "done", "all"}:
+            self._error("Error: show must be one of: open, done, all")
+            return
+        if output_format not in FORMATS:
+            self._error(f"Error: format must be one of: {', '.join(FORMATS)}")
             return
 
-        original_ids, original_todos, original_status = (
-            self.todo_ids,
-            self.todos,
-            self.status,
-        )
         try:
-            self.todo_ids, self.todos, self.status = (
-                filtered_ids,
-                filtered_todos,
-                filtered_status,
-            )
-            title = "Open todos" if show == "open" else "Completed todos"
-            self._table_print(title=title)
-        finally:
-            self.todo_ids, self.todos, self.status = (
-                original_ids,
-                original_todos,
-                original_status,
-            )
+            rows = self.client.search(query, show=show, limit=limit)
+        except StorageError as e:
+            self._error(f"Error: Failed to search todos. ({e})")
+            return
 
-    def remove_todo(self, index: int) -> None:
-        # Maintain current UX: index refers to the displayed (1-based) ordering.
-        self._check_and_load_todos(self.file_path_to_db)
+        if output_format in PLAIN_FORMATS:
+            write_rows(rows, output_format, sys.stdout)
+            return
 
-        if index < 1 or index > len(self.todos):
-            print("Error: Invalid todo index.")
+        if not rows:
+            self._info(f'No todos match "{query}".')
             return
+        self._table_print(title=f'Todos matching "{query}"', rows=rows)
 
+    def remove_todo(self, index: int) -> Todo | None:
+        # Maintain current UX: index refers to the displayed (1-based) ordering.
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-
-                row = conn.execute(
-                    "SELECT id, item FROM todos ORDER BY id LIMIT 1 OFFSET ?;",
-                    (index - 1,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo index.")
-                    return
-
-                todo_id, removed_item = row
-                with conn:
-                    conn.execute("DELETE FROM todos WHERE id = ?;", (todo_id,))
-        except sqlite3.Error as e:
-            print(f"Error: Failed to remove todo. ({e})")
-            return
+            todo = self._todo_at_index(index)
+            if todo is None:
+                self._error("Error: Invalid todo index.")
+                return None
 
-        print(f'Removed todo: "{removed_item}"')
+            self.client.remove(todo.id)
+        except TodoError as e:
+            self._error(f"Error: Failed to remove todo. ({e})")
+            return None
+
+        self._info(f'Removed todo: "{todo.item}"')
+        return todo
 
     def clear_all(self) -> None:
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                with conn:
-                    conn.execute("DELETE FROM todos;")
-                    # Reset AUTOINCREMENT counter so ids start from 1 again.
-                    # This is SQLite-specific and only applies to tables created with AUTOINCREMENT.
-                    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'todos';")
-        except sqlite3.Error as e:
-            print(f"Error: Failed to clear todos. ({e})")
+            self.client.clear()
+        except StorageError as e:
+            self._error(f"Error: Failed to clear todos. ({e})")
             return
 
-        self.todo_ids = []
-        self.todos = []
-        self.status = []
-        print("Cleared all todos.")
+        self._snapshot = TodoSnapshot.empty(
+            self._store.version(), self._store.change_rev()
+        )
+        self._info("Cleared all todos.")
 
-    def _check_and_load_todos(self, file_path: Path) -> None:
-        # Create parent directory if needed
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+    def _check_and_load_todos(self) -> None:
+        try:
+            # Taken before reading, so a write racing the read marks it stale.
+            version = self._store.version()
+            with profiling.phase("load"), self._store.read_snapshot():
+                rev = self._store.change_rev()
+                # Built straight from the cursor; rows are never all held at once.
+                self._snapshot = TodoSnapshot.from_rows(
+                    self._store.iter_todos(), version, rev
+                )
+        except sqlite3.Error as e:
+            self._error(
+                f"Warning: Failed to load existing todos. Starting fresh. ({e})"
+            )
+            self._snapshot = TodoSnapshot.empty()
 
-        # Optional one-time migration: if the user still has a legacy JSON file and
-        # the DB is empty/new, import the items. This keeps upgrades smooth.
-        json_path = file_path.with_suffix(".json")
-        if json_path.exists() and file_path.suffix == ".db":
-            migrate_from_json(json_path=json_path, db_path=file_path, backup=True)
+    def _todo_at_index(self, index: int) -> Todo | None:
+        """Resolve a legacy 1-based display index to its todo.
 
+        Uses the loaded snapshot when nothing has been written since it was
+        read, otherwise asks the client, which resolves the index without an
+        OFFSET scan over the whole table. Raises `StorageError` if the
+        database cannot be read.
+        """
+        if index < 1:
+            return None
+        snapshot = self._snapshot
         try:
-            with sqlite3.connect(file_path) as conn:
-                ensure_schema(conn)
-                rows = conn.execute(
-                    "SELECT id, item, done, created_at, done_at FROM todos ORDER BY id"
-                ).fetchall()
-
-                # In-memory lists are used by the interactive menu.
-                self.todo_ids = [int(row[0]) for row in rows]
-                self.todos = [row[1] for row in rows]
-                self.status = [row[2] for row in rows]
-        except sqlite3.Error as e:
-            print(f"Warning: Failed to load existing todos. Starting fresh. ({e})")
-            self.todo_ids = []
-            self.todos = []
-            self.status = []
+            if (
+                snapshot is not None
+                and snapshot.version is not None
+                and index <= len(snapshot)
+                and self.client.version() == snapshot.version
+            ):
+                return self.client.get(int(snapshot.ids[index - 1]))
+            return self.client.get_at_index(index)
+        except TodoNotFoundError:
+            return None
 
     def _table_print(
         self,
         title: str | None = None,
         style: str = "bold cyan",
+        rows: Iterable[Sequence] | None = None,
+        console: Console | None = None,
     ):
+        """Render todos as a rich table.
+
+        `rows` are `(id, item, done, ...)` sequences; by default the loaded
+        in-memory todos are rendered.
+        """
+        from rich.padding import Padding
+        from rich.table import Table
+
         table = Table(
             title=title, header_style=style, border_style=style, show_lines=True
         )
@@ -193,239 +562,351 @@ class TodoApp:
         for col in columns:
             table.add_column(str(col))
 
-        for todo_id, todo, done in zip(
-            self.todo_ids, self.todos, self.status, strict=False
-        ):
+        if rows is None:
+            rows = self.snapshot
+
+        for todo_id, todo, done, *_ in rows:
             table.add_row(
                 str(todo_id),
                 str(todo),
                 "[green]✔[/green]" if done else "[red]✖[/red]",
             )
 
-        self._console.print(Padding(table, (2, 2)))
+        (console or self._console).print(Padding(table, (2, 2)))
 
-    def mark_as_not_done(self, index: int) -> None:
-        self._check_and_load_todos(self.file_path_to_db)
+    def _stream_print(
+        self,
+        rows: Iterable[Sequence],
+        title: str | None = None,
+        style: str = "bold cyan",
+        *,
+        id_width: int = 2,
+        console: Console | None = None,
+    ) -> tuple[int, Sequence | None]:
+        """Render todos as a table in chunks of `STREAM_CHUNK_SIZE` rows.
+
+        Column widths are fixed up front and the borders between chunks are
+        stitched together, so the output reads as one table while only one
+        chunk is held in memory.
+
+        Returns
+        -------
+        tuple
+            Number of rows rendered and the last row.
+        """
+        from rich.box import HEAVY_HEAD, Box
+        from rich.segment import Segment, SegmentLines
+        from rich.table import Table
+
+        console = console or self._console
+        width = max(console.width - 4, 20)
+        # HEAVY_HEAD without the heavy header glyphs, and with a row separator
+        # as the top edge so a chunk continues the previous one.
+        continued = Box("├─┼┤\n│ ││\n├─┼┤\n│ ││\n├─┼┤\n├─┼┤\n│ ││\n└─┴┘\n")
+
+        rows = iter(rows)
+        chunks = iter(lambda: list(islice(rows, STREAM_CHUNK_SIZE)), [])
+        chunk = next(chunks, [])
+        first = True
+        count = 0
+        last_row = None
+        console.line(2)
+        while chunk:
+            next_chunk = next(chunks, [])
+            table = Table(
+                title=title if first else None,
+                header_style=style,
+                border_style=style,
+                show_lines=True,
+                show_header=first,
+                box=HEAVY_HEAD if first else continued,
+                width=width,
+            )
+            # Only the item column flexes, so every chunk has the same layout.
+            table.add_column("ID", width=max(id_width, 2), no_wrap=True)
+            table.add_column("Todo Item", ratio=1)
+            table.add_column("Done", width=4, no_wrap=True)
+            for todo_id, todo, done, *_ in chunk:
+                table.add_row(
+                    str(todo_id),
+                    str(todo),
+                    "[green]✔[/green]" if done else "[red]✖[/red]",
+                )
+
+            lines = console.render_lines(table, console.options.update_width(width))
+            if next_chunk:
+                # Drop the bottom edge; the next chunk's top edge replaces it.
+                lines = lines[:-1]
+            console.print(
+                SegmentLines([[Segment("  "), *line] for line in lines], new_lines=True)
+            )
 
-        if index < 1 or index > len(self.todos):
-            print("Error: Invalid todo index.")
-            return
+            count += len(chunk)
+            last_row = chunk[-1]
+            first = False
+            chunk = next_chunk
+        console.line(2)
+        return count, last_row
 
+    def mark_as_not_done(self, index: int) -> Todo | None:
+        return self._set_done(self._todo_at_index, index, False, "index")
+
+    def mark_as_done(self, index: int) -> Todo | None:
+        return self._set_done(self._todo_at_index, index, True, "index")
+
+    def update_done_data(self, index, done_value, done_at_value, todo_id):
+        text_done_value = "done" if done_value == 1 else "not done"
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-
-                row = conn.execute(
-                    "SELECT id, item FROM todos ORDER BY id LIMIT 1 OFFSET ?;",
-                    (index - 1,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo index.")
-                    return
-
-                todo_id, item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET done = 0, done_at = NULL WHERE id = ?;",
-                        (todo_id,),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to mark todo as not done. ({e})")
+            todo = self._todo_at_index(index)
+            if todo is None:
+                self._error("Error: Invalid todo index.")
+                return
+
+            self.client.set_done(todo.id, bool(done_value))
+        except TodoError as e:
+            self._error(f"Error: Failed to mark todo as {text_done_value}. ({e})")
             return
 
-        print(f'Marked todo as not done: "{item}"')
+    def edit_entry(self, index: int, new_text: str) -> Todo | None:
+        return self._edit(self._todo_at_index, index, new_text, "index")
 
-    def mark_as_done(self, index: int) -> None:
-        self._check_and_load_todos(self.file_path_to_db)
+    def remove_by_id(self, todo_id: int) -> Todo | None:
+        try:
+            todo = self.client.remove(todo_id)
+        except TodoNotFoundError:
+            self._error("Error: Invalid todo id.")
+            return None
+        except StorageError as e:
+            self._error(f"Error: Failed to remove todo. ({e})")
+            return None
 
-        if index < 1 or index > len(self.todos):
-            print("Error: Invalid todo index.")
-            return
+        self._info(f'Removed todo: "{todo.item}"')
+        return todo
 
-        try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-
-                row = conn.execute(
-                    "SELECT id, item FROM todos ORDER BY id LIMIT 1 OFFSET ?;",
-                    (index - 1,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo index.")
-                    return
-
-                todo_id, item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET done = ?, done_at = datetime('now') WHERE id = ?;",
-                        (1, todo_id),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to mark todo as done. ({e})")
-            return
+    def mark_done_by_id(self, todo_id: int) -> Todo | None:
+        return self._set_done(self._todo_by_id, todo_id, True, "id")
 
-        print(f'Marked todo as done: "{item}"')
+    def mark_not_done_by_id(self, todo_id: int) -> Todo | None:
+        return self._set_done(self._todo_by_id, todo_id, False, "id")
 
-    def update_done_data(self, index, done_value, done_at_value, todo_id):
-        text_done_value = "done" if done_value == 1 else "not done"
+    def edit_by_id(self, todo_id: int, new_text: str) -> Todo | None:
+        return self._edit(self._todo_by_id, todo_id, new_text, "id")
+
+    def _todo_by_id(self, todo_id: int) -> Todo | None:
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-
-                row = conn.execute(
-                    "SELECT id, item FROM todos ORDER BY id LIMIT 1 OFFSET ?;",
-                    (index - 1,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo index.")
-                    return
-
-                todo_id, item = row
-                with conn:
-                    if done_value:
-                        conn.execute(
-                            "UPDATE todos SET done = ?, done_at = datetime('now') WHERE id = ?;",
-                            (1, todo_id),
-                        )
-                    else:
-                        conn.execute(
-                            "UPDATE todos SET done = ?, done_at = NULL WHERE id = ?;",
-                            (0, todo_id),
-                        )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to mark todo as {text_done_value}. ({e})")
-            return
+            return self.client.get(todo_id)
+        except TodoNotFoundError:
+            return None
 
-    def edit_entry(self, index: int, new_text: str) -> None:
-        self._check_and_load_todos(self.file_path_to_db)
+    def _set_done(self, lookup, key: int, done: bool, kind: str) -> Todo | None:
+        """Mark the todo `lookup(key)` finds; `kind` names the key in errors."""
+        state = "done" if done else "not done"
+        try:
+            todo = lookup(key)
+            if todo is None:
+                self._error(f"Error: Invalid todo {kind}.")
+                return None
 
-        if index < 1 or index > len(self.todos):
-            print("Error: Invalid todo index.")
-            return
+            todo = self.client.set_done(todo.id, done)
+        except TodoError as e:
+            self._error(f"Error: Failed to mark todo as {state}. ({e})")
+            return None
+
+        self._info(f'Marked todo as {state}: "{todo.item}"')
+        return todo
 
+    def _edit(self, lookup, key: int, new_text: str, kind: str) -> Todo | None:
+        """Replace the text of the todo `lookup(key)` finds."""
         new_text = (new_text or "").strip()
         if not new_text:
-            print("Error: Todo item cannot be empty.")
-            return
+            self._error("Error: Todo item cannot be empty.")
+            return None
 
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-
-                row = conn.execute(
-                    "SELECT id, item FROM todos ORDER BY id LIMIT 1 OFFSET ?;",
-                    (index - 1,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo index.")
-                    return
-
-                todo_id, old_item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET item = ? WHERE id = ?;",
-                        (new_text, todo_id),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to edit todo. ({e})")
-            return
+            old = lookup(key)
+            if old is None:
+                self._error(f"Error: Invalid todo {kind}.")
+                return None
 
-        print(f'Edited todo: "{old_item}" to "{new_text}"')
+            todo = self.client.edit(old.id, new_text)
+        except TodoError as e:
+            self._error(f"Error: Failed to edit todo. ({e})")
+            return None
 
-    def remove_by_id(self, todo_id: int) -> None:
-        try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                row = conn.execute(
-                    "SELECT id, item FROM todos WHERE id = ?;",
-                    (todo_id,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo id.")
-                    return
-
-                _, removed_item = row
-                with conn:
-                    conn.execute("DELETE FROM todos WHERE id = ?;", (todo_id,))
-        except sqlite3.Error as e:
-            print(f"Error: Failed to remove todo. ({e})")
-            return
+        self._info(f'Edited todo: "{old.item}" to "{todo.item}"')
+        return todo
 
-        print(f'Removed todo: "{removed_item}"')
+    # Bulk mutations: one transaction and one summary line per call.
 
-    def mark_done_by_id(self, todo_id: int) -> None:
-        try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                row = conn.execute(
-                    "SELECT id, item FROM todos WHERE id = ?;",
-                    (todo_id,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo id.")
-                    return
-
-                _, item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET done = 1, done_at = datetime('now') WHERE id = ?;",
-                        (todo_id,),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to mark todo as done. ({e})")
-            return
+    def mark_done_by_ids(self, todo_ids: Iterable[int]) -> int:
+        return self.mark_done_by_ranges((i, i) for i in todo_ids)
+
+    def mark_not_done_by_ids(self, todo_ids: Iterable[int]) -> int:
+        return self.mark_not_done_by_ranges((i, i) for i in todo_ids)
+
+    def remove_by_ids(self, todo_ids: Iterable[int]) -> int:
+        return self.remove_by_ranges((i, i) for i in todo_ids)
+
+    # Ranges are inclusive `(first, last)` ID pairs, applied in SQL, so
+    # `todo done 1-5000000` never builds the IDs in memory.
+
+    def mark_done_by_ranges(self, ranges: Iterable[tuple[int, int]]) -> int:
+        return self._apply_many(
+            ranges,
+            lambda merged: self.client.set_done_ranges(merged, True),
+            action="mark todos as done",
+            summary="Marked {} as done.",
+        )
+
+    def mark_not_done_by_ranges(self, ranges: Iterable[tuple[int, int]]) -> int:
+        return self._apply_many(
+            ranges,
+            lambda merged: self.client.set_done_ranges(merged, False),
+            action="mark todos as not done",
+            summary="Marked {} as not done.",
+        )
+
+    def remove_by_ranges(self, ranges: Iterable[tuple[int, int]]) -> int:
+        return self._apply_many(
+            ranges,
+            self.client.remove_ranges,
+            action="remove todos",
+            summary="Removed {}.",
+        )
+
+    def mark_all_done(self) -> int:
+        return self._apply_many(
+            None,
+            lambda _: self.client.set_done_all(True),
+            action="mark todos as done",
+            summary="Marked {} as done.",
+        )
+
+    def mark_all_not_done(self) -> int:
+        return self._apply_many(
+            None,
+            lambda _: self.client.set_done_all(False),
+            action="mark todos as not done",
+            summary="Marked {} as not done.",
+        )
 
-        print(f'Marked todo as done: "{item}"')
+    def remove_done(self) -> int:
+        return self._apply_many(
+            None,
+            lambda _: self.client.remove_done(),
+            action="remove todos",
+            summary="Removed {}.",
+        )
 
-    def mark_not_done_by_id(self, todo_id: int) -> None:
+    def _apply_many(
+        self,
+        ranges: Iterable[tuple[int, int]] | None,
+        apply,
+        *,
+        action: str,
+        summary: str,
+    ) -> int:
+        """Run a bulk client write and print one summary line.
+
+        `ranges` is None for filter-based writes (e.g. every open todo);
+        otherwise IDs in the ranges that do not exist are counted and
+        reported.
+        """
+        merged = None if ranges is None else merge_id_ranges(ranges)
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                row = conn.execute(
-                    "SELECT id, item FROM todos WHERE id = ?;",
-                    (todo_id,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo id.")
-                    return
-
-                _, item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET done = 0, done_at = NULL WHERE id = ?;",
-                        (todo_id,),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to mark todo as not done. ({e})")
-            return
+            changed = apply(merged)
+        except StorageError as e:
+            self._error(f"Error: Failed to {action}. ({e})")
+            return 0
+
+        noun = "todo" if changed == 1 else "todos"
+        message = summary.format(f"{changed} {noun}")
+        requested = 0 if merged is None else sum(b - a + 1 for a, b in merged)
+        if requested > changed:
+            missing = requested - changed
+            message += f" {missing} {'ID' if missing == 1 else 'IDs'} not found."
+        self._info(message)
+        return changed
+
+    def import_todos(
+        self,
+        lines: Iterable[str],
+        fmt: str = "text",
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> ImportResult | None:
+        """Stream todos from `lines` into the database in batched transactions.
 
-        print(f'Marked todo as not done: "{item}"')
+        Parameters
+        ----------
+        lines:
+            Input lines, e.g. an open file or `sys.stdin`; read incrementally.
+        fmt:
+            "text", "csv" or "jsonl" (see `storage.bulk.iter_records`).
+        batch_size:
+            Rows per transaction.
+
+        Returns
+        -------
+        ImportResult or None
+            Counts and timing, or None if the import failed before finishing
+            (batches already committed are kept).
+        """
+        try:
+            result = self.client.import_lines(lines, fmt, batch_size=batch_size)
+        except TodoError as e:
+            self._error(f"Error: Failed to import todos. ({e})")
+            return None
+
+        noun = "todo" if result.inserted == 1 else "todos"
+        message = (
+            f"Imported {result.inserted} {noun} in {result.seconds:.2f}s "
+            f"({result.rate:,.0f} todos/s)."
+        )
+        if result.skipped:
+            message += f" Skipped {result.skipped} invalid record(s)."
+        self._info(message)
+        return result
 
-    def edit_by_id(self, todo_id: int, new_text: str) -> None:
-        new_text = (new_text or "").strip()
-        if not new_text:
-            print("Error: Todo item cannot be empty.")
-            return
+    def export_todos(
+        self,
+        stream: TextIO,
+        fmt: str = "jsonl",
+        *,
+        show: str = "all",
+        since_id: int | None = None,
+    ) -> int | None:
+        """Write todos to `stream` from one consistent read snapshot.
+
+        Rows are fetched in batches and written as they arrive, so memory use
+        stays flat however large the table is, and concurrent writers are not
+        blocked (WAL).
 
+        Parameters
+        ----------
+        stream:
+            Text stream to write to (stdout, a file, a gzip wrapper...).
+        fmt:
+            One of `output.EXPORT_FORMATS`.
+        show:
+            "all" (default), "open" or "done".
+        since_id:
+            Only export todos with an id greater than this.
+
+        Returns
+        -------
+        int or None
+            Number of todos written, or None on a database error.
+        """
+        start = time.perf_counter()
         try:
-            with sqlite3.connect(self.file_path_to_db) as conn:
-                ensure_schema(conn)
-                row = conn.execute(
-                    "SELECT id, item FROM todos WHERE id = ?;",
-                    (todo_id,),
-                ).fetchone()
-                if row is None:
-                    print("Error: Invalid todo id.")
-                    return
-
-                _, old_item = row
-                with conn:
-                    conn.execute(
-                        "UPDATE todos SET item = ? WHERE id = ?;",
-                        (new_text, todo_id),
-                    )
-        except sqlite3.Error as e:
-            print(f"Error: Failed to edit todo. ({e})")
-            return
+            count = write_rows(
+                self.client.iter_snapshot(show=show, since_id=since_id), fmt, stream
+            )
+        except TodoError as e:
+            self._error(f"Error: Failed to export todos. ({e})")
+            return None
 
-        print(f'Edited todo: "{old_item}" to "{new_text}"')
+        noun = "todo" if count == 1 else "todos"
+        self._info(f"Exported {count} {noun} in {time.perf_counter() - start:.2f}s.")
+        return count
@@ -0,0 +1,141 @@
+"""Plain (machine-readable) output formats for todo rows.
+
+These writers stream rows straight from a cursor to a text stream, without
+importing rich, so scripts can parse `todo` output cheaply.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, TextIO
+
+FIELDS = ("id", "item", "done", "created_at", "done_at")
+PLAIN_FORMATS = ("json", "jsonl", "tsv", "csv")
+FORMATS = ("table", *PLAIN_FORMATS)
+# `todo export` also writes SQL INSERT statements that reload into a todo DB.
+EXPORT_FORMATS = ("jsonl", "json", "csv", "tsv", "sql")
+
+
+def todo_to_dict(row: Sequence) -> dict:
+    """Return a JSON-ready dict for an `(id, item, done, created_at, done_at)` row."""
+    todo_id, item, done, created_at, done_at = row[:5]
+    return {
+        "id": todo_id,
+        "item": item,
+        "done": bool(done),
+        "created_at": created_at,
+        "done_at": done_at,
+    }
+
+
+def _tsv_field(value: object) -> str:
+    # Backslash-escape the characters that would break the line/field layout.
+    if value is None:
+        return ""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _sql_literal(value: object) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def write_rows(rows: Iterable[Sequence], fmt: str, stream: TextIO) -> int:
+    """Write todo rows to `stream` in a plain format.
+
+    Parameters
+    ----------
+    rows:
+        `(id, item, done, created_at, done_at)` sequences, e.g. a cursor.
+    fmt:
+        One of `PLAIN_FORMATS`, or "sql" for a transaction of INSERT statements.
+    stream:
+        Text stream to write to.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    count = 0
+    if fmt == "jsonl":
+        for row in rows:
+            stream.write(json.dumps(todo_to_dict(row), ensure_ascii=False) + "\n")
+            count += 1
+    elif fmt == "json":
+        # Written element by element so the array is never held in memory.
+        stream.write("[")
+        for row in rows:
+            stream.write(",\n" if count else "\n")
+            stream.write(json.dumps(todo_to_dict(row), ensure_ascii=False))
+            count += 1
+        stream.write("\n]\n" if count else "]\n")
+    elif fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(FIELDS)
+        for row in rows:
+            todo_id, item, done, created_at, done_at = row[:5]
+            writer.writerow((todo_id, item, int(bool(done)), created_at, done_at))
+            count += 1
+    elif fmt == "tsv":
+        stream.write("\t".join(FIELDS) + "\n")
+        for row in rows:
+            todo_id, item, done, created_at, done_at = row[:5]
+            stream.write(
+                f"{todo_id}\t{_tsv_field(item)}\t{int(bool(done))}\t"
+                f"{_tsv_field(created_at)}\t{_tsv_field(done_at)}\n"
+            )
+            count += 1
+    elif fmt == "sql":
+        stream.write("BEGIN TRANSACTION;\n")
+        for row in rows:
+            todo_id, item, done, created_at, done_at = row[:5]
+            values = ", ".join(
+                _sql_literal(value)
+                for value in (todo_id, item, int(bool(done)), created_at, done_at)
+            )
+            stream.write(f"INSERT INTO todos({', '.join(FIELDS)}) VALUES ({values});\n")
+            count += 1
+        stream.write("COMMIT;\n")
+    else:
+        raise ValueError(f"Unknown output format: {fmt!r}")
+    return count
+
+
+@contextmanager
+def open_output(path: Path | None, *, compress: bool = False) -> Iterator[TextIO]:
+    """Open `path` (stdout when None) as a UTF-8 text stream, optionally gzipped."""
+    if not compress:
+        if path is None:
+            yield sys.stdout
+            return
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            yield handle
+        return
+
+    import gzip
+
+    raw = sys.stdout.buffer if path is None else open(path, "wb")
+    try:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            with io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+                yield text
+    finally:
+        if path is None:
+            raw.flush()
+        else:
+            raw.close()
@@ -0,0 +1,247 @@
+"""Opt-in timing of CLI phases and SQL statements (`todo --profile`, TODO_TRACE=1).
+
+When enabled, code wrapped in `phase(name)` is timed, and every connection
+opened by `TodoStore` is a `TracedConnection` that times each statement and
+reports it with `sqlite3.Connection.set_trace_callback`. Statement times run
+from the call until SQLite hands back the first row; rows fetched later
+count toward the phase that consumes them (usually "render").
+
+When disabled - the default - `phase()` returns a shared no-op context and
+connections are plain `sqlite3.Connection` objects, so the cost is one
+global lookup per phase.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Iterator, TextIO
+
+# Environment variables that turn profiling on without `--profile`.
+TRACE_ENV = "TODO_TRACE"
+TRACE_JSON_ENV = "TODO_TRACE_JSON"
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+_NO_PHASE = nullcontext()
+_active: Profiler | None = None
+
+
+@lru_cache(maxsize=512)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and replace literals with `?` so runs group."""
+    return _SPACE_RE.sub(" ", _LITERAL_RE.sub("?", sql)).strip().rstrip(";")
+
+
+class Profiler:
+    """Collect phase and SQL timings for one process (single-threaded use).
+
+    Parameters
+    ----------
+    start:
+        `time.perf_counter()` value the report's total is measured from;
+        defaults to now.
+    """
+
+    def __init__(self, start: float | None = None):
+        self.start = perf_counter() if start is None else start
+        # Phase path ("command", "render") -> [calls, seconds].
+        self.phases: dict[tuple[str, ...], list] = {}
+        # Normalised statement -> [calls, seconds].
+        self.statements: dict[str, list] = {}
+        self._stack: list[str] = []
+        self._traced: list[str] | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        path = tuple(self._stack)
+        # Register on entry so the report lists phases in start order.
+        self.phases.setdefault(path, [0, 0.0])
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(path, perf_counter() - started)
+            self._stack.pop()
+
+    def record_phase(self, path: tuple[str, ...], seconds: float) -> None:
+        entry = self.phases.setdefault(path, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def record_statement(self, sql: str, seconds: float) -> None:
+        entry = self.statements.setdefault(normalize_sql(sql), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        """Report the statements SQLite runs on `conn` to this profiler."""
+        conn.set_trace_callback(self._on_trace)
+
+    def _on_trace(self, sql: str) -> None:
+        if self._traced is not None:
+            # Inside a timed call; sorted out when the call returns.
+            self._traced.append(sql)
+        else:
+            # Issued outside a timed call, e.g. by a separate cursor.
+            self.record_statement(sql, 0.0)
+
+    def _timed(self, sql: str, call, *args):
+        outer = self._traced
+        self._traced = []
+        started = perf_counter()
+        try:
+            return call(*args)
+        finally:
+            seconds = perf_counter() - started
+            traced, self._traced = self._traced, outer
+            self.record_statement(sql, seconds)
+            # Statements SQLite ran on the side, such as the implicit BEGIN.
+            # Trigger steps repeat the outer statement and are skipped.
+            own = normalize_sql(sql)
+            for extra in dict.fromkeys(normalize_sql(text) for text in traced):
+                if extra != own:
+                    self.record_statement(extra, 0.0)
+
+    def report(self) -> dict:
+        """Return the collected timings as a JSON-serialisable dict."""
+        return {
+            "argv": sys.argv[1:],
+            "total_ms": round((perf_counter() - self.start) * 1000, 3),
+            "phases": [
+                {
+                    "phase": "/".join(path),
+                    "calls": calls,
+                    "total_ms": round(seconds * 1000, 3),
+                }
+                for path, (calls, seconds) in self.phases.items()
+            ],
+            "sql": [
+                {"statement": sql, "calls": calls, "total_ms": round(seconds * 1000, 3)}
+                for sql, (calls, seconds) in sorted(
+                    self.statements.items(), key=lambda item: -item[1][1]
+                )
+            ],
+        }
+
+    def write_text(self, stream: TextIO) -> None:
+        report = self.report()
+        print(f"\nProfile: {report['total_ms']:.1f} ms total", file=stream)
+        print(f"  {'phase':<32} {'calls':>6} {'total ms':>10}", file=stream)
+        for entry in report["phases"]:
+            depth = entry["phase"].count("/")
+            name = "  " * depth + entry["phase"].rsplit("/", 1)[-1]
+            print(
+                f"  {name:<32} {entry['calls']:>6} {entry['total_ms']:>10.2f}",
+                file=stream,
+            )
+
+        statements = report["sql"]
+        calls = sum(entry["calls"] for entry in statements)
+        total = sum(entry["total_ms"] for entry in statements)
+        print(f"SQL: {calls} statements, {total:.2f} ms", file=stream)
+        print(f"  {'calls':>6} {'total ms':>10}  statement", file=stream)
+        for entry in statements:
+            sql = entry["statement"]
+            if len(sql) > 100:
+                sql = sql[:97] + "..."
+            print(
+                f"  {entry['calls']:>6} {entry['total_ms']:>10.2f}  {sql}", file=stream
+            )
+
+    def append_json(self, path: Path) -> None:
+        """Append the report to `path` as one JSON line (for aggregation)."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.report()) + "\n")
+
+
+def timed_connection_class(timer: Callable[..., Any]) -> type[sqlite3.Connection]:
+    """Return a `sqlite3.Connection` subclass that runs statements via `timer`.
+
+    `timer(sql, call, *args)` must return `call(*args)`. It wraps every
+    `execute`, `executemany` and `executescript`, and the COMMIT or ROLLBACK
+    ending an open transaction, including the implicit one of `with conn:`.
+    Shared by `TracedConnection` and the web server's metrics.
+    """
+
+    class TimedConnection(sqlite3.Connection):
+        def execute(self, sql, parameters=(), /):
+            return timer(sql, super().execute, sql, parameters)
+
+        def executemany(self, sql, parameters, /):
+            return timer(sql, super().executemany, sql, parameters)
+
+        def executescript(self, sql_script, /):
+            return timer(sql_script, super().executescript, sql_script)
+
+        def commit(self):
+            if self.in_transaction:
+                return timer("COMMIT", super().commit)
+            return super().commit()
+
+        def rollback(self):
+            if self.in_transaction:
+                return timer("ROLLBACK", super().rollback)
+            return super().rollback()
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            # `with conn:` commits in C, bypassing `commit()` above.
+            if self.in_transaction:
+                sql = "COMMIT" if exc_type is None else "ROLLBACK"
+                return timer(sql, super().__exit__, exc_type, exc_value, traceback)
+            return super().__exit__(exc_type, exc_value, traceback)
+
+    return TimedConnection
+
+
+def _timed(sql: str, call, *args):
+    if _active is None:
+        return call(*args)
+    return _active._timed(sql, call, *args)
+
+
+class TracedConnection(timed_connection_class(_timed)):
+    """A connection that times its statements into the active profiler.
+
+    Used as the `factory` for `sqlite3.connect` only while profiling.
+    """
+
+
+def enable(start: float | None = None) -> Profiler:
+    """Start profiling this process and return the profiler."""
+    global _active
+    _active = Profiler(start)
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def active() -> Profiler | None:
+    """Return the running profiler, or None when profiling is off."""
+    return _active
+
+
+def phase(name: str) -> ContextManager:
+    """Time the enclosed block as `name` (nested phases form a path)."""
+    return _NO_PHASE if _active is None else _active.phase(name)
+
+
+def connect(*args, **kwargs) -> sqlite3.Connection:
+    """`sqlite3.connect`, returning a traced connection while profiling."""
+    profiler = _active
+    if profiler is None or "factory" in kwargs:
+        return sqlite3.connect(*args, **kwargs)
+    conn = sqlite3.connect(*args, factory=TracedConnection, **kwargs)
+    profiler.attach(conn)
+    return conn
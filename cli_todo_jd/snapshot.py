@@ -0,0 +1,190 @@
+"""Compact, read-only in-memory copy of the todo list.
+
+Ids are stored in an `array('q')` and done flags in a `bytearray`, so a
+todo costs 9 bytes plus its text (held once, in a tuple) instead of three
+list slots and three boxed Python objects.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+
+class TodoEntry(NamedTuple):
+    id: int
+    item: str
+    done: bool
+
+
+class TodoSnapshot:
+    """Immutable snapshot of todos ordered by id.
+
+    Parameters
+    ----------
+    ids:
+        Todo ids in ascending order.
+    done:
+        One byte per todo, 1 if completed.
+    items:
+        Todo text, aligned with `ids`.
+    version:
+        `TodoStore.version()` when the rows were read, or None if unknown.
+    rev:
+        `TodoStore.change_rev()` when the rows were read, or None if unknown.
+    """
+
+    __slots__ = ("_ids", "_done", "_items", "version", "rev")
+
+    def __init__(
+        self,
+        ids: array,
+        done: bytearray,
+        items: tuple[str, ...],
+        version: tuple[int, int] | None = None,
+        rev: int | None = None,
+    ):
+        self._ids = ids
+        self._done = done
+        self._items = items
+        self.version = version
+        self.rev = rev
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Sequence],
+        version: tuple[int, int] | None = None,
+        rev: int | None = None,
+    ) -> TodoSnapshot:
+        """Build a snapshot from `(id, item, done, ...)` rows, e.g. a cursor."""
+        ids = array("q")
+        done = bytearray()
+        items: list[str] = []
+        for todo_id, item, is_done, *_ in rows:
+            ids.append(todo_id)
+            done.append(1 if is_done else 0)
+            items.append(item)
+        return cls(ids, done, tuple(items), version, rev)
+
+    @classmethod
+    def empty(
+        cls, version: tuple[int, int] | None = None, rev: int | None = None
+    ) -> TodoSnapshot:
+        return cls(array("q"), bytearray(), (), version, rev)
+
+    def apply_changes(
+        self,
+        changed_ids: Iterable[int],
+        rows: Iterable[Sequence],
+        version: tuple[int, int] | None,
+        rev: int | None,
+    ) -> TodoSnapshot:
+        """Return a new snapshot with `changed_ids` replaced by `rows`.
+
+        `rows` are the current `(id, item, done, ...)` rows of the changed
+        todos; a changed id without a row has been deleted. Untouched runs
+        between changes are copied as slices, so the cost is a few memory
+        copies plus a binary search per change rather than a re-read.
+        """
+        current = {row[0]: row for row in rows}
+        ids = array("q")
+        done = bytearray()
+        items: list[str] = []
+        start = 0
+        for todo_id in sorted(set(changed_ids)):
+            position = bisect_left(self._ids, todo_id, start)
+            ids.extend(self._ids[start:position])
+            done += self._done[start:position]
+            items.extend(self._items[start:position])
+            exists = position < len(self._ids) and self._ids[position] == todo_id
+            start = position + 1 if exists else position
+
+            row = current.get(todo_id)
+            if row is not None:
+                ids.append(row[0])
+                done.append(1 if row[2] else 0)
+                items.append(row[1])
+        ids.extend(self._ids[start:])
+        done += self._done[start:]
+        items.extend(self._items[start:])
+        return TodoSnapshot(ids, done, tuple(items), version, rev)
+
+    @property
+    def ids(self) -> memoryview:
+        """Read-only view of the ids (no copy)."""
+        return memoryview(self._ids).toreadonly()
+
+    @property
+    def done_flags(self) -> memoryview:
+        """Read-only view of the done flags, one byte per todo (no copy)."""
+        return memoryview(self._done).toreadonly()
+
+    @property
+    def items(self) -> tuple[str, ...]:
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, position: int) -> TodoEntry:
+        return TodoEntry(
+            self._ids[position], self._items[position], bool(self._done[position])
+        )
+
+    def __iter__(self) -> Iterator[TodoEntry]:
+        for todo_id, item, done in zip(self._ids, self._items, self._done):
+            yield TodoEntry(todo_id, item, bool(done))
+
+    def position_of(self, todo_id: int) -> int | None:
+        """Return the 0-based position of `todo_id`, or None (binary search)."""
+        position = bisect_left(self._ids, todo_id)
+        if position < len(self._ids) and self._ids[position] == todo_id:
+            return position
+        return None
+
+    def view(self, show: str = "all") -> TodoSnapshotView:
+        """Return a filtered view ("open", "done" or "all") that shares storage."""
+        return TodoSnapshotView(self, show)
+
+
+class TodoSnapshotView:
+    """Lazily filtered view over a `TodoSnapshot`; nothing is copied."""
+
+    __slots__ = ("_snapshot", "show")
+
+    def __init__(self, snapshot: TodoSnapshot, show: str = "all"):
+        if show not in {"open", "done", "all"}:
+            raise ValueError("show must be one of: open, done, all")
+        self._snapshot = snapshot
+        self.show = show
+
+    def _selector(self) -> Iterable[int] | None:
+        done = self._snapshot._done
+        if self.show == "done":
+            return done
+        if self.show == "open":
+            return (not flag for flag in done)
+        return None
+
+    def __len__(self) -> int:
+        done_count = self._snapshot._done.count(1)
+        if self.show == "done":
+            return done_count
+        if self.show == "open":
+            return len(self._snapshot) - done_count
+        return len(self._snapshot)
+
+    def __iter__(self) -> Iterator[TodoEntry]:
+        selector = self._selector()
+        if selector is None:
+            return iter(self._snapshot)
+        return compress(self._snapshot, selector)
+
+    def positions(self) -> Iterator[int]:
+        """Yield the snapshot positions of the todos in this view."""
+        selector = self._selector()
+        positions = range(len(self._snapshot))
+        return iter(positions) if selector is None else compress(positions, selector)
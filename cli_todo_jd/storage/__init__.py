@@ -2,5 +2,18 @@
 
 from .schema import ensure_schema, SCHEMA_VERSION
 from .migrate import migrate_from_json
+from .store import TodoStore
+from .pool import DEFAULT_POOL_SIZE, TodoStorePool
+from .bulk import IMPORT_FORMATS, ImportResult, iter_records
 
-__all__ = ["ensure_schema", "SCHEMA_VERSION", "migrate_from_json"]
+__all__ = [
+    "ensure_schema",
+    "SCHEMA_VERSION",
+    "migrate_from_json",
+    "TodoStore",
+    "TodoStorePool",
+    "DEFAULT_POOL_SIZE",
+    "IMPORT_FORMATS",
+    "ImportResult",
+    "iter_records",
+]
@@ -0,0 +1,166 @@
+"""Streaming bulk import of todos.
+
+Records are parsed lazily from an iterable of lines and inserted in bounded
+batches, one transaction per batch, so memory use does not grow with the
+size of the input.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+import time
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+IMPORT_FORMATS = ("text", "csv", "jsonl")
+DEFAULT_BATCH_SIZE = 5000
+
+# (item, done, created_at, done_at); None timestamps fall back to "now".
+TodoRecord = tuple[str, int, str | None, str | None]
+
+# Bound with `(item, done, created_at, done, done_at)`: plain `?` placeholders,
+# since numbered ones cannot be bound from a sequence from Python 3.14 on.
+_INSERT_SQL = (
+    "INSERT INTO todos(item, done, created_at, done_at) "
+    "VALUES (?, ?, COALESCE(?, datetime('now')), "
+    "CASE WHEN ? THEN COALESCE(?, datetime('now')) END);"
+)
+
+_TRUE_VALUES = {"1", "true", "t", "yes", "y", "x", "done", "✔"}
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import: rows inserted, input records skipped, elapsed time."""
+
+    inserted: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Rows inserted per second."""
+        return self.inserted / self.seconds if self.seconds > 0 else 0.0
+
+
+def _parse_done(value: object) -> int:
+    if isinstance(value, str):
+        return int(value.strip().lower() in _TRUE_VALUES)
+    return int(bool(value))
+
+
+def _timestamp(value: object) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _record(
+    item: object, done: object, created_at: object, done_at: object
+) -> TodoRecord | None:
+    if not isinstance(item, str) or not item.strip():
+        return None
+    return (
+        item.strip(),
+        _parse_done(done),
+        _timestamp(created_at),
+        _timestamp(done_at),
+    )
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[TodoRecord | None]:
+    """Parse todo records lazily from `lines`.
+
+    Parameters
+    ----------
+    lines:
+        Text lines, e.g. an open file or `sys.stdin`.
+    fmt:
+        "text" (one todo per line), "csv" (header row with an `item` or
+        `text` column and optional `done`, `created_at`, `done_at` columns)
+        or "jsonl" (one JSON object or string per line).
+
+    Yields
+    ------
+    tuple or None
+        `(item, done, created_at, done_at)`, or None for a record that could
+        not be used (blank item, malformed line), so callers can count it.
+    """
+    if fmt == "text":
+        for line in lines:
+            text = line.strip()
+            if text:
+                yield (text, 0, None, None)
+    elif fmt == "csv":
+        for row in csv.DictReader(lines):
+            yield _record(
+                row.get("item") or row.get("text"),
+                row.get("done"),
+                row.get("created_at"),
+                row.get("done_at"),
+            )
+    elif fmt == "jsonl":
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            if isinstance(entry, str):
+                yield _record(entry, 0, None, None)
+            elif isinstance(entry, dict):
+                yield _record(
+                    entry.get("item") or entry.get("text"),
+                    entry.get("done"),
+                    entry.get("created_at"),
+                    entry.get("done_at"),
+                )
+            else:
+                yield None
+    else:
+        raise ValueError(f"Unknown import format: {fmt!r}")
+
+
+def insert_records(
+    conn: sqlite3.Connection,
+    records: Iterable[TodoRecord | None],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Callable[[ImportResult], None] | None = None,
+    write: Callable[[], AbstractContextManager] | None = None,
+) -> ImportResult:
+    """Insert records in batches of `batch_size`, one transaction per batch.
+
+    Each batch is committed before the next is read, so a failure part way
+    through keeps the batches already written. `progress` (if given) is
+    called after every batch with the running totals. `write` returns the
+    context each batch runs in; the default, `conn` itself, commits it.
+    """
+    result = ImportResult()
+    start = time.perf_counter()
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        batch = [
+            (item, done, created_at, done, done_at)
+            for item, done, created_at, done_at in filter(None, chunk)
+        ]
+        result.skipped += len(chunk) - len(batch)
+        if batch:
+            with conn if write is None else write():
+                conn.executemany(_INSERT_SQL, batch)
+            result.inserted += len(batch)
+        result.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(result)
+    result.seconds = time.perf_counter() - start
+    return result
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import json
-import sqlite3
+from itertools import chain
 from pathlib import Path
 from typing import Iterable
 
+from .. import profiling
 from .schema import ensure_schema
 
 
@@ -72,13 +73,14 @@ def migrate_from_json(
         # Fail safe: don't destroy/rename the user's file.
         return 0
 
-    items = list(_iter_json_items(data))
-    if not items:
+    items = iter(_iter_json_items(data))
+    first = next(items, None)
+    if first is None:
         return 0
 
     inserted = 0
-    with sqlite3.connect(db_path) as conn:
-        ensure_schema(conn)
+    with profiling.connect(db_path) as conn:
+        ensure_schema(conn, db_path)
 
         # Guard against double-import
         existing = conn.execute("SELECT 1 FROM todos LIMIT 1;").fetchone()
@@ -86,10 +88,12 @@ def migrate_from_json(
             return 0
 
         with conn:
-            conn.executemany(
-                "INSERT INTO todos(item, done) VALUES (?, 0);", [(t,) for t in items]
-            )
-            inserted = conn.execute("SELECT changes();").fetchone()[0]
+            # Stream the items into executemany rather than building a list.
+            # rowcount sums every row; `changes()` would count only the last.
+            inserted = conn.executemany(
+                "INSERT INTO todos(item, done) VALUES (?, 0);",
+                ((t,) for t in chain([first], items)),
+            ).rowcount
 
     if backup:
         try:
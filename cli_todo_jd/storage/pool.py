@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .store import TodoStore
+
+DEFAULT_POOL_SIZE = 4
+
+
+class TodoStorePool:
+    """A bounded pool of `TodoStore` connections shared between threads.
+
+    Connections are opened on demand, up to `size`, and reused afterwards;
+    a thread that finds every connection in use waits for one to be
+    returned. With WAL, readers on different connections run concurrently
+    and SQLite serialises the writers.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file (e.g. `.todo_list.db`).
+    size:
+        Maximum number of open connections.
+    cached_statements:
+        Prepared statement cache size for each connection.
+    factory:
+        `sqlite3.Connection` subclass for the connections, or None.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        cached_statements: int = 128,
+        factory: type[sqlite3.Connection] | None = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.db_path = Path(db_path)
+        self.size = size
+        self._cached_statements = cached_statements
+        self._factory = factory
+        # LIFO, so a warm connection (and its statement cache) is reused first.
+        self._idle: queue.LifoQueue[TodoStore] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stores: list[TodoStore] = []
+
+    def _new_store(self) -> TodoStore:
+        store = TodoStore(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self._cached_statements,
+            factory=self._factory,
+        )
+        store.open()
+        with self._lock:
+            self._stores.append(store)
+        return store
+
+    def open(self) -> None:
+        """Open one connection now, so schema checks run up front."""
+        with self.connection():
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[TodoStore]:
+        """Borrow a store for the duration of the `with` block."""
+        self._slots.acquire()
+        try:
+            try:
+                store = self._idle.get_nowait()
+            except queue.Empty:
+                store = self._new_store()
+            try:
+                yield store
+            finally:
+                conn = store.conn
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(store)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every connection the pool has opened."""
+        with self._lock:
+            stores, self._stores = self._stores, []
+        for store in stores:
+            store.close()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
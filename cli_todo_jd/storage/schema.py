@@ -1,12 +1,46 @@
 from __future__ import annotations
 
+import os
 import sqlite3
+from pathlib import Path
 
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 4
 
+# todo_rank_blocks groups ids into blocks of 2**RANK_BLOCK_BITS.
+RANK_BLOCK_BITS = 10
+RANK_BLOCK_SIZE = 1 << RANK_BLOCK_BITS
 
-def ensure_schema(conn: sqlite3.Connection) -> None:
+# Approximate number of recent entries kept in the todo_changes log.
+CHANGE_LOG_SIZE = 10_000
+
+# SQL features newer than the oldest SQLite Python 3.10 may be built against.
+# Older libraries get equivalent (slightly slower or simpler) schema instead.
+_HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+_FTS_TOKENIZER = (
+    "unicode61 remove_diacritics 2"
+    if sqlite3.sqlite_version_info >= (3, 27, 0)
+    else "unicode61 remove_diacritics 1"
+)
+
+# Per-process memo of database files already known to be at SCHEMA_VERSION.
+# Maps the absolute path to the (inode, mtime) the file had when checked, so a
+# replaced or externally modified file is probed again.
+_CURRENT_SCHEMAS: dict[str, tuple[int, int]] = {}
+
+
+def _file_stamp(db_path: Path | str) -> tuple[str, tuple[int, int]] | None:
+    # os.path.abspath is pure string work; Path.resolve() would stat every
+    # path component, which is what we are trying to avoid.
+    key = os.path.abspath(db_path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return None
+    return key, (st.st_ino, st.st_mtime_ns)
+
+
+def ensure_schema(conn: sqlite3.Connection, db_path: Path | str | None = None) -> None:
     """Ensure required SQLite schema exists and is migrated.
 
     Uses `PRAGMA user_version` for lightweight, in-app migrations.
@@ -15,6 +49,10 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     ----------
     conn:
         An open sqlite3 connection.
+    db_path:
+        Path of the database file `conn` is connected to. When given, a file
+        already seen at `SCHEMA_VERSION` by this process (same inode and
+        mtime) skips the journal mode switch and migration probing.
 
     Notes
     -----
@@ -22,11 +60,29 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     - Keep migrations idempotent and wrapped in a transaction.
     """
 
-    # Improve concurrent CLI usage (separate processes) and durability.
-    # WAL is persistent for the database file once set.
-    conn.execute("PRAGMA journal_mode = WAL;")
+    # Connection-level setting, so it is needed even on the fast path.
     conn.execute("PRAGMA foreign_keys = ON;")
 
+    stamp = _file_stamp(db_path) if db_path is not None else None
+    if stamp is not None and _CURRENT_SCHEMAS.get(stamp[0]) == stamp[1]:
+        return
+
+    # Improve concurrent CLI usage (separate processes) and durability.
+    # WAL is persistent for the database file once set, and switching takes a
+    # lock, so only switch when the file isn't in WAL mode already.
+    journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+    if str(journal_mode).lower() != "wal":
+        conn.execute("PRAGMA journal_mode = WAL;")
+
+    _migrate(conn)
+
+    if db_path is not None:
+        stamp = _file_stamp(db_path)
+        if stamp is not None:
+            _CURRENT_SCHEMAS[stamp[0]] = stamp[1]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
     current_version = conn.execute("PRAGMA user_version;").fetchone()[0]
 
     # Fresh database
@@ -44,15 +100,149 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
                 """
             )
             conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_done ON todos(done);")
-            conn.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)};")
-        return
+            conn.execute("PRAGMA user_version = 1;")
+        current_version = 1
 
     # Incremental migrations
-    if current_version < 1:
-        # Example placeholder for future migrations.
-        # Keep each migration block small and bump user_version accordingly.
+    if current_version < 2:
+        # Live row counts per block of RANK_BLOCK_SIZE ids, kept in sync by
+        # triggers, so a 1-based display index can be resolved by summing a
+        # few block counts instead of an OFFSET scan over the whole table.
+        if _HAS_UPSERT:
+            count_insert = f"""
+                  INSERT INTO todo_rank_blocks(block, n)
+                  VALUES (NEW.id >> {RANK_BLOCK_BITS}, 1)
+                  ON CONFLICT(block) DO UPDATE SET n = n + 1;"""
+        else:
+            count_insert = f"""
+                  INSERT OR IGNORE INTO todo_rank_blocks(block, n)
+                  VALUES (NEW.id >> {RANK_BLOCK_BITS}, 0);
+                  UPDATE todo_rank_blocks SET n = n + 1
+                  WHERE block = NEW.id >> {RANK_BLOCK_BITS};"""
         with conn:
-            conn.execute("PRAGMA user_version = 1;")
-        current_version = 1
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS todo_rank_blocks (
+                  block INTEGER PRIMARY KEY,
+                  n     INTEGER NOT NULL
+                );
+                """
+            )
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS todos_rank_insert AFTER INSERT ON todos
+                BEGIN{count_insert}
+                END;
+                """
+            )
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS todos_rank_delete AFTER DELETE ON todos
+                BEGIN
+                  UPDATE todo_rank_blocks SET n = n - 1
+                  WHERE block = OLD.id >> {RANK_BLOCK_BITS};
+                END;
+                """
+            )
+            # Backfill (from scratch, so a half-applied migration can rerun).
+            conn.execute("DELETE FROM todo_rank_blocks;")
+            conn.execute(
+                f"""
+                INSERT INTO todo_rank_blocks(block, n)
+                SELECT id >> {RANK_BLOCK_BITS}, COUNT(*) FROM todos
+                GROUP BY id >> {RANK_BLOCK_BITS};
+                """
+            )
+            conn.execute("PRAGMA user_version = 2;")
+        current_version = 2
+
+    if current_version < 3:
+        # Full-text index over todos.item. External content (the text stays in
+        # `todos` only), kept in sync by triggers. If the table cannot be
+        # created (SQLite built without FTS5, or too old for its options), it
+        # is skipped and `TodoStore.search` falls back to LIKE; search is not
+        # worth failing every command over.
+        with conn:
+            try:
+                conn.execute(
+                    f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+                      item,
+                      content = 'todos',
+                      content_rowid = 'id',
+                      tokenize = '{_FTS_TOKENIZER}'
+                    );
+                    """
+                )
+            except sqlite3.OperationalError:
+                pass
+            else:
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos
+                    BEGIN
+                      INSERT INTO todos_fts(rowid, item) VALUES (NEW.id, NEW.item);
+                    END;
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos
+                    BEGIN
+                      INSERT INTO todos_fts(todos_fts, rowid, item)
+                      VALUES ('delete', OLD.id, OLD.item);
+                    END;
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS todos_fts_update
+                    AFTER UPDATE OF item ON todos
+                    BEGIN
+                      INSERT INTO todos_fts(todos_fts, rowid, item)
+                      VALUES ('delete', OLD.id, OLD.item);
+                      INSERT INTO todos_fts(rowid, item) VALUES (NEW.id, NEW.item);
+                    END;
+                    """
+                )
+                conn.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild');")
+            conn.execute("PRAGMA user_version = 3;")
+        current_version = 3
+
+    if current_version < 4:
+        # Append-only log of which todo each write touched. `rev` (AUTOINCREMENT,
+        # so never reused) is a global change counter; readers holding a copy
+        # of the list re-fetch only the todos logged after the rev they saw.
+        # Old entries are pruned every 1024 revs.
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS todo_changes (
+                  rev     INTEGER PRIMARY KEY AUTOINCREMENT,
+                  todo_id INTEGER NOT NULL
+                );
+                """
+            )
+            for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS todos_log_{event.lower()}
+                    AFTER {event} ON todos
+                    BEGIN
+                      INSERT INTO todo_changes(todo_id) VALUES ({ref}.id);
+                    END;
+                    """
+                )
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS todo_changes_prune
+                AFTER INSERT ON todo_changes WHEN NEW.rev % 1024 = 0
+                BEGIN
+                  DELETE FROM todo_changes WHERE rev <= NEW.rev - {CHANGE_LOG_SIZE};
+                END;
+                """
+            )
+            conn.execute("PRAGMA user_version = 4;")
+        current_version = 4
 
     # If you bump SCHEMA_VERSION, add `if current_version < N:` blocks above.
@@ -0,0 +1,616 @@
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from .. import profiling
+from .bulk import DEFAULT_BATCH_SIZE, ImportResult, TodoRecord, insert_records
+from .migrate import migrate_from_json
+from .schema import RANK_BLOCK_BITS, ensure_schema
+
+_COLUMNS = "id, item, done, created_at, done_at"
+
+# Indexed by the new `done` value.
+_SET_DONE_SQL = {
+    True: "UPDATE todos SET done = 1, done_at = datetime('now') WHERE id = ?;",
+    False: "UPDATE todos SET done = 0, done_at = NULL WHERE id = ?;",
+}
+_SET_DONE_RANGE_SQL = {
+    True: "UPDATE todos SET done = 1, done_at = datetime('now') "
+    "WHERE id BETWEEN ? AND ?;",
+    False: "UPDATE todos SET done = 0, done_at = NULL WHERE id BETWEEN ? AND ?;",
+}
+
+# Search terms are reduced to word tokens, so user input never reaches the FTS5
+# query syntax unescaped.
+_TOKEN_RE = re.compile(r"\w+")
+
+# Database paths whose parent directory and legacy JSON file have already been
+# dealt with by this process.
+_PREPARED_PATHS: set[str] = set()
+
+
+def _prepare_db_path(db_path: Path) -> None:
+    key = os.path.abspath(db_path)
+    if key in _PREPARED_PATHS:
+        return
+
+    # Create parent directory if needed
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Optional one-time migration: if the user still has a legacy JSON file and
+    # the DB is empty/new, import the items. This keeps upgrades smooth.
+    json_path = db_path.with_suffix(".json")
+    if db_path.suffix == ".db" and json_path.exists():
+        migrate_from_json(json_path=json_path, db_path=db_path, backup=True)
+
+    _PREPARED_PATHS.add(key)
+
+
+def merge_id_ranges(ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort inclusive `(first, last)` ID ranges, merging overlapping/adjacent ones.
+
+    `[(5, 9), (1, 3), (4, 4), (8, 12)]` becomes `[(1, 12)]`. Ranges with
+    `last < first` are dropped.
+    """
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if last < first:
+            continue
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+class TodoStore:
+    """Own a single SQLite connection for the todo database.
+
+    The connection is opened lazily on first use and kept for the lifetime of
+    the store, so schema checks run once rather than once per operation. The
+    directory creation and legacy JSON migration probe run once per process
+    for each database path. `TodoApp`, the helpers
+    and the web app all go through this class to talk to SQLite.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file (e.g. `.todo_list.db`).
+    check_same_thread:
+        Passed through to `sqlite3.connect`. Set to False when the store is
+        handed between threads (e.g. by `TodoStorePool`).
+    cached_statements:
+        Size of the connection's prepared statement cache. Statements are
+        cached by SQL text, so the fixed queries here are compiled once.
+    factory:
+        `sqlite3.Connection` subclass to connect with (e.g. one that records
+        statement timings), or None for the default.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        check_same_thread: bool = True,
+        cached_statements: int = 128,
+        factory: type[sqlite3.Connection] | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self._check_same_thread = check_same_thread
+        self._cached_statements = cached_statements
+        self._factory = factory
+        self._conn: sqlite3.Connection | None = None
+        self._has_fts: bool | None = None
+        # (version(), change_rev()) from the last `current_rev()` call.
+        self._rev_cache: tuple[tuple[int, int], int] | None = None
+        self._tx_depth = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self.open()
+
+    def open(self) -> sqlite3.Connection:
+        """Open the connection if it isn't already, and return it."""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        with profiling.phase("json_probe"):
+            _prepare_db_path(self.db_path)
+
+        with profiling.phase("connect"):
+            options = {} if self._factory is None else {"factory": self._factory}
+            conn = profiling.connect(
+                self.db_path,
+                check_same_thread=self._check_same_thread,
+                cached_statements=self._cached_statements,
+                **options,
+            )
+        conn.row_factory = sqlite3.Row
+        try:
+            with profiling.phase("ensure_schema"):
+                ensure_schema(conn, self.db_path)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> TodoStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Reads
+
+    def iter_todos(
+        self,
+        *,
+        show: str = "all",
+        limit: int | None = None,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        descending: bool = False,
+    ) -> sqlite3.Cursor:
+        """Return a cursor over todos, filtered and paginated in SQL.
+
+        Pagination is keyset based: the page is located with the primary key
+        (and `idx_todos_done` when filtering) rather than an OFFSET, so reading
+        any page only touches the rows on that page.
+
+        Parameters
+        ----------
+        show:
+            "open", "done", or "all" (default).
+        limit:
+            Maximum number of rows to return. None returns every match.
+        after_id:
+            Only return todos with an id greater than this.
+        before_id:
+            Only return todos with an id less than this. With `limit`, the
+            page is the `limit` todos immediately before `before_id`.
+        descending:
+            If True, newest todos come first.
+        """
+        where: list[str] = []
+        params: list[int] = []
+        if show in {"open", "done"}:
+            where.append("done = ?")
+            params.append(1 if show == "done" else 0)
+        if after_id is not None:
+            where.append("id > ?")
+            params.append(after_id)
+        if before_id is not None:
+            where.append("id < ?")
+            params.append(before_id)
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+        order = "DESC" if descending else "ASC"
+        if limit is None:
+            return self.conn.execute(
+                f"SELECT {_COLUMNS} FROM todos{where_sql} ORDER BY id {order};",
+                params,
+            )
+
+        # Walk the index away from the keyset boundary, then restore the
+        # requested order (only `limit` rows are ever sorted).
+        if after_id is None and (before_id is not None or descending):
+            walk = "DESC"
+        else:
+            walk = "ASC"
+        return self.conn.execute(
+            f"SELECT * FROM (SELECT {_COLUMNS} FROM todos{where_sql} "
+            f"ORDER BY id {walk} LIMIT ?) ORDER BY id {order};",
+            [*params, limit],
+        )
+
+    @contextmanager
+    def read_snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Hold one read transaction so every query inside sees the same data.
+
+        In WAL mode this does not block writers on other connections; they
+        commit to the WAL while the snapshot keeps reading the old pages.
+        """
+        conn = self.conn
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN;")
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+    def iter_snapshot(
+        self,
+        *,
+        show: str = "all",
+        after_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[sqlite3.Row]:
+        """Yield todos from a single read snapshot, `batch_size` rows at a time.
+
+        Only one batch is held in memory, so this suits exporting tables of
+        any size. The snapshot is released when the generator is exhausted or
+        closed.
+        """
+        with self.read_snapshot():
+            cursor = self.iter_todos(show=show, after_id=after_id)
+            while batch := cursor.fetchmany(batch_size):
+                yield from batch
+
+    def fetch_all(
+        self, *, show: str = "all", descending: bool = False
+    ) -> list[sqlite3.Row]:
+        """Return every todo matching `show`, ordered by id."""
+        return self.iter_todos(show=show, descending=descending).fetchall()
+
+    def max_id(self) -> int:
+        return int(self.conn.execute("SELECT MAX(id) FROM todos;").fetchone()[0] or 0)
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM todos LIMIT 1;").fetchone() is None
+
+    def get(self, todo_id: int) -> sqlite3.Row | None:
+        return self.conn.execute(
+            f"SELECT {_COLUMNS} FROM todos WHERE id = ?;", (todo_id,)
+        ).fetchone()
+
+    def id_at_index(self, index: int) -> int | None:
+        """Return the id at a 1-based display index (ordered by id).
+
+        Walks the per-block live row counts in `todo_rank_blocks` to find the
+        block holding the index, then offsets within that block only, so the
+        cost is bounded by the number of blocks plus one block's rows rather
+        than by `index`.
+        """
+        if index < 1:
+            return None
+        remaining = index
+        blocks = self.conn.execute(
+            "SELECT block, n FROM todo_rank_blocks WHERE n > 0 ORDER BY block;"
+        )
+        for block, n in blocks:
+            if remaining <= n:
+                row = self.conn.execute(
+                    "SELECT id FROM todos WHERE id >= ? ORDER BY id LIMIT 1 OFFSET ?;",
+                    (block << RANK_BLOCK_BITS, remaining - 1),
+                ).fetchone()
+                return None if row is None else int(row[0])
+            remaining -= n
+        return None
+
+    def get_by_index(self, index: int) -> sqlite3.Row | None:
+        """Return the todo at a 1-based display index (ordered by id)."""
+        todo_id = self.id_at_index(index)
+        return None if todo_id is None else self.get(todo_id)
+
+    def count(self) -> int:
+        return int(
+            self.conn.execute(
+                "SELECT COALESCE(SUM(n), 0) FROM todo_rank_blocks;"
+            ).fetchone()[0]
+        )
+
+    def change_rev(self) -> int:
+        """Return the global change counter (the latest `todo_changes.rev`)."""
+        row = self.conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'todo_changes';"
+        ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def changed_ids_since(self, rev: int, *, limit: int) -> list[int] | None:
+        """Return the ids of todos written after change `rev`.
+
+        Returns None when the answer is not worth using: the change log has
+        been pruned past `rev`, or more than `limit` todos changed. Callers
+        should then re-read everything. Run inside `read_snapshot()` together
+        with `change_rev()` and `iter_changed_since()` for a consistent view.
+        """
+        oldest = self.conn.execute("SELECT MIN(rev) FROM todo_changes;").fetchone()[0]
+        if oldest is None:
+            # Empty log: either nothing happened, or everything was pruned.
+            return [] if self.change_rev() == rev else None
+        if oldest > rev + 1:
+            return None
+        ids = [
+            int(row[0])
+            for row in self.conn.execute(
+                "SELECT DISTINCT todo_id FROM todo_changes WHERE rev > ? LIMIT ?;",
+                (rev, limit + 1),
+            )
+        ]
+        return None if len(ids) > limit else ids
+
+    def iter_changed_since(self, rev: int) -> sqlite3.Cursor:
+        """Return a cursor over the current rows of todos written after `rev`.
+
+        Todos deleted since `rev` are (naturally) not included.
+        """
+        return self.conn.execute(
+            f"SELECT {_COLUMNS} FROM todos WHERE id IN "
+            "(SELECT todo_id FROM todo_changes WHERE rev > ?) ORDER BY id;",
+            (rev,),
+        )
+
+    def has_fts(self) -> bool:
+        """Whether the FTS5 index exists (SQLite may be built without FTS5)."""
+        if self._has_fts is None:
+            self._has_fts = (
+                self.conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'todos_fts';"
+                ).fetchone()
+                is not None
+            )
+        return self._has_fts
+
+    def search(
+        self, query: str, *, show: str = "all", limit: int | None = None
+    ) -> sqlite3.Cursor:
+        """Return a cursor over todos whose text matches every word of `query`.
+
+        Each word matches as a prefix (`dep` finds "deploy"). With FTS5,
+        results come from the `todos_fts` index ranked by bm25; otherwise a
+        LIKE scan is used and the newest todos come first.
+
+        Parameters
+        ----------
+        query:
+            Free text; punctuation is ignored.
+        show:
+            "open", "done", or "all" (default).
+        limit:
+            Maximum number of results. None returns every match.
+        """
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return self.conn.execute(f"SELECT {_COLUMNS} FROM todos WHERE 0;")
+
+        where: list[str] = []
+        params: list[object] = []
+        if self.has_fts():
+            source = "todos_fts JOIN todos AS t ON t.id = todos_fts.rowid"
+            where.append("todos_fts MATCH ?")
+            params.append(" ".join(f'"{token}"*' for token in tokens))
+            order = "todos_fts.rank"
+        else:
+            source = "todos AS t"
+            for token in tokens:
+                where.append("t.item LIKE ? ESCAPE '\\'")
+                escaped = re.sub(r"([\\%_])", r"\\\1", token)
+                params.append(f"%{escaped}%")
+            order = "t.id DESC"
+        if show in {"open", "done"}:
+            where.append("t.done = ?")
+            params.append(1 if show == "done" else 0)
+
+        sql = (
+            "SELECT t.id, t.item, t.done, t.created_at, t.done_at "
+            f"FROM {source} WHERE {' AND '.join(where)} ORDER BY {order}"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.conn.execute(sql + ";", params)
+
+    def version(self) -> tuple[int, int]:
+        """Return a token that changes whenever the database is written.
+
+        Combines `PRAGMA data_version` (bumped by commits from other
+        connections) with this connection's own `total_changes`.
+        """
+        data_version = self.conn.execute("PRAGMA data_version;").fetchone()[0]
+        return int(data_version), self.conn.total_changes
+
+    def current_rev(self) -> int:
+        """Return `change_rev()`, re-reading it only if the database changed.
+
+        The check is `version()`, which reads no tables, so repeated calls
+        between writes (e.g. ETag checks on polled endpoints) cost only a
+        pragma.
+        """
+        version = self.version()
+        if self._rev_cache is not None and self._rev_cache[0] == version:
+            return self._rev_cache[1]
+        rev = self.change_rev()
+        self._rev_cache = (version, rev)
+        return rev
+
+    # Writes
+
+    @contextmanager
+    def transaction(self) -> Iterator[TodoStore]:
+        """Group several writes into one atomic transaction.
+
+        Write methods called inside the block join it instead of committing
+        on their own. It commits when the block exits and rolls back if the
+        block raises. Nested calls join the outermost transaction.
+        """
+        if self._tx_depth:
+            self._tx_depth += 1
+            try:
+                yield self
+            finally:
+                self._tx_depth -= 1
+            return
+
+        conn = self.conn
+        # IMMEDIATE takes the write lock up front, so a batch either runs to
+        # completion or waits; it never fails half way on a lock upgrade.
+        conn.execute("BEGIN IMMEDIATE;")
+        self._tx_depth = 1
+        try:
+            yield self
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._tx_depth = 0
+
+    def _write(self) -> AbstractContextManager:
+        # Each write commits on its own unless it is part of `transaction()`.
+        return nullcontext() if self._tx_depth else self.conn
+
+    def add(self, item: str) -> int:
+        with self._write():
+            cur = self.conn.execute(
+                "INSERT INTO todos(item, done) VALUES (?, 0);", (item,)
+            )
+        return int(cur.lastrowid)
+
+    def set_done(self, todo_id: int, done: bool) -> None:
+        with self._write():
+            self.conn.execute(_SET_DONE_SQL[bool(done)], (todo_id,))
+
+    def toggle_done(self, todo_id: int) -> bool:
+        """Flip a todo between done and not done in one statement.
+
+        Returns False if the todo does not exist.
+        """
+        with self._write():
+            cur = self.conn.execute(
+                """
+                UPDATE todos
+                SET done = 1 - done,
+                    done_at = CASE WHEN done = 0 THEN datetime('now') END
+                WHERE id = ?;
+                """,
+                (todo_id,),
+            )
+        return cur.rowcount > 0
+
+    def set_done_many(self, todo_ids: Iterable[int], done: bool) -> int:
+        """Mark many todos done/not done in one transaction.
+
+        Returns
+        -------
+        int
+            Number of todos that exist and were updated.
+        """
+        return self.set_done_ranges(
+            merge_id_ranges((todo_id, todo_id) for todo_id in todo_ids), done
+        )
+
+    def set_done_ranges(self, ranges: Iterable[tuple[int, int]], done: bool) -> int:
+        """Mark every todo in the inclusive `(first, last)` ID ranges.
+
+        One `UPDATE ... WHERE id BETWEEN` per range, all in one transaction,
+        so a wide range costs no more than the rows it matches. Ranges must
+        not overlap (see `merge_id_ranges`) or rows are counted twice.
+
+        Returns
+        -------
+        int
+            Number of todos that exist and were updated.
+        """
+        with self._write():
+            cur = self.conn.executemany(_SET_DONE_RANGE_SQL[bool(done)], ranges)
+        return max(cur.rowcount, 0)
+
+    def set_done_all(self, done: bool) -> int:
+        """Flip every todo not already in state `done`; returns how many changed.
+
+        Uses `idx_todos_done`, so only the rows that change are touched.
+        """
+        if done:
+            sql = "UPDATE todos SET done = 1, done_at = datetime('now') WHERE done = 0;"
+        else:
+            sql = "UPDATE todos SET done = 0, done_at = NULL WHERE done = 1;"
+        with self._write():
+            cur = self.conn.execute(sql)
+        return max(cur.rowcount, 0)
+
+    def update(
+        self, todo_id: int, *, item: str | None = None, done: bool | None = None
+    ) -> bool:
+        """Change a todo's text and/or done state in one transaction.
+
+        Returns False if the todo does not exist.
+        """
+        if item is None and done is None:
+            return self.get(todo_id) is not None
+        found = True
+        with self._write():
+            if item is not None:
+                cur = self.conn.execute(
+                    "UPDATE todos SET item = ? WHERE id = ?;", (item, todo_id)
+                )
+                found = cur.rowcount > 0
+            if found and done is not None:
+                cur = self.conn.execute(_SET_DONE_SQL[bool(done)], (todo_id,))
+                found = cur.rowcount > 0
+        return found
+
+    def set_item(self, todo_id: int, item: str) -> None:
+        with self._write():
+            self.conn.execute(
+                "UPDATE todos SET item = ? WHERE id = ?;", (item, todo_id)
+            )
+
+    def delete(self, todo_id: int) -> None:
+        with self._write():
+            self.conn.execute("DELETE FROM todos WHERE id = ?;", (todo_id,))
+
+    def delete_many(self, todo_ids: Iterable[int]) -> int:
+        """Delete many todos in one transaction; returns how many existed."""
+        return self.delete_ranges(
+            merge_id_ranges((todo_id, todo_id) for todo_id in todo_ids)
+        )
+
+    def delete_ranges(self, ranges: Iterable[tuple[int, int]]) -> int:
+        """Delete the todos in non-overlapping `(first, last)` ID ranges."""
+        with self._write():
+            cur = self.conn.executemany(
+                "DELETE FROM todos WHERE id BETWEEN ? AND ?;", ranges
+            )
+        return max(cur.rowcount, 0)
+
+    def delete_done(self) -> int:
+        """Delete every completed todo; returns how many were removed."""
+        with self._write():
+            cur = self.conn.execute("DELETE FROM todos WHERE done = 1;")
+        return max(cur.rowcount, 0)
+
+    def import_records(
+        self,
+        records: Iterable[TodoRecord | None],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """Bulk-insert records in batched transactions (see `bulk.insert_records`).
+
+        Inside `transaction()` the batches join it instead of committing.
+        """
+        return insert_records(
+            self.conn,
+            records,
+            batch_size=batch_size,
+            progress=progress,
+            write=self._write,
+        )
+
+    def clear(self, *, reset_ids: bool = True) -> None:
+        with self._write():
+            self.conn.execute("DELETE FROM todos;")
+            self.conn.execute("DELETE FROM todo_rank_blocks;")
+            # Readers notice the gap in the log and re-read everything.
+            self.conn.execute("DELETE FROM todo_changes;")
+            if reset_ids:
+                # Reset AUTOINCREMENT counter so ids start from 1 again.
+                # This is SQLite-specific and only applies to tables created with AUTOINCREMENT.
+                self.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'todos';")
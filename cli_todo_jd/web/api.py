@@ -0,0 +1,264 @@
+"""JSON API for the web server (`/api/...`).
+
+Read endpoints carry an `ETag` derived from the database's change counter
+(`TodoStore.current_rev()`), checked before any table is read, so clients
+polling with `If-None-Match` get `304 Not Modified` almost for free.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable
+
+from flask import Flask, Response, jsonify, request
+
+from cli_todo_jd.client import TodoClient, TodoNotFoundError
+from cli_todo_jd.storage.pool import TodoStorePool
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.cache import CachedResponse, ResponseCache
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_OPS = 1000
+
+# Batch operation name -> whether it needs "id" / "item".
+BATCH_OPS = {
+    "add": (False, True),
+    "edit": (True, True),
+    "toggle": (True, False),
+    "done": (True, False),
+    "not-done": (True, False),
+    "delete": (True, False),
+}
+
+
+class _BatchFailed(Exception):
+    """Raised inside a batch transaction to roll it back."""
+
+
+def _error(message: str, status: int) -> Response:
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
+
+
+def _conditional(
+    db: TodoStore,
+    build: Callable[[], Response],
+    cache: ResponseCache,
+    key: Hashable,
+) -> Response:
+    """Answer 304 if the client's ETag is current, otherwise build the body.
+
+    Built bodies are cached under `(key, rev)`; the rev is read in the same
+    snapshot as the body, so an entry always matches its rev.
+    """
+    with db.read_snapshot():
+        rev = db.current_rev()
+        etag = f"rev-{rev}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            cached = cache.get((key, rev))
+            if cached is None:
+                response = build()
+                cached = CachedResponse(
+                    response.get_data(), response.status_code, response.mimetype
+                )
+                cache.put((key, rev), cached)
+            else:
+                response = Response(
+                    cached.body, cached.status, mimetype=cached.mimetype
+                )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _positive_int_arg(name: str, default: int | None = None) -> int | None:
+    """Read a positive integer query parameter; raise ValueError if malformed.
+
+    `request.args.get(..., type=int)` falls back to the default on bad
+    input, which would turn a mistyped `after` cursor into page one.
+    """
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    if not (raw.isascii() and raw.isdigit()) or int(raw) < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return int(raw)
+
+
+def _validate_op(op: object) -> str | None:
+    """Return why a batch operation is malformed, or None if it is fine."""
+    if not isinstance(op, dict):
+        return "operation must be an object"
+    name = op.get("op")
+    if name not in BATCH_OPS:
+        return f"op must be one of: {', '.join(BATCH_OPS)}"
+    needs_id, needs_item = BATCH_OPS[name]
+    if needs_id and (not isinstance(op.get("id"), int) or isinstance(op["id"], bool)):
+        return "id must be an integer"
+    if needs_item:
+        item = op.get("item")
+        if not isinstance(item, str) or not item.strip():
+            return "item must be a non-empty string"
+    return None
+
+
+def _apply_op(client: TodoClient, op: dict) -> dict:
+    """Apply one validated batch operation; return its result entry."""
+    name = op["op"]
+    if name == "add":
+        return {"ok": True, "todo": client.add(op["item"]).to_dict()}
+    todo_id = op["id"]
+    try:
+        if name == "delete":
+            client.remove(todo_id)
+            return {"ok": True, "id": todo_id}
+        if name == "toggle":
+            todo = client.toggle(todo_id)
+        elif name == "edit":
+            todo = client.edit(todo_id, op["item"])
+        else:
+            todo = client.set_done(todo_id, name == "done")
+    except TodoNotFoundError:
+        return _not_found(todo_id)
+    return {"ok": True, "todo": todo.to_dict()}
+
+
+def _not_found(todo_id: int) -> dict:
+    return {"ok": False, "id": todo_id, "error": "todo not found"}
+
+
+def register_api(app: Flask, pool: TodoStorePool, cache: ResponseCache) -> None:
+    """Add the `/api/todos` routes to `app`, using connections from `pool`.
+
+    Read responses are kept in `cache`; write routes clear it.
+    """
+
+    @app.get("/api/todos")
+    def api_list():
+        show = request.args.get("show", "all")
+        if show not in {"open", "done", "all"}:
+            return _error("show must be one of: open, done, all", 400)
+        try:
+            limit = _positive_int_arg("limit", DEFAULT_PAGE_SIZE)
+            after = _positive_int_arg("after")
+        except ValueError as e:
+            return _error(str(e), 400)
+        if limit > MAX_PAGE_SIZE:
+            return _error(f"limit must be between 1 and {MAX_PAGE_SIZE}", 400)
+
+        with pool.connection() as db:
+
+            def build() -> Response:
+                todos = TodoClient(store=db).list_todos(
+                    show=show, limit=limit, after_id=after
+                )
+                next_after = todos[-1].id if len(todos) == limit else None
+                return jsonify(
+                    {
+                        "todos": [todo.to_dict() for todo in todos],
+                        "next_after": next_after,
+                    }
+                )
+
+            return _conditional(db, build, cache, ("list", show, limit, after))
+
+    @app.post("/api/todos")
+    def api_create():
+        data = request.get_json(silent=True)
+        item = data.get("item") if isinstance(data, dict) else None
+        if not isinstance(item, str) or not item.strip():
+            return _error("item must be a non-empty string", 400)
+
+        with pool.connection() as db:
+            todo = TodoClient(store=db).add(item)
+        cache.clear()
+        return jsonify(todo.to_dict()), 201
+
+    @app.get("/api/todos/<int:todo_id>")
+    def api_get(todo_id: int):
+        with pool.connection() as db:
+
+            def build() -> Response:
+                try:
+                    todo = TodoClient(store=db).get(todo_id)
+                except TodoNotFoundError:
+                    return _error("todo not found", 404)
+                return jsonify(todo.to_dict())
+
+            return _conditional(db, build, cache, ("get", todo_id))
+
+    @app.patch("/api/todos/<int:todo_id>")
+    def api_update(todo_id: int):
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return _error("body must be a JSON object", 400)
+        item = data.get("item")
+        done = data.get("done")
+        if item is not None and (not isinstance(item, str) or not item.strip()):
+            return _error("item must be a non-empty string", 400)
+        if done is not None and not isinstance(done, bool):
+            return _error("done must be true or false", 400)
+
+        try:
+            with pool.connection() as db:
+                todo = TodoClient(store=db).update(todo_id, item=item, done=done)
+        except TodoNotFoundError:
+            return _error("todo not found", 404)
+        finally:
+            cache.clear()
+        return jsonify(todo.to_dict())
+
+    @app.delete("/api/todos/<int:todo_id>")
+    def api_delete(todo_id: int):
+        try:
+            with pool.connection() as db:
+                TodoClient(store=db).remove(todo_id)
+        except TodoNotFoundError:
+            return _error("todo not found", 404)
+        cache.clear()
+        return Response(status=204)
+
+    @app.post("/api/batch")
+    def api_batch():
+        """Apply a list of operations atomically.
+
+        Body: `{"ops": [{"op": "add", "item": "..."}, {"op": "toggle", "id": 3},
+        ...]}` with ops add, edit, toggle, done, not-done and delete. Either
+        every operation is applied (200) or none is (400 for a malformed
+        request, 409 if an operation fails, e.g. an unknown id).
+        """
+        data = request.get_json(silent=True)
+        ops = data.get("ops") if isinstance(data, dict) else None
+        if not isinstance(ops, list) or not ops:
+            return _error('body must be {"ops": [...]} with at least one op', 400)
+        if len(ops) > MAX_BATCH_OPS:
+            return _error(f"at most {MAX_BATCH_OPS} ops per batch", 400)
+        for index, op in enumerate(ops):
+            problem = _validate_op(op)
+            if problem is not None:
+                return _error(f"ops[{index}]: {problem}", 400)
+
+        results: list[dict] = []
+        with pool.connection() as db:
+            client = TodoClient(store=db)
+            try:
+                with client.transaction():
+                    for op in ops:
+                        results.append(_apply_op(client, op))
+                        if not results[-1]["ok"]:
+                            raise _BatchFailed
+            except _BatchFailed:
+                response = jsonify(
+                    {
+                        "error": f"ops[{len(results) - 1}] failed; "
+                        "no changes were applied",
+                        "results": results,
+                    }
+                )
+                response.status_code = 409
+                return response
+        cache.clear()
+        return jsonify({"results": results})
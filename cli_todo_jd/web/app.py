@@ -1,28 +1,73 @@
 from __future__ import annotations
 
-import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
-
-from flask import Flask, redirect, render_template, request, url_for
-
-from cli_todo_jd.storage.schema import ensure_schema
-from cli_todo_jd.storage.migrate import migrate_from_json
-
-
-def create_app(db_path: Path) -> Flask:
+from typing import Iterator
+
+from flask import (
+    Flask,
+    Response,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
+
+from cli_todo_jd.client import InvalidTodoError, TodoClient, TodoNotFoundError
+from cli_todo_jd.storage.pool import DEFAULT_POOL_SIZE, TodoStorePool
+from cli_todo_jd.web.api import register_api
+from cli_todo_jd.web.cache import DEFAULT_CACHE_SIZE, CachedResponse, ResponseCache
+from cli_todo_jd.web.events import ChangeBroadcaster
+from cli_todo_jd.web.metrics import WebMetrics, register_metrics
+
+# Maximum number of ranked results shown for a `?q=` search.
+SEARCH_LIMIT = 100
+
+
+def create_app(
+    db_path: Path,
+    *,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    cached_statements: int = 128,
+    events_interval: float = 0.5,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    max_event_streams: int | None = None,
+    metrics: bool = True,
+) -> Flask:
     app = Flask(__name__)
     app.config["TODO_DB_PATH"] = str(db_path)
-
-    def _connect() -> sqlite3.Connection:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        ensure_schema(conn)
-        return conn
-
-    # Optional one-time JSON migration (mirrors CLI behavior)
-    json_path = db_path.with_suffix(".json")
-    if json_path.exists() and db_path.suffix == ".db":
-        migrate_from_json(json_path=json_path, db_path=db_path, backup=True)
+    app.config["TODO_POOL_SIZE"] = pool_size
+
+    web_metrics = WebMetrics() if metrics else None
+
+    # Connections are reused across requests rather than opened per request;
+    # up to `pool_size` requests talk to SQLite at once.
+    pool = TodoStorePool(
+        db_path,
+        size=pool_size,
+        cached_statements=cached_statements,
+        factory=None if web_metrics is None else web_metrics.connection_class(),
+    )
+    app.extensions["todo_pool"] = pool
+
+    @contextmanager
+    def _client() -> Iterator[TodoClient]:
+        with pool.connection() as db:
+            yield TodoClient(store=db)
+
+    # Rendered pages and API reads, keyed by request and change rev.
+    cache = ResponseCache(cache_size)
+    app.extensions["todo_cache"] = cache
+
+    # One watcher per app feeds every open `/events` stream.
+    broadcaster = ChangeBroadcaster(
+        db_path, interval=events_interval, max_streams=max_event_streams
+    )
+    app.extensions["todo_events"] = broadcaster
+
+    # Open eagerly so the JSON migration and schema checks run once, at startup.
+    pool.open()
 
     @app.get("/")
     def index():
@@ -30,77 +75,99 @@ def create_app(db_path: Path) -> Flask:
         if show not in {"open", "done", "all"}:
             show = "open"
 
-        with _connect() as conn:
-            if show == "open":
-                todos = conn.execute(
-                    "SELECT id, item, done, created_at, done_at FROM todos WHERE done = ? ORDER BY id DESC",
-                    (0,),
-                ).fetchall()
-            elif show == "done":
-                todos = conn.execute(
-                    "SELECT id, item, done, created_at, done_at FROM todos WHERE done = ? ORDER BY id DESC",
-                    (1,),
-                ).fetchall()
-            else:
-                todos = conn.execute(
-                    "SELECT id, item, done, created_at, done_at FROM todos ORDER BY id DESC"
-                ).fetchall()
-
-        return render_template("index.html", todos=todos, show=show)
+        q = (request.args.get("q") or "").strip()
+
+        with _client() as client:
+            db = client.store
+            cached = cache.get(("index", show, q, db.current_rev()))
+            if cached is None:
+                with db.read_snapshot():
+                    rev = db.change_rev()
+                    if q:
+                        todos = client.search(q, show=show, limit=SEARCH_LIMIT)
+                    else:
+                        todos = client.list_todos(show=show, descending=True)
+
+        if cached is None:
+            html = render_template("index.html", todos=todos, show=show, q=q, rev=rev)
+            cached = CachedResponse(html.encode(), 200, "text/html")
+            cache.put(("index", show, q, rev), cached)
+        return Response(cached.body, cached.status, mimetype=cached.mimetype)
+
+    @app.get("/events")
+    def events():
+        """Stream todo changes to the page as Server-Sent Events."""
+        if not broadcaster.has_capacity():
+            # EventSource gives up on a 503, so the page simply stays static.
+            return Response(
+                "Too many live-update streams.\n",
+                status=503,
+                mimetype="text/plain",
+                headers={"Retry-After": "30"},
+            )
+        return Response(
+            stream_with_context(broadcaster.stream()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.post("/add")
     def add():
-        item = (request.form.get("item") or "").strip()
-        if item:
-            with _connect() as conn:
-                with conn:
-                    conn.execute("INSERT INTO todos(item, done) VALUES (?, 0)", (item,))
+        try:
+            with _client() as client:
+                client.add(request.form.get("item") or "")
+        except InvalidTodoError:
+            pass  # blank input; nothing to add
+        else:
+            cache.clear()
         return redirect(url_for("index"))
 
     @app.post("/toggle/<int:todo_id>")
     def toggle(todo_id: int):
-        with _connect() as conn:
-            row = conn.execute(
-                "SELECT done FROM todos WHERE id = ?", (todo_id,)
-            ).fetchone()
-            if row is not None:
-                new_done = 0 if row["done"] else 1
-                with conn:
-                    if new_done:
-                        conn.execute(
-                            "UPDATE todos SET done = 1, done_at = datetime('now') WHERE id = ?",
-                            (todo_id,),
-                        )
-                    else:
-                        conn.execute(
-                            "UPDATE todos SET done = 0, done_at = NULL WHERE id = ?",
-                            (todo_id,),
-                        )
+        try:
+            with _client() as client:
+                client.toggle(todo_id)
+        except TodoNotFoundError:
+            pass  # already deleted, e.g. in another tab
+        cache.clear()
         return redirect(url_for("index"))
 
     @app.post("/delete/<int:todo_id>")
     def delete(todo_id: int):
-        with _connect() as conn:
-            with conn:
-                conn.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
+        try:
+            with _client() as client:
+                client.remove(todo_id)
+        except TodoNotFoundError:
+            pass
+        cache.clear()
         return redirect(url_for("index"))
 
     @app.post("/clear")
     def clear():
         if request.form.get("confirm") == "yes":
-            with _connect() as conn:
-                with conn:
-                    conn.execute("DELETE FROM todos")
+            with _client() as client:
+                client.clear(reset_ids=False)
+            cache.clear()
         return redirect(url_for("index"))
 
+    register_api(app, pool, cache)
+    if web_metrics is not None:
+        app.extensions["todo_metrics"] = web_metrics
+        register_metrics(app, pool, web_metrics)
+
     return app
 
 
 def run_web(
-    db_path: Path, host: str = "127.0.0.1", port: int = 8000, debug: bool = False
+    db_path: Path,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    debug: bool = False,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    cache_size: int = DEFAULT_CACHE_SIZE,
 ) -> None:
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    app = create_app(db_path)
+    app = create_app(db_path, pool_size=pool_size, cache_size=cache_size)
     app.run(host=host, port=port, debug=debug)
@@ -0,0 +1,79 @@
+"""In-process cache of rendered responses for the web server.
+
+Entries are keyed by the request's parameters plus the database change
+rev (`TodoStore.current_rev()`), so a write anywhere - this server, the
+CLI, another process - makes older entries unreachable. Write routes also
+`clear()` the cache so stale entries do not occupy slots until evicted.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    status: int
+    mimetype: str
+
+
+class ResponseCache:
+    """A thread-safe LRU cache with hit/miss counters.
+
+    Parameters
+    ----------
+    size:
+        Maximum number of entries; 0 disables caching.
+    """
+
+    def __init__(self, size: int = DEFAULT_CACHE_SIZE):
+        if size < 0:
+            raise ValueError("size must not be negative")
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        if not self.size:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Return the counters and current size, e.g. for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
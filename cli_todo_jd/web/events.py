@@ -0,0 +1,217 @@
+"""Live change notifications for the web UI (`/events`, Server-Sent Events).
+
+One watcher thread per app polls the database cheaply (`PRAGMA
+data_version` plus this connection's change count), reads the todos that
+changed from the `todo_changes` log, and fans the result out to every
+connected client. Open tabs never query SQLite themselves.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+from cli_todo_jd.output import todo_to_dict
+from cli_todo_jd.storage.store import TodoStore
+
+# More changed todos than this in one poll tells clients to reload instead.
+MAX_EVENT_CHANGES = 500
+# Events a slow client may fall behind by before it is told to reload.
+SUBSCRIBER_BACKLOG = 100
+# Seconds between keep-alive comments on an idle stream.
+KEEPALIVE_SECONDS = 15.0
+# Longest wait between change checks while the database keeps failing.
+MAX_RETRY_SECONDS = 5.0
+
+
+class ChangeBroadcaster:
+    """Watch a todo database and publish change events to subscribers.
+
+    The watcher thread starts with the first subscriber and stops shortly
+    after the last one leaves.
+
+    Parameters
+    ----------
+    db_path:
+        Path to the SQLite file.
+    interval:
+        Seconds between change checks.
+    max_streams:
+        Soft limit on concurrent streams, or None for no limit. Each open
+        stream holds a server thread, so threaded servers should leave some
+        threads for ordinary requests.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        *,
+        interval: float = 0.5,
+        max_streams: int | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.interval = interval
+        self.max_streams = max_streams
+        self._closed = False
+        self._lock = threading.Lock()
+        self._subscribers: set[queue.Queue] = set()
+        self._thread: threading.Thread | None = None
+        self._rev = 0
+
+    def subscribe(self) -> tuple[queue.Queue, int]:
+        """Register a client.
+
+        Returns
+        -------
+        tuple[queue.Queue, int]
+            The queue events are delivered to, and the change rev they
+            start after. Every later change arrives on the queue.
+        """
+        subscription: queue.Queue = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        with self._lock:
+            if self._thread is None:
+                # Read the starting point here, not in the thread, so the
+                # returned rev is exactly where this client's events begin.
+                store = TodoStore(self.db_path, check_same_thread=False)
+                version = store.version()
+                self._rev = store.change_rev()
+                self._thread = threading.Thread(
+                    target=self._watch,
+                    args=(store, version),
+                    name="todo-change-watcher",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._subscribers.add(subscription)
+            return subscription, self._rev
+
+    def unsubscribe(self, subscription: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def has_capacity(self) -> bool:
+        """Return whether another stream may be opened."""
+        with self._lock:
+            if self._closed:
+                return False
+            return self.max_streams is None or len(self._subscribers) < self.max_streams
+
+    def close(self) -> None:
+        """End every open stream, e.g. on server shutdown."""
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            _drain(subscription)
+            subscription.put_nowait(None)
+
+    def stream(self) -> Iterator[str]:
+        """Yield the SSE stream for one client.
+
+        The first event is `hello` with the rev the stream starts after;
+        each later `changes` event carries the rows written since the
+        previous one.
+        """
+        subscription, rev = self.subscribe()
+        try:
+            yield "retry: 2000\n\n"
+            yield _format_event("hello", {"rev": rev})
+            while not self._closed:
+                try:
+                    event = subscription.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield _format_event("changes", event)
+        finally:
+            self.unsubscribe(subscription)
+
+    def _publish(self, event: dict) -> None:
+        # Advance the rev and pick the recipients atomically, so a client
+        # subscribing concurrently either receives this event or starts
+        # after it.
+        with self._lock:
+            self._rev = event["rev"]
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # The client fell behind; drop its backlog and have it reload.
+                _drain(subscription)
+                subscription.put_nowait({"rev": event["rev"], "reload": True})
+
+    def _watch(self, store: TodoStore, version: tuple[int, int]) -> None:
+        try:
+            rev = self._rev
+            delay = self.interval
+            while True:
+                time.sleep(delay)
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+
+                try:
+                    current = store.version()
+                    event = (
+                        None if current == version else self._read_changes(store, rev)
+                    )
+                except sqlite3.Error:
+                    # Busy, locked or failing database: keep the old version
+                    # and rev so the same changes are read once it recovers,
+                    # and check less often until then.
+                    delay = min(delay * 2, max(MAX_RETRY_SECONDS, self.interval))
+                    continue
+                delay = self.interval
+                version = current
+                if event is not None:
+                    rev = event["rev"]
+                    self._publish(event)
+        finally:
+            with self._lock:
+                # Let the next subscriber start a new watcher if this one died.
+                if self._thread is threading.current_thread():
+                    self._thread = None
+            store.close()
+
+    @staticmethod
+    def _read_changes(store: TodoStore, rev: int) -> dict | None:
+        with store.read_snapshot():
+            new_rev = store.change_rev()
+            if new_rev == rev:
+                return None
+            changed_ids = store.changed_ids_since(rev, limit=MAX_EVENT_CHANGES)
+            if changed_ids is None:
+                return {"rev": new_rev, "reload": True}
+            rows = store.iter_changed_since(rev).fetchall()
+        present = {row["id"] for row in rows}
+        return {
+            "rev": new_rev,
+            "changed": [todo_to_dict(row) for row in rows],
+            "deleted": [todo_id for todo_id in changed_ids if todo_id not in present],
+        }
+
+
+def _format_event(name: str, data: dict) -> str:
+    event_id = f"id: {data['rev']}\n" if "rev" in data else ""
+    return f"{event_id}event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+def _drain(subscription: queue.Queue) -> None:
+    while True:
+        try:
+            subscription.get_nowait()
+        except queue.Empty:
+            return
@@ -0,0 +1,292 @@
+"""Prometheus metrics for the web server (`GET /metrics`).
+
+Request timing comes from `before_request`/`teardown_request` hooks and
+SQL timing from a connection subclass used by the app's pool, so nothing
+in the routes changes. Recording is a `perf_counter()` pair, a bisect and
+a locked increment. Row counts are only re-counted when the database has
+changed since the previous scrape. The text format is written by hand; no
+client library is needed.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Iterable
+
+from flask import Flask, Response, g, request
+
+from cli_todo_jd.profiling import normalize_sql, timed_connection_class
+from cli_todo_jd.storage.pool import TodoStorePool
+
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25, 1.0)
+# Statement labels are cut to this length to keep series names readable.
+MAX_STATEMENT_LABEL = 120
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# SQLITE_BUSY and SQLITE_LOCKED; extended codes such as SQLITE_BUSY_SNAPSHOT
+# keep the primary code in their low byte.
+_BUSY_CODES = {5, 6}
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in _BUSY_CODES
+    # Before Python 3.11 the exception carries only the message.
+    message = str(exc)
+    return "database is locked" in message or "database table is locked" in message
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """A labelled histogram with fixed upper bounds (in seconds)."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # Label values -> [per-bucket counts..., +Inf count, sum].
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _labels(self.label_names, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            cumulative += series[len(self.buckets)]
+            le = _labels(self.label_names, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{le} {cumulative}"
+            plain = _labels(self.label_names, labels)
+            yield f"{self.name}_sum{plain} {series[-1]}"
+            yield f"{self.name}_count{plain} {cumulative}"
+
+
+class Counter:
+    """A labelled, monotonically increasing counter."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple, int] = {}
+
+    def inc(self, labels: tuple = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {value}"
+
+
+def _gauge(name: str, help: str, samples: Iterable[tuple[str, float]]) -> list[str]:
+    """Render a gauge from `(label string, value)` samples."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{labels} {value}" for labels, value in samples]
+    return lines
+
+
+class WebMetrics:
+    """Metrics for one web app; see `register_metrics`."""
+
+    def __init__(self):
+        self.requests = Histogram(
+            "todo_http_request_duration_seconds",
+            "Time to produce a response, by route.",
+            ("method", "route", "status"),
+            REQUEST_BUCKETS,
+        )
+        self.statements = Histogram(
+            "todo_sqlite_statement_duration_seconds",
+            "Time SQLite took to run a statement (up to its first row).",
+            ("statement",),
+            SQL_BUCKETS,
+        )
+        self.busy = Counter(
+            "todo_sqlite_busy_total",
+            "Statements that failed with SQLITE_BUSY/LOCKED after the busy "
+            "timeout's retries ran out.",
+            ("statement",),
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        # (rev, {done: count}) from the last scrape.
+        self._row_counts: tuple[int, dict[int, int]] | None = None
+
+    def connection_class(self) -> type[sqlite3.Connection]:
+        """Return a `sqlite3.Connection` subclass that times into this object."""
+        return timed_connection_class(self.time_statement)
+
+    def time_statement(self, sql: str, call: Callable, *args):
+        started = perf_counter()
+        try:
+            return call(*args)
+        except sqlite3.OperationalError as e:
+            if _is_busy(e):
+                self.busy.inc((self._statement_label(sql),))
+            raise
+        finally:
+            self.statements.observe(
+                (self._statement_label(sql),), perf_counter() - started
+            )
+
+    @staticmethod
+    def _statement_label(sql: str) -> str:
+        return normalize_sql(sql)[:MAX_STATEMENT_LABEL]
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+        self.requests.observe((method, route, status), seconds)
+
+    def row_counts(self, pool: TodoStorePool) -> dict[int, int]:
+        with pool.connection() as db:
+            rev = db.current_rev()
+            cached = self._row_counts
+            if cached is not None and cached[0] == rev:
+                return cached[1]
+            counts = {0: 0, 1: 0}
+            with db.read_snapshot():
+                rev = db.change_rev()
+                for done, count in db.conn.execute(
+                    "SELECT done, COUNT(*) FROM todos GROUP BY done;"
+                ):
+                    counts[int(done)] = count
+        self._row_counts = (rev, counts)
+        return counts
+
+    def render(self, app: Flask, pool: TodoStorePool) -> str:
+        lines: list[str] = []
+        lines += self.requests.render()
+        lines += _gauge(
+            "todo_http_requests_in_flight",
+            "Requests currently being handled.",
+            [("", self.in_flight)],
+        )
+        lines += self.statements.render()
+        lines += self.busy.render()
+
+        counts = self.row_counts(pool)
+        lines += _gauge(
+            "todo_todos",
+            "Todos in the database, by done state.",
+            [('{done="false"}', counts[0]), ('{done="true"}', counts[1])],
+        )
+        db_path = str(pool.db_path)
+        lines += _gauge(
+            "todo_sqlite_file_bytes",
+            "Size of the database file and its write-ahead log.",
+            [
+                ('{file="db"}', _file_size(db_path)),
+                ('{file="wal"}', _file_size(db_path + "-wal")),
+            ],
+        )
+
+        cache = app.extensions.get("todo_cache")
+        if cache is not None:
+            stats = cache.stats()
+            for key in ("hits", "misses", "evictions"):
+                lines += [
+                    f"# HELP todo_response_cache_{key}_total Response cache {key}.",
+                    f"# TYPE todo_response_cache_{key}_total counter",
+                    f"todo_response_cache_{key}_total {stats[key]}",
+                ]
+            lines += _gauge(
+                "todo_response_cache_entries",
+                "Responses currently cached.",
+                [("", stats["size"])],
+            )
+
+        events = app.extensions.get("todo_events")
+        if events is not None:
+            lines += _gauge(
+                "todo_event_streams",
+                "Open /events live-update streams.",
+                [("", events.subscriber_count())],
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def register_metrics(app: Flask, pool: TodoStorePool, metrics: WebMetrics) -> None:
+    """Time every request into `metrics` and serve them at `/metrics`.
+
+    `pool` should have been created with `metrics.connection_class()` for
+    per-statement timings; it is also used for the row counts.
+    """
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = perf_counter()
+        g.metrics_status = 500
+        metrics.request_started()
+
+    @app.after_request
+    def _record_status(response: Response) -> Response:
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _stop_timer(exc):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        rule = request.url_rule
+        metrics.request_finished(
+            rule.rule if rule is not None else "unmatched",
+            request.method,
+            g.pop("metrics_status", 500),
+            perf_counter() - started,
+        )
+
+    @app.get("/metrics")
+    def prometheus_metrics():
+        return Response(metrics.render(app, pool), content_type=CONTENT_TYPE)
@@ -0,0 +1,142 @@
+"""Production serving for the web UI with waitress (`todo web --production`).
+
+waitress is a pure-Python, thread-pooled WSGI server. It is an optional
+dependency (`pip install "cli-todo-jd[serve]"`) and is only imported here.
+With `workers > 1` the listening socket is opened once and shared by forked
+worker processes, each running its own thread pool, connection pool and
+response cache.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import traceback
+from pathlib import Path
+
+from cli_todo_jd.storage.pool import DEFAULT_POOL_SIZE
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.cache import DEFAULT_CACHE_SIZE
+
+DEFAULT_WORKERS = 1
+DEFAULT_THREADS = 8
+# Open connections (active or waiting for a thread) per worker.
+DEFAULT_CONNECTION_LIMIT = 100
+# Connections the OS may queue before a worker accepts them.
+DEFAULT_BACKLOG = 1024
+# Seconds an idle keep-alive connection stays open.
+DEFAULT_KEEP_ALIVE = 120
+
+
+def serve(
+    db_path: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = DEFAULT_WORKERS,
+    threads: int = DEFAULT_THREADS,
+    connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+    backlog: int = DEFAULT_BACKLOG,
+    keep_alive: int = DEFAULT_KEEP_ALIVE,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> None:
+    """Serve the web UI until SIGINT or SIGTERM, then shut down gracefully.
+
+    On shutdown each worker stops accepting connections, ends open
+    live-update streams and gives in-flight requests a few seconds to
+    finish.
+
+    Raises
+    ------
+    ImportError
+        If waitress is not installed.
+    ValueError
+        If `workers > 1` on a platform without `os.fork`.
+    """
+    import waitress  # noqa: F401  # fail before binding the port
+
+    if workers < 1 or threads < 1:
+        raise ValueError("workers and threads must be at least 1")
+    if workers > 1 and not hasattr(os, "fork"):
+        raise ValueError("workers > 1 needs os.fork, which this platform lacks")
+
+    # Create or migrate the schema once, before any worker opens the file.
+    with TodoStore(Path(db_path)) as store:
+        store.open()
+
+    sock = socket.create_server((host, port), backlog=backlog)
+    options = {
+        "threads": threads,
+        "connection_limit": connection_limit,
+        "backlog": backlog,
+        "channel_timeout": keep_alive,
+        "ident": "cli-todo-jd",
+    }
+    app_options = {
+        "pool_size": pool_size,
+        "cache_size": cache_size,
+        # Keep at least half the threads free of long-lived event streams.
+        "max_event_streams": max(threads // 2, 1),
+    }
+    print(f"Serving on http://{host}:{port} ({workers} x {threads} threads)")
+
+    if workers == 1:
+        _run_worker(sock, db_path, options, app_options)
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(sock, db_path, options, app_options)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            os._exit(code)
+        children.append(pid)
+    sock.close()
+    _supervise(children)
+
+
+def _run_worker(
+    sock: socket.socket, db_path: Path, options: dict, app_options: dict
+) -> None:
+    from waitress.server import create_server
+
+    from cli_todo_jd.web.app import create_app
+
+    app = create_app(db_path, **app_options)
+    server = create_server(app, sockets=[sock], **options)
+
+    def stop(signum, frame):
+        # Free the threads held by event streams, then let waitress drain.
+        app.extensions["todo_events"].close()
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        # Returns after shutting the thread pool down on SystemExit.
+        server.run()
+    finally:
+        app.extensions["todo_pool"].close()
+
+
+def _supervise(children: list[int]) -> None:
+    """Wait for the workers, forwarding SIGINT/SIGTERM to them as SIGTERM."""
+
+    def forward(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for pid in children:
+        os.waitpid(pid, 0)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.main import TodoApp
+from cli_todo_jd.web.app import create_app
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "todos.db"
+
+
+@pytest.fixture
+def app(db_path):
+    # Quiet: status lines off, errors to stderr.
+    with TodoApp(db_path, verbose=False) as app:
+        yield app
+
+
+@pytest.fixture
+def web_app(db_path):
+    app = create_app(db_path, pool_size=2, metrics=False)
+    yield app
+    app.extensions["todo_pool"].close()
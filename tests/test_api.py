@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.storage.store import TodoStore
+
+
+@pytest.fixture
+def client(web_app):
+    with web_app.test_client() as client:
+        yield client
+
+
+def _items(client):
+    response = client.get("/api/todos?show=all")
+    assert response.status_code == 200
+    return [(todo["id"], todo["item"], todo["done"]) for todo in response.json["todos"]]
+
+
+def test_batch_applies_every_op(client):
+    client.post("/api/todos", json={"item": "existing"})
+    response = client.post(
+        "/api/batch",
+        json={
+            "ops": [
+                {"op": "add", "item": "second"},
+                {"op": "toggle", "id": 1},
+                {"op": "edit", "id": 2, "item": "second, edited"},
+                {"op": "add", "item": "third"},
+                {"op": "delete", "id": 3},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert [result["ok"] for result in response.json["results"]] == [True] * 5
+    assert _items(client) == [(1, "existing", True), (2, "second, edited", False)]
+
+
+def test_batch_rolls_back_on_failure(client):
+    client.post("/api/todos", json={"item": "existing"})
+    before = client.get("/api/todos?show=all")
+
+    response = client.post(
+        "/api/batch",
+        json={
+            "ops": [
+                {"op": "add", "item": "never saved"},
+                {"op": "toggle", "id": 1},
+                {"op": "delete", "id": 999},
+                {"op": "add", "item": "not reached"},
+            ]
+        },
+    )
+    assert response.status_code == 409
+    assert response.json["error"] == "ops[2] failed; no changes were applied"
+    assert [result["ok"] for result in response.json["results"]] == [
+        True,
+        True,
+        False,
+    ]
+
+    assert _items(client) == [(1, "existing", False)]
+    # Nothing was written, so the ETag is unchanged.
+    again = client.get(
+        "/api/todos?show=all", headers={"If-None-Match": before.headers["ETag"]}
+    )
+    assert again.status_code == 304
+    # The rolled-back add did not use up an id.
+    assert client.post("/api/todos", json={"item": "next"}).json["id"] == 2
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        None,
+        {},
+        {"ops": []},
+        {"ops": [{"op": "launch"}]},
+        {"ops": [{"op": "add", "item": "ok"}, {"op": "toggle", "id": "1"}]},
+        {"ops": [{"op": "done", "id": True}]},
+        {"ops": [{"op": "edit", "id": 1, "item": "  "}]},
+        {"ops": [{"op": "add", "item": "x"}] * 1001},
+    ],
+)
+def test_batch_rejects_malformed_requests(client, body):
+    response = client.post("/api/batch", json=body)
+    assert response.status_code == 400
+    assert _items(client) == []
+
+
+def test_list_pages_with_after(client):
+    for i in range(5):
+        client.post("/api/todos", json={"item": f"todo {i}"})
+    first = client.get("/api/todos?limit=2").json
+    assert [t["id"] for t in first["todos"]] == [1, 2]
+    assert first["next_after"] == 2
+    last = client.get("/api/todos?limit=2&after=4").json
+    assert ([t["id"] for t in last["todos"]], last["next_after"]) == ([5], None)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "limit=0",
+        "limit=-1",
+        "limit=abc",
+        "limit=1.5",
+        "limit=1001",
+        "after=0",
+        "after=x",
+        "after=",
+        "show=later",
+    ],
+)
+def test_list_rejects_bad_parameters(client, query):
+    response = client.get(f"/api/todos?{query}")
+    assert response.status_code == 400
+    assert "error" in response.json
+
+
+def test_etag_until_the_database_changes(client, db_path):
+    client.post("/api/todos", json={"item": "a"})
+    for url in ("/api/todos", "/api/todos/1"):
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+        again = client.get(url, headers={"If-None-Match": etag})
+        assert (again.status_code, again.data) == (304, b"")
+        assert again.headers["ETag"] == etag
+
+    # A write through the API changes the tag.
+    client.patch("/api/todos/1", json={"done": True})
+    changed = client.get("/api/todos/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json["done"] is True
+
+    # So does a write from another connection, e.g. the CLI.
+    etag = changed.headers["ETag"]
+    with TodoStore(db_path) as store:
+        store.set_item(1, "edited elsewhere")
+    changed = client.get("/api/todos/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json["item"] == "edited elsewhere"
+
+
+def test_missing_todo_is_404_with_etag(client):
+    response = client.get("/api/todos/7")
+    assert response.status_code == 404
+    etag = response.headers["ETag"]
+    again = client.get("/api/todos/7", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    client.post("/api/todos", json={"item": "a"})
+    again = client.get("/api/todos/7", headers={"If-None-Match": etag})
+    assert again.status_code == 404
+    assert again.headers["ETag"] != etag
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from cli_todo_jd.client import (
+    InvalidTodoError,
+    StorageError,
+    Todo,
+    TodoClient,
+    TodoError,
+    TodoNotFoundError,
+)
+
+
+@pytest.fixture
+def client(db_path):
+    with TodoClient(db_path) as client:
+        yield client
+
+
+def test_add_returns_a_todo(client):
+    todo = client.add("  write tests  ")
+    assert isinstance(todo, Todo)
+    assert (todo.id, todo.item, todo.done, todo.done_at) == (
+        1,
+        "write tests",
+        False,
+        None,
+    )
+    assert todo.created_at
+    # Unpacks like a row and indexes like sqlite3.Row.
+    todo_id, item, done, _, _ = todo
+    assert (todo_id, item, done) == (1, "write tests", False)
+    assert todo["item"] == todo[1] == "write tests"
+    with pytest.raises(KeyError):
+        todo["missing"]
+    assert todo.to_dict() == {
+        "id": 1,
+        "item": "write tests",
+        "done": False,
+        "created_at": todo.created_at,
+        "done_at": None,
+    }
+
+
+def test_updates_return_the_new_state(client):
+    todo = client.add("a")
+    done = client.mark_done(todo.id)
+    assert done.done and done.done_at
+    assert client.toggle(todo.id).done is False
+    assert client.set_done(todo.id, True).done is True
+    assert client.mark_not_done(todo.id).done_at is None
+    assert client.edit(todo.id, "b").item == "b"
+    updated = client.update(todo.id, item="c", done=True)
+    assert (updated.item, updated.done) == ("c", True)
+    assert client.remove(todo.id) == updated
+    assert client.is_empty()
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda c: c.get(99),
+        lambda c: c.get_at_index(5),
+        lambda c: c.update(99, done=True),
+        lambda c: c.edit(99, "x"),
+        lambda c: c.mark_done(99),
+        lambda c: c.toggle(99),
+        lambda c: c.remove(99),
+    ],
+)
+def test_missing_todos_raise_not_found(client, call):
+    client.add("only")
+    with pytest.raises(TodoNotFoundError) as excinfo:
+        call(client)
+    assert isinstance(excinfo.value, (TodoError, LookupError))
+    assert excinfo.value.todo_id in (99, 5)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda c: c.add(""),
+        lambda c: c.add("   "),
+        lambda c: c.add(None),
+        lambda c: c.edit(1, " "),
+        lambda c: c.list_todos(show="later"),
+        lambda c: c.search("x", show="nope"),
+        lambda c: c.import_lines(["item\n", "x" * 200_000 + "\n"], "csv"),
+    ],
+)
+def test_bad_arguments_raise_invalid(client, call):
+    client.add("only")
+    with pytest.raises(InvalidTodoError) as excinfo:
+        call(client)
+    assert isinstance(excinfo.value, (TodoError, ValueError))
+    assert [t.item for t in client.iter_todos()] == ["only"]
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda c: c.get(1),
+        lambda c: list(c.iter_todos()),
+        lambda c: c.add("b"),
+        lambda c: c.remove_many([1]),
+    ],
+)
+def test_database_errors_raise_storage_error(client, call):
+    client.add("a")
+    client.store.conn.execute("DROP TABLE todos;")
+    with pytest.raises(StorageError) as excinfo:
+        call(client)
+    assert isinstance(excinfo.value, TodoError)
+    assert isinstance(excinfo.value.__cause__, sqlite3.Error)
+
+
+def test_reads(client):
+    for i in range(1, 8):
+        client.add(f"todo {i}")
+    client.set_done_many([2, 4, 6, 99], True)
+
+    assert client.count() == 7
+    assert client.max_id() == 7
+    assert client.get_at_index(3) == client.get(3)
+    assert [t.id for t in client.iter_todos(show="done")] == [2, 4, 6]
+    assert [t.id for t in client.list_todos(show="open", limit=2)] == [1, 3]
+    assert [t.id for t in client.iter_todos(after_id=5)] == [6, 7]
+    assert [t.id for t in client.iter_todos(before_id=3, descending=True)] == [2, 1]
+    assert [t.id for t in client.iter_snapshot(since_id=4, show="open")] == [5, 7]
+    assert all(isinstance(t, Todo) for t in client.search("todo"))
+
+
+def test_bulk_writes_return_counts(client):
+    for i in range(10):
+        client.add(f"todo {i}")
+    assert client.set_done_ranges([(8, 20), (1, 2), (2, 3)], True) == 6
+    assert client.set_done_many([1, 1, 50], False) == 1
+    assert client.remove_ranges([(9, 9), (10, 1000)]) == 2
+    assert client.remove_many([7, 7]) == 1
+    assert client.set_done_all(True) == 4
+    assert client.remove_done() == 7
+    assert client.count() == 0
+
+
+def test_transaction_rolls_back_as_a_unit(client):
+    client.add("kept")
+    with pytest.raises(TodoNotFoundError):
+        with client.transaction():
+            client.add("discarded")
+            client.mark_done(1)
+            client.remove(42)
+    assert [(t.item, t.done) for t in client.iter_todos()] == [("kept", False)]
+
+    with client.transaction():
+        client.add("second")
+        client.clear(reset_ids=False)
+        third = client.add("third")
+    assert third.id == 3
+    assert [t.item for t in client.iter_todos()] == ["third"]
+
+
+def test_version_changes_on_write(client):
+    before = client.version()
+    assert client.version() == before
+    client.add("a")
+    assert client.version() != before
+
+
+def test_borrowed_store_is_not_closed(db_path):
+    with TodoClient(db_path) as owner:
+        with TodoClient(store=owner.store) as borrower:
+            borrower.add("via borrower")
+        assert owner.get(1).item == "via borrower"
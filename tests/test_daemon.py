@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+from cli_todo_jd.daemon import client
+from cli_todo_jd.daemon.server import _text_stream
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def runtime_dir(monkeypatch):
+    # Short, private socket directory (Unix socket paths are length-limited).
+    path = tempfile.mkdtemp(prefix="todo-test-")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", path)
+    for name in ("TODO_TRACE", "TODO_TRACE_JSON", "NO_COLOR"):
+        monkeypatch.delenv(name, raising=False)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+# The `todo` console script, so usage messages name the same program.
+_LAUNCHER = (
+    "import sys; sys.argv[0] = 'todo'; "
+    "from cli_todo_jd.cli.launcher import main; main()"
+)
+
+
+def _todo(*args, env=None):
+    return subprocess.run(
+        [sys.executable, "-c", _LAUNCHER, *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env=env,
+    )
+
+
+@pytest.fixture
+def daemon(runtime_dir, db_path):
+    process = subprocess.Popen(
+        [sys.executable, "-c", _LAUNCHER, "daemon", "-f", db_path],
+        stdout=subprocess.DEVNULL,
+    )
+    path = client.socket_path(db_path)
+    deadline = time.monotonic() + 30
+    while not os.path.exists(path):
+        assert process.poll() is None, "daemon exited"
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    yield process
+    process.terminate()
+    process.wait(timeout=30)
+
+
+def _forward(argv, capfd):
+    code = client.forward(argv)
+    out, err = capfd.readouterr()
+    return code, out, err
+
+
+def test_runs_locally_without_a_daemon(runtime_dir, db_path, capfd):
+    argv = ["add", "local", "-f", str(db_path), "--format", "jsonl"]
+    assert _forward(argv, capfd) == (None, "", "")
+
+    result = _todo(*argv)
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["item"] == "local"
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["help"],
+        ["add", "x", "--help"],
+        ["list", "--pager"],
+        ["clear"],
+        ["export"],
+    ],
+)
+def test_commands_that_stay_local(argv):
+    assert not client._should_forward(argv)
+
+
+def test_forwards_to_the_daemon(daemon, db_path, capfd):
+    db = str(db_path)
+    code, out, err = _forward(
+        ["add", "via daemon", "-f", db, "--format", "jsonl"], capfd
+    )
+    assert (code, err) == (0, "")
+    assert json.loads(out)["item"] == "via daemon"
+
+    code, out, err = _forward(["list", "-f", db, "--format", "jsonl"], capfd)
+    assert code == 0
+    assert [json.loads(line)["item"] for line in out.splitlines()] == ["via daemon"]
+
+    # Another database is not served by this daemon.
+    other = str(db_path.with_name("other.db"))
+    assert _forward(["list", "-f", other], capfd) == (None, "", "")
+
+
+def test_matches_a_local_run(daemon, db_path, runtime_dir, tmp_path):
+    db = str(db_path)
+    assert _todo("add", "first", "-f", db).returncode == 0
+    local_env = {**os.environ, "XDG_RUNTIME_DIR": str(tmp_path)}
+    for argv in (
+        ["list", "-f", db, "--format", "jsonl"],
+        ["remove", "99", "-f", db, "--format", "jsonl"],
+        ["done", "abc", "-f", db],
+        ["search", "fir", "-f", db, "--format", "tsv"],
+    ):
+        forwarded = _todo(*argv)
+        local = _todo(*argv, env=local_env)
+        assert (forwarded.returncode, forwarded.stdout, forwarded.stderr) == (
+            local.returncode,
+            local.stdout,
+            local.stderr,
+        ), argv
+
+    result = _todo("remove", "99", "-f", db, "--format", "jsonl")
+    assert (result.returncode, result.stdout) == (1, "")
+    assert result.stderr == "Error: Invalid todo id.\n"
+    assert _todo("done", "abc", "-f", db).returncode == 2
+
+
+def test_stderr_is_sent_unbuffered():
+    server, peer = socket.socketpair()
+    with server, peer:
+        stream = _text_stream(server, b"e", None)
+        print("Error: Invalid todo id.", file=stream)
+        peer.settimeout(5)
+        received = b""
+        while received != b"Error: Invalid todo id.\n":
+            kind, payload = client.recv_frame(peer)
+            assert kind == b"e"
+            received += payload
+
+
+def test_declined_request_falls_back(daemon, db_path, capfd, monkeypatch):
+    monkeypatch.setattr(client, "PROTOCOL_VERSION", client.PROTOCOL_VERSION + 1)
+    assert _forward(["list", "-f", str(db_path)], capfd) == (None, "", "")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.events import ChangeBroadcaster
+
+
+@pytest.fixture
+def broadcaster(db_path):
+    TodoStore(db_path).close()
+    broadcaster = ChangeBroadcaster(db_path, interval=0.01)
+    yield broadcaster
+    broadcaster.close()
+
+
+def _add(db_path, item):
+    with TodoStore(db_path) as store:
+        return store.add(item)
+
+
+def test_publishes_changes(broadcaster, db_path):
+    subscription, rev = broadcaster.subscribe()
+    todo_id = _add(db_path, "new")
+    event = subscription.get(timeout=5)
+    assert event["rev"] > rev
+    assert [todo["id"] for todo in event["changed"]] == [todo_id]
+    assert event["deleted"] == []
+    broadcaster.unsubscribe(subscription)
+
+
+def test_watcher_survives_database_errors(broadcaster, db_path, monkeypatch):
+    read_changes = ChangeBroadcaster._read_changes
+    failures = []
+
+    def flaky(store, rev):
+        if len(failures) < 3:
+            failures.append(rev)
+            raise sqlite3.OperationalError("database is locked")
+        return read_changes(store, rev)
+
+    monkeypatch.setattr(ChangeBroadcaster, "_read_changes", staticmethod(flaky))
+    subscription, rev = broadcaster.subscribe()
+    todo_id = _add(db_path, "written while locked")
+
+    event = subscription.get(timeout=5)
+    # Retried from the same rev, so the change is not lost.
+    assert failures == [rev] * 3
+    assert [todo["id"] for todo in event["changed"]] == [todo_id]
+    assert broadcaster._thread is not None and broadcaster._thread.is_alive()
+    broadcaster.unsubscribe(subscription)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_new_subscriber_restarts_a_dead_watcher(broadcaster, db_path, monkeypatch):
+    def broken(store, rev):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(ChangeBroadcaster, "_read_changes", staticmethod(broken))
+    first, _ = broadcaster.subscribe()
+    thread = broadcaster._thread
+    _add(db_path, "kills the watcher")
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert broadcaster._thread is None
+
+    monkeypatch.undo()
+    second, _ = broadcaster.subscribe()
+    assert broadcaster._thread is not thread
+    todo_id = _add(db_path, "seen by the new watcher")
+    for subscription in (first, second):
+        event = subscription.get(timeout=5)
+        assert [todo["id"] for todo in event["changed"]] == [todo_id]
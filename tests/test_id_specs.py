@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+import typer
+
+from cli_todo_jd.cli.cli_entry import MAX_TODO_ID, _parse_id_specs, _single_id
+
+
+@pytest.mark.parametrize(
+    ("specs", "expected"),
+    [
+        (["12"], [(12, 12)]),
+        (["3", "5", "8"], [(3, 3), (5, 5), (8, 8)]),
+        (["3,5,8"], [(3, 3), (5, 5), (8, 8)]),
+        (["10-250"], [(10, 250)]),
+        (["7-7"], [(7, 7)]),
+        # Duplicates, overlaps and adjacent ranges merge; output is sorted.
+        (["5,5", "5"], [(5, 5)]),
+        (["20-30", "1-3", "25-40"], [(1, 3), (20, 40)]),
+        (["1-3,4,5-6"], [(1, 6)]),
+        (["9", "1-10"], [(1, 10)]),
+        # Blank parts and surrounding spaces are ignored.
+        ([" 4 , ,6,"], [(4, 4), (6, 6)]),
+        ([], []),
+    ],
+)
+def test_parse_id_specs(specs, expected):
+    assert _parse_id_specs(specs) == expected
+
+
+@pytest.mark.parametrize(
+    "spec",
+    ["0", "-5", "3-1", "abc", "1-", "-", "1-2-3", "1.5", "0-4", str(MAX_TODO_ID + 1)],
+)
+def test_parse_id_specs_rejects(spec):
+    with pytest.raises(typer.BadParameter):
+        _parse_id_specs([spec])
+
+
+def test_huge_range_is_not_expanded():
+    assert _parse_id_specs(["1-1000000000000"]) == [(1, 1_000_000_000_000)]
+
+
+def test_single_id():
+    assert _single_id([(4, 4)]) == 4
+    assert _single_id([(4, 5)]) is None
+    assert _single_id([(4, 4), (6, 6)]) is None
+    assert _single_id([]) is None
+
+
+def test_ranges_apply_in_sql_and_count_missing(app, capsys):
+    for i in range(10):
+        app.add_todo(f"todo {i}")
+    app.verbose = True
+
+    assert app.mark_done_by_ranges([(3, 5), (9, 1_000_000_000)]) == 5
+    assert "Marked 5 todos as done. 999999990 IDs not found." in capsys.readouterr().out
+    done = [row.id for row in app.client.iter_todos(show="done")]
+    assert done == [3, 4, 5, 9, 10]
+
+    assert app.remove_by_ranges([(1, 2), (2, 4)]) == 4
+    remaining = [row.id for row in app.client.iter_todos()]
+    assert remaining == [5, 6, 7, 8, 9, 10]
+
+    # The per-ID API shares the range path.
+    assert app.remove_by_ids([6, 7, 7, 42]) == 2
+    assert "Removed 2 todos. 1 ID not found." in capsys.readouterr().out
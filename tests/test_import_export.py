@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from cli_todo_jd.main import TodoApp
+
+ITEMS = [
+    "plain",
+    "comma, separated",
+    'say "hello"',
+    "first line\nsecond line",
+    "tab\there",
+    "café ✔ 日本",
+    "back\\slash",
+    "=1+2",
+]
+
+
+def _fields(app):
+    # Ids are reassigned on import; everything else should survive.
+    return [tuple(todo[1:]) for todo in app.client.iter_todos()]
+
+
+@pytest.fixture
+def source(tmp_path):
+    with TodoApp(tmp_path / "source.db", verbose=False) as app:
+        for item in ITEMS:
+            app.add_todo(item)
+        app.mark_done_by_ranges([(2, 3), (6, 6)])
+        yield app
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_import_round_trip(source, app, fmt):
+    exported = io.StringIO(newline="")
+    assert source.export_todos(exported, fmt) == len(ITEMS)
+
+    result = app.import_todos(io.StringIO(exported.getvalue(), newline=""), fmt)
+    assert (result.inserted, result.skipped) == (len(ITEMS), 0)
+    assert _fields(app) == _fields(source)
+    assert [todo.item for todo in app.client.iter_todos(show="done")] == [
+        ITEMS[1],
+        ITEMS[2],
+        ITEMS[5],
+    ]
+
+
+def test_export_filters(source):
+    out = io.StringIO()
+    assert source.export_todos(out, "jsonl", show="open", since_id=4) == 3
+    assert out.getvalue().count("\n") == 3
+
+
+def test_import_skips_unusable_records(app):
+    lines = [
+        '{"item": "kept", "done": "yes"}\n',
+        "not json\n",
+        '{"item": "   "}\n',
+        "[1, 2]\n",
+        "\n",
+        '"a bare string"\n',
+    ]
+    result = app.import_todos(lines, "jsonl")
+    assert (result.inserted, result.skipped) == (2, 3)
+    assert [(t.item, t.done) for t in app.client.iter_todos()] == [
+        ("kept", True),
+        ("a bare string", False),
+    ]
+
+
+def test_import_csv_text_column_in_small_batches(app):
+    lines = io.StringIO('text,done\n"a, b",x\nc,0\n,1\n"d\ne",\n', newline="")
+    result = app.import_todos(lines, "csv", batch_size=1)
+    assert (result.inserted, result.skipped) == (3, 1)
+    assert [(t.item, t.done) for t in app.client.iter_todos()] == [
+        ("a, b", True),
+        ("c", False),
+        ("d\ne", False),
+    ]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from cli_todo_jd import profiling
+from cli_todo_jd.web.metrics import WebMetrics
+
+
+def _use(conn):
+    conn.execute("CREATE TABLE t (x);")
+    with conn:
+        conn.executemany("INSERT INTO t VALUES (?);", [(1,), (2,)])
+    with pytest.raises(RuntimeError):
+        with conn:
+            conn.execute("INSERT INTO t VALUES (3);")
+            raise RuntimeError
+    conn.close()
+
+
+def test_metrics_connection_times_statements_and_commits():
+    metrics = WebMetrics()
+    _use(sqlite3.connect(":memory:", factory=metrics.connection_class()))
+    labels = {labels[0] for labels in metrics.statements._series}
+    assert {
+        "CREATE TABLE t (x)",
+        "INSERT INTO t VALUES (?)",
+        "COMMIT",
+        "ROLLBACK",
+    } <= labels
+
+
+def test_metrics_connection_counts_busy_errors(tmp_path):
+    db = tmp_path / "busy.db"
+    holder = sqlite3.connect(db)
+    holder.execute("CREATE TABLE t (x);")
+    holder.execute("BEGIN IMMEDIATE;")
+    metrics = WebMetrics()
+    conn = sqlite3.connect(db, timeout=0, factory=metrics.connection_class())
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO t VALUES (1);")
+    assert metrics.busy._values == {("INSERT INTO t VALUES (?)",): 1}
+    conn.close()
+    holder.close()
+
+
+def test_profiler_uses_the_same_timing():
+    profiler = profiling.enable()
+    try:
+        _use(profiling.connect(":memory:"))
+    finally:
+        profiling.disable()
+    calls = {sql: entry[0] for sql, entry in profiler.statements.items()}
+    assert calls["INSERT INTO t VALUES (?)"] == 2
+    assert calls["COMMIT"] == calls["ROLLBACK"] == 1
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from rich.console import Console
+
+from cli_todo_jd.main import _paged
+
+
+def _terminal() -> Console:
+    return Console(file=io.StringIO(), force_terminal=True, width=80)
+
+
+@pytest.mark.parametrize(
+    "pager", ["/nonexistent/pager", "no-such-pager-command --flag", "less 'unclosed"]
+)
+def test_unusable_pager_prints_to_the_console(monkeypatch, pager):
+    monkeypatch.setenv("PAGER", pager)
+    console = _terminal()
+    with _paged(console) as paged:
+        assert paged is console
+        paged.print("row")
+    assert "row" in console.file.getvalue()
+
+
+def test_pipes_through_the_pager(monkeypatch, tmp_path):
+    out = tmp_path / "paged.txt"
+    monkeypatch.setenv("PAGER", f"tee {out}")
+    console = _terminal()
+    with _paged(console) as paged:
+        assert paged is not console
+        paged.print("row")
+    assert "row" in out.read_text()
+    assert console.file.getvalue() == ""
+
+
+def test_no_pager_when_not_a_terminal(monkeypatch):
+    monkeypatch.setenv("PAGER", "cat")
+    console = Console(file=io.StringIO(), force_terminal=False)
+    with _paged(console) as paged:
+        assert paged is console
+
+
+def test_list_with_missing_pager(app, monkeypatch):
+    monkeypatch.setenv("PAGER", "/nonexistent/pager")
+    app.add_todo("first")
+    app._console = _terminal()
+    app.list_todos(show="all", pager=True)
+    assert "first" in app._console.file.getvalue()
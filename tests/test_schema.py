@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sqlite3
+
+from cli_todo_jd.storage.schema import RANK_BLOCK_SIZE, SCHEMA_VERSION
+from cli_todo_jd.storage.store import TodoStore
+
+
+def _make_v1_database(db_path, ids):
+    # The schema as the first released version created it.
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE todos (
+          id         INTEGER PRIMARY KEY AUTOINCREMENT,
+          item       TEXT    NOT NULL,
+          done       INTEGER NOT NULL DEFAULT 0,
+          created_at TEXT    NOT NULL DEFAULT (datetime('now')),
+          done_at    TEXT
+        );
+        CREATE INDEX idx_todos_done ON todos(done);
+        PRAGMA user_version = 1;
+        """
+    )
+    conn.executemany(
+        "INSERT INTO todos(id, item, done) VALUES (?, ?, ?);",
+        [(i, f"old todo {i}", i % 2) for i in ids],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_v1_database(db_path):
+    # Spread over several rank blocks, with gaps.
+    ids = [1, 2, 5, RANK_BLOCK_SIZE - 1, RANK_BLOCK_SIZE, 3 * RANK_BLOCK_SIZE + 7]
+    _make_v1_database(db_path, ids)
+
+    with TodoStore(db_path) as store:
+        conn = store.conn
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+
+        # Existing rows are kept and the rank blocks are backfilled.
+        assert [row["id"] for row in store.iter_todos()] == ids
+        assert store.count() == len(ids)
+        for index, todo_id in enumerate(ids, start=1):
+            assert store.id_at_index(index) == todo_id
+        assert store.id_at_index(len(ids) + 1) is None
+
+        # Old rows are searchable (through FTS5 when available, else LIKE).
+        found = [row["id"] for row in store.search(str(RANK_BLOCK_SIZE))]
+        assert found == [RANK_BLOCK_SIZE]
+
+        # Writes are logged for snapshot readers.
+        rev = store.change_rev()
+        new_id = store.add("new todo")
+        store.delete(2)
+        assert store.changed_ids_since(rev, limit=10) == [new_id, 2]
+        assert store.count() == len(ids)
+        assert [row["id"] for row in store.search("new")] == [new_id]
+
+
+def test_migration_is_idempotent(db_path):
+    _make_v1_database(db_path, [1, 2, 3])
+    TodoStore(db_path).close()
+    # A second open finds the current version and changes nothing.
+    with TodoStore(db_path) as store:
+        assert store.count() == 3
+        assert store.change_rev() == 0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.storage import schema
+from cli_todo_jd.storage.store import TodoStore
+
+ITEMS = [
+    "Deploy the web app",
+    "Write deployment notes",
+    "Buy milk",
+    "Café visit on Friday",
+    "fix a_b parsing",
+    "fix axb parsing",
+    "100% coverage",
+]
+
+
+@pytest.fixture(params=["fts", "like"])
+def store(request, db_path):
+    with TodoStore(db_path) as store:
+        for item in ITEMS:
+            store.add(item)
+        store.set_done(3, True)
+        if request.param == "like":
+            store._has_fts = False  # as on SQLite builds without FTS5
+        else:
+            assert store.has_fts()
+        yield store
+
+
+def _found(store, query, **kwargs):
+    return sorted(row["id"] for row in store.search(query, **kwargs))
+
+
+def test_words_match_as_prefixes_and_all_must_match(store):
+    assert _found(store, "dep") == [1, 2]
+    assert _found(store, "DEPLOY web") == [1]
+    assert _found(store, "deploy milk") == []
+    assert _found(store, "notes deploy") == [2]
+
+
+def test_punctuation_and_wildcards_are_literal(store):
+    assert _found(store, "") == []
+    assert _found(store, "!!! ???") == []
+    assert _found(store, '"buy') == [3]
+    assert _found(store, "a_b") == [5]
+    assert _found(store, "100%") == [7]
+    assert _found(store, "deploy OR milk") == []
+
+
+def test_show_filter_and_limit(store):
+    assert _found(store, "buy", show="open") == []
+    assert _found(store, "buy", show="done") == [3]
+    assert len(list(store.search("fix", limit=1))) == 1
+    assert _found(store, "fix", limit=None) == [5, 6]
+
+
+def test_index_follows_edits_and_deletes(store):
+    store.set_item(3, "Buy oat milk")
+    store.delete(1)
+    assert _found(store, "oat") == [3]
+    assert _found(store, "deploy") == [2]
+    new_id = store.add("Deploy again")
+    assert _found(store, "deploy") == [2, new_id]
+
+
+def test_fts_ignores_diacritics(db_path):
+    with TodoStore(db_path) as store:
+        store.add("Café visit")
+        assert [row["item"] for row in store.search("cafe")] == ["Café visit"]
+
+
+def test_falls_back_to_like_without_fts(db_path, monkeypatch):
+    # An unusable tokenizer fails like a missing FTS5 module does.
+    monkeypatch.setattr(schema, "_FTS_TOKENIZER", "no_such_tokenizer")
+    with TodoStore(db_path) as store:
+        assert store.conn.execute("PRAGMA user_version;").fetchone()[0] == 4
+        assert not store.has_fts()
+        store.add("Deploy the web app")
+        store.add("Buy milk")
+        assert [row["item"] for row in store.search("dep")] == ["Deploy the web app"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.main import TodoApp
+
+
+def _rows(db_path):
+    with TodoApp(db_path, verbose=False) as other:
+        return [(todo.id, todo.item, todo.done) for todo in other.client.iter_todos()]
+
+
+def test_session_commits_together(app, db_path):
+    app.add_todo("existing")
+    with app.session() as session:
+        session.add("a")
+        session.mark_done(1)
+        session.edit(2, "a, edited")
+        session.remove(42)
+    assert [result.ok for result in session.results] == [True, True, True, False]
+    assert session.failed[0].todo_id == 42
+    assert _rows(db_path) == [(1, "existing", True), (2, "a, edited", False)]
+
+
+def test_session_import_rolls_back_with_the_session(app, db_path):
+    app.add_todo("existing")
+    with pytest.raises(RuntimeError):
+        with app.session() as session:
+            session.add("a")
+            session.mark_done(1)
+            result = app.import_todos(["x\n", "y\n", "z\n"], batch_size=2)
+            assert result.inserted == 3
+            raise RuntimeError("abort")
+    assert _rows(db_path) == [(1, "existing", False)]
+
+
+def test_session_import_commits_with_the_session(app, db_path):
+    with app.session():
+        app.add_todo("a")
+        app.import_todos(["x\n", "y\n"], batch_size=1)
+    assert [row[1] for row in _rows(db_path)] == ["a", "x", "y"]
+
+
+def test_snapshot_is_reloaded_after_a_failed_session(app):
+    for item in ["a", "b"]:
+        app.add_todo(item)
+    assert len(app.snapshot) == 2
+
+    with pytest.raises(RuntimeError):
+        with app.session():
+            app.clear_all()
+            assert len(app.snapshot) == 0
+            raise RuntimeError("abort")
+    assert [entry.item for entry in app.snapshot] == ["a", "b"]
+
+
+def test_snapshot_is_refreshed_once_after_a_session(app):
+    app.add_todo("a")
+    assert len(app.snapshot) == 1
+    with app.session() as session:
+        session.add("b")
+        session.mark_done(1)
+    assert [tuple(entry) for entry in app.snapshot] == [(1, "a", True), (2, "b", False)]
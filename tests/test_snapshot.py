@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.main import TodoApp
+from cli_todo_jd.snapshot import TodoSnapshot
+
+
+def _rows(snapshot):
+    return [tuple(entry) for entry in snapshot]
+
+
+@pytest.fixture
+def snapshot():
+    rows = [(i, f"todo {i}", i % 3 == 0) for i in range(1, 11)]
+    return TodoSnapshot.from_rows(rows, version=(1, 0), rev=10)
+
+
+def test_apply_changes_deletes_updates_and_inserts(snapshot):
+    changed = [1, 4, 10, 11, 12]
+    rows = [(4, "edited", True), (12, "new", False)]
+    patched = snapshot.apply_changes(changed, rows, version=(2, 0), rev=15)
+
+    assert [entry.id for entry in patched] == [2, 3, 4, 5, 6, 7, 8, 9, 12]
+    assert patched[2] == (4, "edited", True)
+    assert patched[-1] == (12, "new", False)
+    assert (patched.version, patched.rev) == ((2, 0), 15)
+    # The original is unchanged.
+    assert len(snapshot) == 10
+    assert snapshot[3] == (4, "todo 4", False)
+
+
+def test_apply_changes_deletes_everything(snapshot):
+    ids = list(snapshot.ids)
+    patched = snapshot.apply_changes(ids + [99], [], version=None, rev=None)
+    assert len(patched) == 0
+    assert _rows(patched) == []
+    assert patched.position_of(1) is None
+
+
+def test_apply_changes_to_empty_snapshot():
+    patched = TodoSnapshot.empty().apply_changes([3, 1], [(1, "a", False)], None, 1)
+    assert _rows(patched) == [(1, "a", False)]
+
+
+def _reloaded(app):
+    app.reload_todos()
+    return _rows(app.snapshot)
+
+
+def _fresh(db_path):
+    with TodoApp(db_path, verbose=False) as other:
+        return _rows(other.snapshot)
+
+
+def test_reload_after_deletes_from_another_connection(app, db_path):
+    for i in range(20):
+        app.add_todo(f"todo {i}")
+    assert len(app.snapshot) == 20
+
+    with TodoApp(db_path, verbose=False) as other:
+        other.remove_by_ranges([(3, 7)])
+        other.mark_done_by_ids([10, 12])
+        other.add_todo("added elsewhere")
+
+    rows = _reloaded(app)
+    assert rows == _fresh(db_path)
+    assert [row[0] for row in rows][:4] == [1, 2, 8, 9]
+    assert rows[-1] == (21, "added elsewhere", False)
+
+
+def test_reload_after_clear(app, db_path):
+    for i in range(5):
+        app.add_todo(f"todo {i}")
+    assert len(app.snapshot) == 5
+
+    with TodoApp(db_path, verbose=False) as other:
+        other.clear_all()
+    assert _reloaded(app) == []
+
+    # Ids restart after a clear; the snapshot must not keep stale entries.
+    with TodoApp(db_path, verbose=False) as other:
+        other.add_todo("after clear")
+    assert _reloaded(app) == [(1, "after clear", False)]
+
+    app.clear_all()
+    assert _rows(app.snapshot) == []
+    app.add_todo("again")
+    assert _reloaded(app) == _fresh(db_path) == [(1, "again", False)]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from cli_todo_jd.storage.store import TodoStore
+from cli_todo_jd.web.app import create_app
+from cli_todo_jd.web.cache import CachedResponse, ResponseCache
+
+
+def _entry(body: str) -> CachedResponse:
+    return CachedResponse(body.encode(), 200, "text/plain")
+
+
+def test_lru_eviction_and_stats():
+    cache = ResponseCache(2)
+    cache.put("a", _entry("a"))
+    cache.put("b", _entry("b"))
+    assert cache.get("a").body == b"a"  # "b" is now least recently used
+    cache.put("c", _entry("c"))
+    assert cache.get("b") is None
+    assert [cache.get(key).body for key in ("a", "c")] == [b"a", b"c"]
+    assert cache.stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_size_zero_disables_caching():
+    cache = ResponseCache(0)
+    cache.put("a", _entry("a"))
+    assert cache.get("a") is None
+    with pytest.raises(ValueError):
+        ResponseCache(-1)
+
+
+@pytest.fixture
+def client(web_app):
+    with web_app.test_client() as client:
+        yield client
+
+
+def _stats(client):
+    return client.application.extensions["todo_cache"].stats()
+
+
+def test_pages_are_served_from_the_cache(client):
+    client.post("/add", data={"item": "first"})
+    assert _stats(client)["size"] == 0  # writes clear the cache
+
+    for url in ("/", "/api/todos"):
+        body = client.get(url).data
+        hits = _stats(client)["hits"]
+        assert client.get(url).data == body
+        assert _stats(client)["hits"] == hits + 1
+
+
+def test_writes_elsewhere_are_never_served_stale(client, db_path):
+    client.post("/add", data={"item": "first"})
+    assert b"first" in client.get("/").data
+    assert [t["item"] for t in client.get("/api/todos").json["todos"]] == ["first"]
+
+    # Not through this server, so nothing clears the cache; the rev moves on.
+    with TodoStore(db_path) as store:
+        store.set_item(1, "changed by the CLI")
+        store.add("added by the CLI")
+    page = client.get("/").data
+    assert b"changed by the CLI" in page and b"added by the CLI" in page
+    assert [t["item"] for t in client.get("/api/todos").json["todos"]] == [
+        "changed by the CLI",
+        "added by the CLI",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "data"),
+    [
+        ("post", "/add", {"item": "new"}),
+        ("post", "/toggle/1", None),
+        ("post", "/delete/1", None),
+        ("post", "/clear", {"confirm": "yes"}),
+    ],
+)
+def test_form_writes_clear_the_cache(client, method, url, data):
+    client.post("/add", data={"item": "first"})
+    client.get("/")
+    assert _stats(client)["size"] == 1
+    getattr(client, method)(url, data=data)
+    assert _stats(client)["size"] == 0
+
+
+def test_cache_can_be_disabled(db_path):
+    app = create_app(db_path, pool_size=1, cache_size=0, metrics=False)
+    try:
+        with app.test_client() as client:
+            client.post("/add", data={"item": "first"})
+            assert b"first" in client.get("/").data
+            assert b"first" in client.get("/").data
+            assert _stats(client)["size"] == 0
+    finally:
+        app.extensions["todo_pool"].close()